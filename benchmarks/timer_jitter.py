@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+计时器抖动与漂移基准测试
+
+在 offscreen 平台下运行 TimerManager（以及 round_control.RoundController），
+同时施加合成负载（频繁同步重绘、processEvents 重入、日志突发、事件循环阻塞），
+统计计时器触发间隔分布 (p50/p99/max)、相对整秒边界的延迟，以及 N 分钟后的总漂移。
+
+用法:
+    python benchmarks/timer_jitter.py --minutes 4 --load all
+    python benchmarks/timer_jitter.py --target round_controller --load paint
+    python benchmarks/timer_jitter.py --display-board --low-performance --json result.json
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import logging
+import argparse
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QGridLayout
+from PyQt5.QtCore import QTimer
+
+from timer_core import NS_PER_SECOND, NS_PER_MS
+
+LOAD_TYPES = ['paint', 'reentrant', 'logs', 'stall']
+
+
+def percentile(values, pct):
+    """最近秩法计算百分位数"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class SyntheticLoad:
+    """在事件循环中制造负载"""
+
+    def __init__(self, loads, intensity=1.0, seed=None):
+        self.loads = loads
+        self.intensity = intensity
+        self.rng = random.Random(seed)
+        self.timers = []
+        self.paint_widget = None
+        self.logger = logging.getLogger('debate_app.benchmark')
+
+        if 'paint' in loads:
+            self.paint_widget = QWidget()
+            grid = QGridLayout(self.paint_widget)
+            for i in range(int(200 * intensity)):
+                grid.addWidget(QLabel(f"{i:04d}"), i // 20, i % 20)
+            self.paint_widget.resize(1920, 1080)
+            self.paint_widget.show()
+            self._every(16, self._paint_storm)
+        if 'reentrant' in loads:
+            self._every(50, self._reentrant_events)
+        if 'logs' in loads:
+            self._every(100, self._log_burst)
+        if 'stall' in loads:
+            self._every(500, self._stall)
+
+    def _every(self, interval_ms, callback):
+        timer = QTimer()
+        timer.timeout.connect(callback)
+        timer.start(interval_ms)
+        self.timers.append(timer)
+
+    def _paint_storm(self):
+        """同步重绘所有子控件，模拟 ContentUpdater 中的 repaint 风暴"""
+        for child in self.paint_widget.findChildren(QWidget):
+            child.repaint()
+        self.paint_widget.repaint()
+
+    def _reentrant_events(self):
+        """忙等期间反复调用 processEvents，模拟重入"""
+        deadline = time.perf_counter() + 0.01 * self.intensity
+        while time.perf_counter() < deadline:
+            QApplication.processEvents()
+
+    def _log_burst(self):
+        """突发写日志"""
+        for i in range(int(200 * self.intensity)):
+            self.logger.info(f"benchmark log burst {i}")
+
+    def _stall(self):
+        """阻塞事件循环，模拟低性能硬件上的卡顿"""
+        time.sleep(self.rng.uniform(0, 0.25) * self.intensity)
+
+    def stop(self):
+        for timer in self.timers:
+            timer.stop()
+
+
+class TickRecorder:
+    """记录每次显示更新的时刻"""
+
+    def __init__(self, duration):
+        self.duration = duration
+        self.start_ns = None
+        self.finish_ns = None
+        self.ticks = []  # (时刻, 显示的剩余秒数)
+
+    def started(self):
+        self.start_ns = time.monotonic_ns()
+
+    def record(self, remaining):
+        self.ticks.append((time.monotonic_ns(), remaining))
+
+    def finished(self):
+        self.finish_ns = time.monotonic_ns()
+
+    def report(self):
+        times = [t for t, _ in self.ticks]
+        intervals = [(b - a) / NS_PER_MS for a, b in zip(times, times[1:])]
+        # 显示 remaining 秒的正确时刻是起点之后 duration - remaining 秒
+        lateness = [(t - self.start_ns - (self.duration - remaining) * NS_PER_SECOND) / NS_PER_MS
+                    for t, remaining in self.ticks]
+        drift_ms = None
+        if self.finish_ns is not None:
+            drift_ms = (self.finish_ns - self.start_ns - self.duration * NS_PER_SECOND) / NS_PER_MS
+        return {
+            'ticks': len(self.ticks),
+            'missed_ticks': sum(1 for i in intervals if i > 1500),
+            'interval_p50_ms': percentile(intervals, 50),
+            'interval_p99_ms': percentile(intervals, 99),
+            'interval_max_ms': max(intervals) if intervals else 0.0,
+            'lateness_p50_ms': percentile(lateness, 50),
+            'lateness_p99_ms': percentile(lateness, 99),
+            'lateness_max_ms': max(lateness) if lateness else 0.0,
+            'drift_ms': drift_ms,
+        }
+
+
+def bench_timer_manager(app, duration, use_display_board=False, low_performance=False):
+    """测量 TimerManager（可选带完整 DisplayBoard 渲染）"""
+    round_data = {'side': 'affirmative', 'speaker': '四辩', 'type': '总结陈词',
+                  'time': duration, 'description': '基准测试环节'}
+    board = None
+    if use_display_board:
+        from display_board import DisplayBoard
+        board = DisplayBoard(low_performance_mode=low_performance)
+        board.set_debate_config({'topic': '基准测试', 'rounds': [round_data]})
+        board.show()
+        board.start_round(0)
+        manager = board.timer_manager
+    else:
+        from display_board.timer_manager import TimerManager
+        manager = TimerManager()
+        manager.set_current_round(round_data)
+
+    recorder = TickRecorder(duration)
+    manager.timeUpdated.connect(lambda: recorder.record(manager.current_time))
+    manager.timerFinished.connect(recorder.finished)
+    manager.timerFinished.connect(app.quit)
+    recorder.started()
+    manager.start()
+    app.exec_()
+    return recorder.report()
+
+
+def bench_round_controller(app, duration):
+    """测量 round_control.RoundController"""
+    from round_control import RoundController, RoundControlSignals
+    signals = RoundControlSignals()
+    controller = RoundController(signals)
+    controller.remaining_time = duration
+
+    recorder = TickRecorder(duration)
+    signals.time_update_signal.connect(recorder.record)
+    signals.round_finished_signal.connect(recorder.finished)
+    signals.round_finished_signal.connect(app.quit)
+    recorder.started()
+    controller.toggle_timer()
+    app.exec_()
+    return recorder.report()
+
+
+def print_report(name, report):
+    print(f"[{name}] 更新 {report['ticks']} 次，间隔超过1.5秒 {report['missed_ticks']} 次")
+    print(f"  触发间隔  p50={report['interval_p50_ms']:.1f}ms  "
+          f"p99={report['interval_p99_ms']:.1f}ms  max={report['interval_max_ms']:.1f}ms")
+    print(f"  边界延迟  p50={report['lateness_p50_ms']:.1f}ms  "
+          f"p99={report['lateness_p99_ms']:.1f}ms  max={report['lateness_max_ms']:.1f}ms")
+    if report['drift_ms'] is not None:
+        print(f"  总漂移    {report['drift_ms']:+.1f}ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="计时器抖动与漂移基准测试")
+    parser.add_argument('--minutes', type=float, default=1.0, help="每个计时器运行的分钟数")
+    parser.add_argument('--target', choices=['timer_manager', 'round_controller', 'both'],
+                        default='both', help="测量对象")
+    parser.add_argument('--load', nargs='+', choices=LOAD_TYPES + ['all', 'none'],
+                        default=['all'], help="合成负载类型")
+    parser.add_argument('--intensity', type=float, default=1.0, help="负载强度倍数")
+    parser.add_argument('--display-board', action='store_true', help="同时驱动完整的 DisplayBoard 渲染")
+    parser.add_argument('--low-performance', action='store_true', help="以低性能模式创建 DisplayBoard")
+    parser.add_argument('--seed', type=int, default=None, help="随机种子")
+    parser.add_argument('--json', help="把结果写入 JSON 文件")
+    args = parser.parse_args(argv)
+
+    loads = LOAD_TYPES if 'all' in args.load else [l for l in args.load if l != 'none']
+    duration = max(1, int(args.minutes * 60))
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    print(f"平台: {app.platformName()}  负载: {', '.join(loads) or '无'}  时长: {duration}秒")
+
+    results = {}
+    for target in ('timer_manager', 'round_controller'):
+        if args.target not in (target, 'both'):
+            continue
+        load = SyntheticLoad(loads, args.intensity, args.seed)
+        if target == 'timer_manager':
+            report = bench_timer_manager(app, duration, args.display_board, args.low_performance)
+        else:
+            report = bench_round_controller(app, duration)
+        load.stop()
+        results[target] = report
+        print_report(target, report)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'duration': duration, 'loads': loads, 'results': results}, f, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -27,6 +27,9 @@ logger = logging.getLogger('build')
 APP_NAME = "辩论赛计时系统"
 APP_VERSION = "1.0.0"
 
+# 通过 lazy_imports 延迟导入的模块，PyInstaller 无法静态分析到，需要显式声明
+LAZY_HIDDEN_IMPORTS = ['markdown', 'PyQt5.QtMultimedia', 'psutil']
+
 def check_requirements():
     """检查必要的依赖是否已安装"""
     try:
@@ -72,29 +75,167 @@ def analyze_imports():
         logger.warning(f"模块导入分析失败: {e}")
         return False
 
+def _startup_command(target):
+    """启动目标的命令行：源码树用当前解释器运行 main.py，否则视为打包后的可执行文件"""
+    if target.endswith('.py'):
+        return [sys.executable, target]
+    return [target]
+
+def _clear_bytecode(root):
+    """删除 __pycache__，使下一次源码启动需要重新编译"""
+    for dirpath, dirnames, _ in os.walk(root):
+        if '__pycache__' in dirnames:
+            shutil.rmtree(os.path.join(dirpath, '__pycache__'), ignore_errors=True)
+            dirnames.remove('__pycache__')
+
+def launch_once(target, timeout=60, extra_args=None):
+    """在 offscreen 平台下启动一次程序，首帧绘制后自动退出
+
+    Returns:
+        Dict: first_frame_ms（从创建进程到首帧）、exit_ms（到进程退出）、
+              peak_rss_bytes 以及程序内部记录的各阶段耗时
+    """
+    import tempfile
+    import json
+
+    fd, report_path = tempfile.mkstemp(suffix='.json', prefix='startup_')
+    os.close(fd)
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    cmd = _startup_command(target) + ['--startup-report', report_path] + list(extra_args or [])
+    try:
+        launched_wall = time.time()
+        launched = time.perf_counter()
+        subprocess.run(cmd, env=env, timeout=timeout, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        exit_ms = (time.perf_counter() - launched) * 1000
+        with open(report_path, encoding='utf-8') as f:
+            report = json.load(f)
+    finally:
+        os.remove(report_path)
+
+    report['first_frame_ms'] = (report.pop('wall_time') - launched_wall) * 1000
+    report['exit_ms'] = exit_ms
+    return report
+
+def _summarize(values):
+    ordered = sorted(v for v in values if v is not None)
+    if not ordered:
+        return None
+    return {
+        'min': ordered[0],
+        'median': ordered[len(ordered) // 2],
+        'max': ordered[-1],
+    }
+
+def benchmark_startup(target, runs=5, cold_runs=1, timeout=60, extra_args=None):
+    """多次启动程序，统计冷启动和热启动的首帧时间与峰值内存
+
+    冷启动前会清除源码树的 __pycache__（打包后的程序只取第一次启动），
+    不会清空操作系统的文件缓存，因此冷启动结果是偏乐观的下界。
+    """
+    results = {'target': target, 'cold': [], 'warm': []}
+    for i in range(cold_runs + runs):
+        kind = 'cold' if i < cold_runs else 'warm'
+        if kind == 'cold' and target.endswith('.py'):
+            _clear_bytecode(os.path.dirname(os.path.abspath(target)))
+        report = launch_once(target, timeout, extra_args)
+        logger.info(f"[{kind}] 首帧 {report['first_frame_ms']:.1f}ms  "
+                    f"退出 {report['exit_ms']:.1f}ms  峰值内存 {(report['peak_rss_bytes'] or 0) / 2**20:.1f}MB")
+        results[kind].append(report)
+
+    summary = {}
+    for kind in ('cold', 'warm'):
+        reports = results[kind]
+        summary[kind] = {
+            'first_frame_ms': _summarize([r['first_frame_ms'] for r in reports]),
+            'peak_rss_mb': _summarize([r['peak_rss_bytes'] / 2**20 if r['peak_rss_bytes'] else None
+                                       for r in reports]),
+        }
+    results['summary'] = summary
+    return results
+
+def compare_startup_baseline(summary, baseline, tolerance=0.15):
+    """与基线比较中位数，超过容差的指标视为回退
+
+    Returns:
+        List[str]: 回退说明，空列表表示没有回退
+    """
+    regressions = []
+    for kind in ('cold', 'warm'):
+        for metric in ('first_frame_ms', 'peak_rss_mb'):
+            current = (summary.get(kind) or {}).get(metric)
+            reference = ((baseline.get(kind) or {}).get(metric))
+            if not current or not reference:
+                continue
+            limit = reference['median'] * (1 + tolerance)
+            if current['median'] > limit:
+                regressions.append(f"{kind}.{metric}: {current['median']:.1f} > "
+                                   f"基线 {reference['median']:.1f} (+{tolerance:.0%})")
+    return regressions
+
 def measure_startup(exe_path):
-    """测量应用启动时间"""
+    """测量应用启动时间，返回热启动首帧时间的中位数（毫秒），失败返回-1"""
     if not os.path.exists(exe_path):
         logger.error(f"可执行文件不存在: {exe_path}")
         return -1
     
     logger.info("测量启动时间...")
-    
-    # 在Windows上使用PowerShell测量启动时间
-    if platform.system() == "Windows":
-        try:
-            # 使用-w 0参数立即退出程序，只测量启动时间
-            cmd = f'powershell "Measure-Command {{Start-Process \'{exe_path}\' -ArgumentList \'-w\',\'0\' -NoNewWindow -Wait}}"'
-            result = subprocess.check_output(cmd, shell=True).decode('utf-8')
-            # 提取毫秒数
-            for line in result.splitlines():
-                if "TotalMilliseconds" in line:
-                    ms = float(line.split(':')[1].strip())
-                    return ms
-        except Exception as e:
-            logger.error(f"启动时间测量失败: {e}")
-            return -1
-    return -1
+    try:
+        results = benchmark_startup(exe_path, runs=3, cold_runs=1)
+        return results['summary']['warm']['first_frame_ms']['median']
+    except Exception as e:
+        logger.error(f"启动时间测量失败: {e}")
+        return -1
+
+def benchmark_startup_main(argv=None):
+    """启动基准测试命令行入口
+
+    用法:
+        python build.py bench-startup                      # 测量源码树
+        python build.py bench-startup dist/辩论赛计时系统/辩论赛计时系统 --runs 10
+        python build.py bench-startup --save-baseline startup_baseline.json
+        python build.py bench-startup --baseline startup_baseline.json
+    """
+    import json
+
+    parser = argparse.ArgumentParser(prog="build.py bench-startup", description="启动性能基准测试")
+    parser.add_argument('target', nargs='?', default='main.py', help="main.py 或打包后的可执行文件")
+    parser.add_argument('--runs', type=int, default=5, help="热启动次数")
+    parser.add_argument('--cold-runs', type=int, default=1, help="冷启动次数")
+    parser.add_argument('--timeout', type=float, default=60, help="单次启动超时（秒）")
+    parser.add_argument('--config', help="启动时加载的配置文件")
+    parser.add_argument('--baseline', help="与该基线 JSON 比较，出现回退时返回非零")
+    parser.add_argument('--tolerance', type=float, default=0.15, help="允许的回退比例")
+    parser.add_argument('--save-baseline', help="把本次结果保存为基线")
+    args = parser.parse_args(argv)
+
+    extra_args = ['--config', args.config] if args.config else None
+    results = benchmark_startup(args.target, args.runs, args.cold_runs, args.timeout, extra_args)
+    summary = results['summary']
+    for kind, label in (('cold', '冷启动'), ('warm', '热启动')):
+        frame = summary[kind]['first_frame_ms']
+        rss = summary[kind]['peak_rss_mb']
+        if frame:
+            logger.info(f"{label}首帧: 中位数 {frame['median']:.1f}ms "
+                        f"(最小 {frame['min']:.1f}ms, 最大 {frame['max']:.1f}ms)")
+        if rss:
+            logger.info(f"{label}峰值内存: 中位数 {rss['median']:.1f}MB")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=4)
+        logger.info(f"基线已保存: {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_startup_baseline(summary, baseline, args.tolerance)
+        for line in regressions:
+            logger.error(f"启动性能回退: {line}")
+        if regressions:
+            return 1
+        logger.info("与基线相比没有启动性能回退")
+    return 0
 
 def build_executable(args):
     """构建可执行文件"""
@@ -112,6 +253,8 @@ def build_executable(args):
         '--windowed',
         '--noconfirm',
     ]
+    for module in LAZY_HIDDEN_IMPORTS:
+        build_args.extend(['--hidden-import', module])
     
     # 优化选项
     if args.optimize:
@@ -202,7 +345,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    hiddenimports=""" + repr(LAZY_HIDDEN_IMPORTS) + """,
     hookspath=['hooks'],
     hooksconfig={},
     runtime_hooks=runtime_hooks,
@@ -329,6 +472,8 @@ def build_application():
         "--clean",  # 清理临时文件
         "--noconfirm",  # 不确认覆盖
     ]
+    for module in LAZY_HIDDEN_IMPORTS:
+        build_args.extend(["--hidden-import", module])
     
     # 添加系统特定参数
     if sys.platform == "win32":
@@ -420,6 +565,10 @@ if __name__ == "__main__":
         os.chdir(script_dir)
         logger.info(f"已切换工作目录到: {script_dir}")
     
+    # 启动基准测试
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench-startup':
+        sys.exit(benchmark_startup_main(sys.argv[2:]))
+    
     # 构建应用
     if build_application():
         logger.info("\n构建过程完成。")
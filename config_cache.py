@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""配置加载缓存
+
+比赛日需要在几十场比赛的配置之间来回切换。DebateConfig.from_file 每次都
+重新解析、验证 JSON，这里把验证通过的配置连同回合列表文字保存为 marshal
+快照：
+
+- 内存中按 (路径, mtime, 大小) 命中时，不读文件；
+- 文件被 touch 或复制过但内容未变时，按内容哈希命中；
+- 快照同时写入磁盘缓存目录，程序重启后依然有效。
+
+快照只包含 JSON 基本类型，每次命中都从字节重新构造，调用方修改返回的
+配置不会影响缓存。
+"""
+
+import os
+import marshal
+import hashlib
+import logging
+import tempfile
+from collections import OrderedDict
+
+from config_manager import DebateConfig
+
+logger = logging.getLogger('debate_app.config_cache')
+
+# 快照格式版本，结构变化时递增使旧快照失效
+SNAPSHOT_VERSION = 1
+# 内存中保留的配置数量
+MEMORY_ENTRIES = 64
+
+
+def _default_cache_dir():
+    cache_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), 'cache', 'configs'))
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except PermissionError:
+        cache_dir = os.path.join(tempfile.gettempdir(), 'debate_config_cache')
+        os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+class ConfigCache:
+    """按路径、修改时间和内容哈希缓存已验证的配置"""
+
+    def __init__(self, cache_dir=None, memory_entries=MEMORY_ENTRIES):
+        """
+        Args:
+            cache_dir: 磁盘快照目录，None 使用程序目录下的 cache/configs，
+                       传入 False 则只使用内存缓存
+            memory_entries: 内存中保留的配置数量
+        """
+        self.cache_dir = _default_cache_dir() if cache_dir is None else cache_dir
+        self.memory_entries = memory_entries
+        self._entries = OrderedDict()  # 绝对路径 -> (mtime_ns, size, digest, snapshot)
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, file_path, verify=False):
+        """加载配置，命中缓存时跳过 JSON 解析和验证
+
+        Args:
+            verify: 总是读取文件并比较摘要，不使用修改时间和大小的快速判断。
+                    热重载时使用：改动前后大小相同、文件系统时间戳精度较粗
+                    （FAT/exFAT、SMB）时修改时间也可能不变
+
+        Returns:
+            DebateConfig: 配置对象
+
+        Raises:
+            ConfigValidationError: 配置验证失败
+        """
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        entry = self._entries.get(path)
+        if not verify and entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            self._entries.move_to_end(path)
+            self.hits += 1
+            return self._restore(entry[3])
+
+        with open(path, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+        snapshot = None
+        if entry and entry[2] == digest:
+            snapshot = entry[3]
+        elif self.cache_dir:
+            snapshot = self._read_disk(path, digest)
+
+        if snapshot is None:
+            self.misses += 1
+            config = DebateConfig.from_bytes(raw)
+            snapshot = marshal.dumps((SNAPSHOT_VERSION, digest, config.data, config.get_round_labels()))
+            self._write_disk(path, snapshot)
+        else:
+            self.hits += 1
+            config = self._restore(snapshot)
+
+        self._remember(path, (stat.st_mtime_ns, stat.st_size, digest, snapshot))
+        return config
+
+    def invalidate(self, file_path=None):
+        """清除内存缓存，file_path 为 None 时清除全部"""
+        if file_path is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(os.path.abspath(file_path), None)
+
+    def _restore(self, snapshot):
+        _, _, data, labels = marshal.loads(snapshot)
+        return DebateConfig(data, round_labels=labels)
+
+    def _remember(self, path, entry):
+        self._entries[path] = entry
+        self._entries.move_to_end(path)
+        while len(self._entries) > self.memory_entries:
+            self._entries.popitem(last=False)
+
+    def _snapshot_path(self, path):
+        name = hashlib.blake2b(path.encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join(self.cache_dir, name + '.bin')
+
+    def _read_disk(self, path, digest):
+        """读取内容哈希一致的磁盘快照，不存在或已过期返回None"""
+        try:
+            with open(self._snapshot_path(path), 'rb') as f:
+                snapshot = f.read()
+            version, snapshot_digest, _, _ = marshal.loads(snapshot)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"配置快照损坏，将重新解析: {e}")
+            return None
+        if version != SNAPSHOT_VERSION or snapshot_digest != digest:
+            return None
+        return snapshot
+
+    def _write_disk(self, path, snapshot):
+        if not self.cache_dir:
+            return
+        target = self._snapshot_path(path)
+        try:
+            # 先写临时文件再替换，避免留下写了一半的快照
+            tmp_path = target + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(snapshot)
+            os.replace(tmp_path, target)
+        except OSError as e:
+            logger.warning(f"无法写入配置快照: {e}")
+
+
+# 进程内共用的缓存
+_default_cache = None
+
+
+def load_config(file_path, verify=False):
+    """通过进程内共用的缓存加载配置，verify 见 ConfigCache.load"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ConfigCache()
+    return _default_cache.load(file_path, verify)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""配置结构差异
+
+比较两份 DebateConfig.data，得出需要重新应用到界面上的最小范围：
+辩题、某一方的信息、单个辩手、单个回合。热重载时据此只更新变化的
+控件，不重建界面，也不打断正在运行的计时器。
+"""
+
+SIDES = ('affirmative', 'negative')
+
+
+class ConfigDiff:
+    """两份配置之间的差异"""
+
+    def __init__(self):
+        self.topic = False  # 辩题是否变化
+        self.sides = []  # 信息变化的辩方
+        self.debater_roles = []  # 变化的辩手角色键，如 'affirmative_first'
+        self.rounds = []  # 内容变化的回合索引（两份配置都存在的回合）
+        self.round_count_changed = False  # 回合数量是否变化
+        self.other_keys = []  # 其它变化的顶级字段
+
+    def is_empty(self):
+        return not (self.topic or self.sides or self.debater_roles or self.rounds
+                    or self.round_count_changed or self.other_keys)
+
+    def round_changed(self, index):
+        """指定回合是否变化（包括因数量变化而新增或删除）"""
+        return index in self.rounds or self.round_count_changed
+
+    def __repr__(self):
+        parts = []
+        if self.topic:
+            parts.append("topic")
+        if self.sides:
+            parts.append(f"sides={self.sides}")
+        if self.debater_roles:
+            parts.append(f"debater_roles={self.debater_roles}")
+        if self.rounds:
+            parts.append(f"rounds={self.rounds}")
+        if self.round_count_changed:
+            parts.append("round_count")
+        if self.other_keys:
+            parts.append(f"other={self.other_keys}")
+        return f"<ConfigDiff {' '.join(parts) or 'empty'}>"
+
+
+def diff_config(old, new):
+    """比较两份配置数据
+
+    Args:
+        old: 旧的配置字典
+        new: 新的配置字典
+
+    Returns:
+        ConfigDiff: 差异
+    """
+    diff = ConfigDiff()
+    old = old or {}
+    new = new or {}
+
+    diff.topic = old.get('topic') != new.get('topic')
+    diff.sides = [side for side in SIDES if old.get(side) != new.get(side)]
+
+    old_roles = old.get('debater_roles') or {}
+    new_roles = new.get('debater_roles') or {}
+    if old_roles != new_roles:
+        diff.debater_roles = sorted(key for key in set(old_roles) | set(new_roles)
+                                    if old_roles.get(key) != new_roles.get(key))
+
+    old_rounds = old.get('rounds') or []
+    new_rounds = new.get('rounds') or []
+    diff.round_count_changed = len(old_rounds) != len(new_rounds)
+    diff.rounds = [i for i, (a, b) in enumerate(zip(old_rounds, new_rounds)) if a != b]
+
+    known = {'topic', 'debater_roles', 'rounds'} | set(SIDES)
+    diff.other_keys = sorted(key for key in set(old) | set(new)
+                             if key not in known and old.get(key) != new.get(key))
+    return diff
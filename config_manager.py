@@ -3,11 +3,40 @@
 
 import json
 import os
+import logging
 from typing import Dict, Any, Optional, List
 
+from config_schema import validate_config, format_issues, FREE_DEBATE_TYPE
+
+logger = logging.getLogger('debate_app')
+
 class ConfigValidationError(Exception):
-    """配置验证错误"""
-    pass
+    """配置验证错误
+    
+    Attributes:
+        errors: config_schema.Issue 列表，包含每个问题的 JSON 路径
+    """
+    def __init__(self, message, errors=None):
+        super().__init__(message)
+        self.errors = errors or []
+
+def is_listed_round(round_info) -> bool:
+    """回合是否有足够的信息显示在回合列表中"""
+    if not isinstance(round_info, dict):
+        return False
+    if round_info.get('type') == FREE_DEBATE_TYPE:
+        return True
+    return all([round_info.get('side', ''), round_info.get('speaker', ''), round_info.get('type', '')])
+
+def round_label(index, round_info) -> str:
+    """回合列表中显示的文字，index 从 0 开始"""
+    round_type = round_info.get('type', '')
+    # 处理自由辩论特殊情况
+    if round_type == FREE_DEBATE_TYPE:
+        side_text = "双方"
+    else:
+        side_text = "正方" if round_info.get('side', '') == 'affirmative' else "反方"
+    return f"{index+1}. [{side_text}] {round_info.get('speaker', '')} - {round_type} ({round_info.get('time', 0)}秒)"
 
 class DebateConfig:
     """辩论赛配置管理类"""
@@ -27,23 +56,44 @@ class DebateConfig:
         """
         # 每次加载配置都会新建 DebateConfig 实例，不会残留旧数据
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                config = cls(data)
-                config.validate()
-                return config
+            with open(file_path, 'rb') as f:
+                return cls.from_bytes(f.read())
+        except ConfigValidationError:
+            raise
+        except Exception as e:
+            raise ConfigValidationError(f"配置文件解析失败: {e}")
+
+    @classmethod
+    def from_bytes(cls, raw):
+        """从 UTF-8 编码的 JSON 内容加载并验证配置
+        
+        Raises:
+            ConfigValidationError: 配置验证失败
+        """
+        try:
+            data = json.loads(raw.decode('utf-8'))
         except json.JSONDecodeError as e:
             raise ConfigValidationError(f"JSON解析错误: {e}")
         except Exception as e:
             raise ConfigValidationError(f"配置文件解析失败: {e}")
+        config = cls(data)
+        try:
+            config.validate()
+        except ConfigValidationError:
+            raise
+        except Exception as e:
+            raise ConfigValidationError(f"配置文件解析失败: {e}")
+        return config
 
-    def __init__(self, data):
+    def __init__(self, data, round_labels=None):
         """初始化配置
         
         Args:
             data: 配置数据字典
+            round_labels: 预先生成的 get_round_labels() 结果，从缓存恢复已验证的配置时传入
         """
         self.data = data
+        self._round_labels = [tuple(label) for label in round_labels] if round_labels is not None else None
         
     def validate(self):
         """验证配置有效性
@@ -51,65 +101,13 @@ class DebateConfig:
         Raises:
             ConfigValidationError: 配置验证失败
         """
-        # 验证必要的顶级字段
-        required_fields = ['topic', 'affirmative', 'negative', 'rounds']
-        for field in required_fields:
-            if field not in self.data:
-                raise ConfigValidationError(f"缺少必要的配置字段: {field}")
-                
-        # 验证辩方配置
-        for side in ['affirmative', 'negative']:
-            if not isinstance(self.data[side], dict):
-                raise ConfigValidationError(f"{side} 字段必须是对象")
-                
-            # 验证辩方必要字段
-            side_required = ['school', 'viewpoint']
-            for field in side_required:
-                if field not in self.data[side]:
-                    raise ConfigValidationError(f"{side} 缺少必要字段: {field}")
-        
-        # 验证回合配置
-        if not isinstance(self.data['rounds'], list):
-            raise ConfigValidationError("rounds 字段必须是数组")
-            
-        for i, round_data in enumerate(self.data['rounds']):
-            if not isinstance(round_data, dict):
-                raise ConfigValidationError(f"第 {i+1} 个回合配置必须是对象")
-                
-            # 验证回合必要字段
-            round_required = ['side', 'speaker', 'type', 'time']
-            for field in round_required:
-                if field not in round_data:
-                    raise ConfigValidationError(f"第 {i+1} 个回合缺少必要字段: {field}")
-                    
-            # 验证side字段值
-            if round_data['side'] not in ['affirmative', 'negative']:
-                if round_data['type'] != '自由辩论':
-                    raise ConfigValidationError(
-                        f"第 {i+1} 个回合的 side 字段必须是 'affirmative' 或 'negative'"
-                    )
-            
-            # 验证时间字段
-            if not isinstance(round_data['time'], int) or round_data['time'] <= 0:
-                raise ConfigValidationError(
-                    f"第 {i+1} 个回合的 time 字段必须是正整数"
-                )  
-        # 验证辩手角色字段
-        if 'debater_roles' in self.data:
-            if not isinstance(self.data['debater_roles'], dict):
-                raise ConfigValidationError("debater_roles 字段必须是对象")
-                
-            # 检查是否包含必要的辩手角色
-            recommended_roles = [
-                'affirmative_first', 'affirmative_second', 'affirmative_third', 'affirmative_fourth',
-                'negative_first', 'negative_second', 'negative_third', 'negative_fourth'
-            ]
-            
-            missing_roles = [role for role in recommended_roles if role not in self.data['debater_roles']]
-            if missing_roles:
-                # 不抛出错误，但记录警告
-                import logging
-                logging.getLogger('debate_app').warning(f"配置中缺少推荐的辩手角色: {', '.join(missing_roles)}")
+        errors, warnings = validate_config(self.data)
+        for issue in warnings:
+            # 不抛出错误，但记录警告
+            logger.warning(f"配置警告 {issue.path}: {issue.message}")
+        if errors:
+            raise ConfigValidationError(
+                f"发现 {len(errors)} 个问题:\n{format_issues(errors)}", errors)
             
     def to_dict(self) -> Dict[str, Any]:
         """返回配置数据字典
@@ -136,6 +134,19 @@ class DebateConfig:
         """
         return self.data.get('rounds', [])
     
+    def get_round_labels(self) -> List[tuple]:
+        """获取回合列表显示文字，结果会被缓存
+        
+        Returns:
+            List[tuple]: (回合索引, 显示文字)，缺少必要信息的回合被跳过
+        """
+        if self._round_labels is None:
+            labels = [(index, round_label(index, round_info))
+                      for index, round_info in enumerate(self.get_rounds())
+                      if is_listed_round(round_info)]
+            self._round_labels = labels
+        return self._round_labels
+    
     def get_debater_roles(self) -> Dict[str, str]:
         """获取辩手角色映射
         
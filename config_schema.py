@@ -0,0 +1,262 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""辩论配置的声明式模式与编译后的验证器
+
+CONFIG_SCHEMA 用几个简单的节点描述配置结构，compile_schema() 在导入时
+把它编译成一组嵌套的闭包，之后每次验证只是调用闭包，不再解释模式。
+验证会收集全部问题，每个问题带有 JSON 路径（如 $.rounds[3].time）。
+
+批量验证（比赛日之前检查全部配置文件）:
+    python -m config_schema configs/ --jobs 8
+    python -m config_schema a.json b.json tournament.jsonl
+"""
+
+import os
+import sys
+import json
+import argparse
+from collections import namedtuple
+
+FREE_DEBATE_TYPE = '自由辩论'
+SIDES = ('affirmative', 'negative')
+RECOMMENDED_ROLES = [
+    'affirmative_first', 'affirmative_second', 'affirmative_third', 'affirmative_fourth',
+    'negative_first', 'negative_second', 'negative_third', 'negative_fourth'
+]
+
+# 验证问题：path 为 JSON 路径，message 为说明
+Issue = namedtuple('Issue', ['path', 'message'])
+
+
+# 模式节点
+class AnyValue:
+    """任意值"""
+
+
+class Object:
+    """对象
+
+    Args:
+        required: {字段名: 节点}，必须存在的字段
+        optional: {字段名: 节点}，可选字段
+        rules: 额外规则，函数 (value, path, errors, warnings)
+        type_message: 不是对象时的错误说明
+    """
+
+    def __init__(self, required=None, optional=None, rules=(), type_message="必须是对象"):
+        self.required = required or {}
+        self.optional = optional or {}
+        self.rules = rules
+        self.type_message = type_message
+
+
+class Array:
+    """数组，每个元素都按 item 验证"""
+
+    def __init__(self, item, type_message="必须是数组"):
+        self.item = item
+        self.type_message = type_message
+
+
+class PositiveInt:
+    """正整数"""
+
+    def __init__(self, message="必须是正整数"):
+        self.message = message
+
+
+# 自定义规则
+def _side_rule(value, path, errors, warnings):
+    """side 必须是正方或反方，自由辩论除外"""
+    if 'side' in value and value['side'] not in SIDES and value.get('type') != FREE_DEBATE_TYPE:
+        errors.append(Issue(f"{path}.side", "必须是 'affirmative' 或 'negative'"))
+
+
+def _free_debate_rule(value, path, errors, warnings):
+    """自由辩论时间平分给双方，奇数秒会被舍去一秒"""
+    time_value = value.get('time')
+    if value.get('type') == FREE_DEBATE_TYPE and isinstance(time_value, int) and time_value % 2:
+        warnings.append(Issue(f"{path}.time", f"自由辩论总时间 {time_value} 秒为奇数，每方 {time_value // 2} 秒"))
+
+
+def _recommended_roles_rule(value, path, errors, warnings):
+    """缺少推荐的辩手角色只给出警告"""
+    missing = [role for role in RECOMMENDED_ROLES if role not in value]
+    if missing:
+        warnings.append(Issue(path, f"缺少推荐的辩手角色: {', '.join(missing)}"))
+
+
+SIDE_SCHEMA = Object(required={'school': AnyValue(), 'viewpoint': AnyValue()})
+
+ROUND_SCHEMA = Object(
+    required={'side': AnyValue(), 'speaker': AnyValue(), 'type': AnyValue(), 'time': PositiveInt()},
+    rules=(_side_rule, _free_debate_rule),
+    type_message="回合配置必须是对象",
+)
+
+CONFIG_SCHEMA = Object(
+    required={
+        'topic': AnyValue(),
+        'affirmative': SIDE_SCHEMA,
+        'negative': SIDE_SCHEMA,
+        'rounds': Array(ROUND_SCHEMA),
+    },
+    optional={
+        'debater_roles': Object(rules=(_recommended_roles_rule,)),
+    },
+    type_message="配置必须是对象",
+)
+
+
+# 编译
+def compile_schema(node):
+    """把模式节点编译成验证闭包 check(value, path, errors, warnings)"""
+    if isinstance(node, AnyValue):
+        def check(value, path, errors, warnings):
+            pass
+        return check
+
+    if isinstance(node, PositiveInt):
+        message = node.message
+
+        def check(value, path, errors, warnings):
+            if not isinstance(value, int) or value <= 0:
+                errors.append(Issue(path, message))
+        return check
+
+    if isinstance(node, Array):
+        check_item = compile_schema(node.item)
+        type_message = node.type_message
+
+        def check(value, path, errors, warnings):
+            if not isinstance(value, list):
+                errors.append(Issue(path, type_message))
+                return
+            for i, item in enumerate(value):
+                check_item(item, f"{path}[{i}]", errors, warnings)
+        return check
+
+    if isinstance(node, Object):
+        required = tuple((name, compile_schema(child)) for name, child in node.required.items())
+        optional = tuple((name, compile_schema(child)) for name, child in node.optional.items())
+        rules = tuple(node.rules)
+        type_message = node.type_message
+
+        def check(value, path, errors, warnings):
+            if not isinstance(value, dict):
+                errors.append(Issue(path, type_message))
+                return
+            for name, check_field in required:
+                if name in value:
+                    check_field(value[name], f"{path}.{name}", errors, warnings)
+                else:
+                    errors.append(Issue(f"{path}.{name}", "缺少必要字段"))
+            for name, check_field in optional:
+                if name in value:
+                    check_field(value[name], f"{path}.{name}", errors, warnings)
+            for rule in rules:
+                rule(value, path, errors, warnings)
+        return check
+
+    raise TypeError(f"未知的模式节点: {node!r}")
+
+
+_check_config = compile_schema(CONFIG_SCHEMA)
+
+
+def validate_config(data):
+    """验证配置数据
+
+    Returns:
+        Tuple[List[Issue], List[Issue]]: (错误, 警告)
+    """
+    errors = []
+    warnings = []
+    _check_config(data, '$', errors, warnings)
+    return errors, warnings
+
+
+def format_issues(issues):
+    return "\n".join(f"{issue.path}: {issue.message}" for issue in issues)
+
+
+# 批量验证
+def validate_file(path):
+    """验证一个配置文件或赛事包，供进程池调用
+
+    Returns:
+        Tuple[str, List[Tuple[str, str, str]]]: (路径, [(级别, JSON路径, 说明)])
+    """
+    results = []
+    try:
+        with open(path, 'rb') as f:
+            if path.lower().endswith(('.jsonl', '.ndjson')):
+                documents = [(f"第 {n} 行", line) for n, line in enumerate(f, 1) if line.strip()]
+            else:
+                documents = [(None, f.read())]
+        for location, raw in documents:
+            prefix = f"{location} " if location else ""
+            try:
+                data = json.loads(raw.decode('utf-8'))
+            except ValueError as e:
+                results.append(('error', f"{prefix}$", f"JSON解析错误: {e}"))
+                continue
+            errors, warnings = validate_config(data)
+            results.extend(('error', prefix + issue.path, issue.message) for issue in errors)
+            results.extend(('warning', prefix + issue.path, issue.message) for issue in warnings)
+    except OSError as e:
+        results.append(('error', '$', f"无法读取文件: {e}"))
+    return path, results
+
+
+def _collect_paths(inputs):
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                for name in sorted(files):
+                    if name.lower().endswith(('.json', '.jsonl', '.ndjson')):
+                        yield os.path.join(root, name)
+        else:
+            yield item
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="批量验证辩论配置文件")
+    parser.add_argument('paths', nargs='+', help="配置文件、赛事包或目录")
+    parser.add_argument('--jobs', '-j', type=int, default=None, help="并行进程数，默认为CPU核心数")
+    parser.add_argument('--quiet', '-q', action='store_true', help="只输出有错误的文件")
+    args = parser.parse_args(argv)
+
+    paths = list(_collect_paths(args.paths))
+    if not paths:
+        print("没有找到配置文件")
+        return 1
+
+    if args.jobs == 1 or len(paths) == 1:
+        failed = _report(map(validate_file, paths), args.quiet)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        chunksize = max(1, len(paths) // ((args.jobs or os.cpu_count() or 1) * 4))
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            failed = _report(executor.map(validate_file, paths, chunksize=chunksize), args.quiet)
+
+    print(f"共 {len(paths)} 个文件，{failed} 个验证失败")
+    return 1 if failed else 0
+
+
+def _report(results, quiet=False):
+    """输出验证结果，返回失败的文件数"""
+    failed = 0
+    for path, issues in results:
+        has_error = any(level == 'error' for level, _, _ in issues)
+        failed += has_error
+        if quiet and not has_error:
+            continue
+        print(f"{'✗' if has_error else '✓'} {path}")
+        for level, json_path, message in issues:
+            print(f"    [{'错误' if level == 'error' else '警告'}] {json_path}: {message}")
+    return failed
+
+
+if __name__ == "__main__":
+    sys.exit(main())
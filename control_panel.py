@@ -4,21 +4,23 @@
 from PyQt5.QtWidgets import (QMainWindow, QLabel, QVBoxLayout, QHBoxLayout, 
                             QWidget, QPushButton, QGridLayout, QFrame, 
                             QFileDialog, QMessageBox, QGraphicsDropShadowEffect, 
-                            QGroupBox, QStyle, QListWidget, QStackedLayout, QLCDNumber,
-                            QApplication)
-from PyQt5.QtCore import Qt, pyqtSignal, QTimer
+                            QGroupBox, QStyle, QStackedLayout, QLCDNumber,
+                            QApplication, QComboBox)
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QFileSystemWatcher
 from PyQt5.QtGui import QFont, QColor
 
 import os
 import logging
 from typing import Dict, Any, Optional
 
-# 新增：导入 markdown 库
-import markdown
-
 # 导入自定义模块
-from utils import logger
-from config_manager import DebateConfig, ConfigValidationError
+from utils import logger, render_markdown
+from startup_profiler import profiler
+from config_manager import DebateConfig, ConfigValidationError, is_listed_round
+from config_cache import load_config
+from config_diff import diff_config
+from tournament_bundle import is_bundle_path, open_bundle
+from rounds_list import RoundsListView
 
 class ControlPanel(QMainWindow): 
     """后台控制窗口，用于管理辩论计时和设置"""
@@ -26,6 +28,7 @@ class ControlPanel(QMainWindow):
     # 定义自定义信号
     roundSelected = pyqtSignal(int)
     roundTerminated = pyqtSignal()  # 回合终止信号
+    configLoaded = pyqtSignal(object)  # 加载了新的比赛配置，参数为配置字典
     
     def __init__(self, display_board):
         super().__init__()
@@ -34,6 +37,7 @@ class ControlPanel(QMainWindow):
         self.title = "辩论控制面板"
         self.current_config_file = ""
         self.debate_config = None
+        self.bundle = None  # 当前打开的赛事包
         self.is_free_debate = False  # 标记当前是否为自由辩论回合
         self.round_in_progress = False  # 添加回合进行中的标志
         
@@ -44,14 +48,23 @@ class ControlPanel(QMainWindow):
             QPushButton:hover { background-color: #106EBE; }
             QPushButton:pressed { background-color: #005A9E; }
             QPushButton:disabled { background-color: #C8C8C8; color: #6E6E6E; }
-            QListWidget { background-color: white; border: 1px solid #E1DFDD; border-radius: 4px; padding: 5px; }
-            QListWidget::item { padding: 8px; border-radius: 4px; }
-            QListWidget::item:selected { background-color: #E1EFFF; color: #0078D4; }
-            QListWidget::item:hover:!selected { background-color: #F3F2F1; }
+            QListView { background-color: white; border: 1px solid #E1DFDD; border-radius: 4px; padding: 5px; }
+            QListView::item { padding: 8px; border-radius: 4px; }
+            QListView::item:selected { background-color: #E1EFFF; color: #0078D4; }
+            QListView::item:hover:!selected { background-color: #F3F2F1; }
         """)
-        self.initUI()
+        with profiler.phase('ControlPanel.initUI'):
+            self.initUI()
         logger.info("ControlPanel UI 初始化完成")
 
+        # 配置文件热重载 - 编辑器保存时可能连续触发多次，稍作合并
+        self.config_watcher = QFileSystemWatcher(self)
+        self.config_watcher.fileChanged.connect(self._on_config_file_changed)
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(150)
+        self._reload_timer.timeout.connect(self.reload_config)
+
     def initUI(self):
         logger.debug("ControlPanel.initUI 开始")
         self.setWindowTitle(self.title)
@@ -86,10 +99,23 @@ class ControlPanel(QMainWindow):
         load_config_btn.setStyleSheet("QPushButton { background-color: #0078D4; color: white; padding: 8px 16px; border-radius: 4px; font-weight: bold; }")
         load_config_btn.clicked.connect(self.load_config)
         load_config_btn.setFixedWidth(150)
+        load_bundle_btn = QPushButton("打开赛事目录")
+        load_bundle_btn.setIcon(self.style().standardIcon(getattr(QStyle, "SP_DirOpenIcon")))
+        load_bundle_btn.setStyleSheet("QPushButton { background-color: #0078D4; color: white; padding: 8px 16px; border-radius: 4px; font-weight: bold; }")
+        load_bundle_btn.clicked.connect(self.load_bundle_directory)
+        load_bundle_btn.setFixedWidth(150)
         self.config_path_label = QLabel("未加载配置文件")
         self.config_path_label.setStyleSheet("color: #605E5C; padding: 0px 10px;")
+        # 比赛选择 - 只在打开赛事包时显示
+        self.match_combo = QComboBox()
+        self.match_combo.setFont(QFont("微软雅黑", 11))
+        self.match_combo.setMinimumWidth(240)
+        self.match_combo.activated.connect(self.load_match)
+        self.match_combo.setVisible(False)
         config_layout.addWidget(load_config_btn)
+        config_layout.addWidget(load_bundle_btn)
         config_layout.addWidget(self.config_path_label, 1)
+        config_layout.addWidget(self.match_combo)
         header_layout.addWidget(title_label)
         header_layout.addLayout(config_layout)
         main_layout.addWidget(header_frame)
@@ -111,11 +137,12 @@ class ControlPanel(QMainWindow):
         rounds_header = QLabel("辩论流程")
         rounds_header.setFont(QFont("微软雅黑", 14, QFont.Bold))
         rounds_header.setStyleSheet("color: #323130; margin-bottom: 10px;")
-        self.rounds_list = QListWidget()
+        self.rounds_list = RoundsListView()
         self.rounds_list.setFont(QFont("微软雅黑", 12))
-        self.rounds_list.currentRowChanged.connect(self.on_round_selected)
+        self.rounds_list.currentRowChanged.connect(
+            lambda row: self.on_round_selected(self.rounds_list.model().round_index(row)))
         self.rounds_list.setAlternatingRowColors(True)
-        self.rounds_list.setStyleSheet("QListWidget { alternate-background-color: #FAFAFA; }")
+        self.rounds_list.setStyleSheet("QListView { alternate-background-color: #FAFAFA; }")
         rounds_layout.addWidget(rounds_header)
         rounds_layout.addWidget(self.rounds_list)
         content_layout.addWidget(rounds_frame)
@@ -292,87 +319,23 @@ class ControlPanel(QMainWindow):
         logger.debug("ControlPanel.initUI 结束")
     
     def load_config_from_path(self, file_path):
-        """从指定路径加载配置文件"""
+        """从指定路径加载配置文件，赛事包则加载其中第一场比赛"""
         try:
             if not os.path.exists(file_path):
                 logger.error(f"配置文件不存在: {file_path}")
                 return False
-                
-            # 清除所有相关区域内容
-            self.rounds_list.clear()
-            self.current_round_label.setText("未选择环节")
-            self.current_time_label.setText("时长: 0分钟")
-            self.status_value.setText("就绪")
-            
-            # 读取并验证配置文件
-            config = DebateConfig.from_file(file_path)
-            self.debate_config = config
-            self.current_config_file = file_path
-            self.config_path_label.setText(os.path.basename(file_path))
-
-            # 获取回合数据并验证
-            rounds_data = config.get_rounds()
-            logger.info(f"配置文件包含 {len(rounds_data)} 个回合")
-            
-            if not rounds_data:
-                logger.warning("配置文件中没有回合数据")
-                QMessageBox.warning(self, "警告", "配置文件中没有找到回合信息")
-                return False
             
-            # 更新环节列表
-            self.rounds_list.clear()
-            for index, round_info in enumerate(rounds_data):
-                try:
-                    # 验证回合数据完整性
-                    if not isinstance(round_info, dict):
-                        logger.error(f"回合 {index+1} 数据格式错误")
-                        continue
-                        
-                    side = round_info.get('side', '')
-                    speaker = round_info.get('speaker', '')
-                    round_type = round_info.get('type', '')
-                    time_seconds = round_info.get('time', 0)
-                    
-                    if not all([side, speaker, round_type]) and round_type != '自由辩论':
-                        logger.error(f"回合 {index+1} 缺少必要信息: side={side}, speaker={speaker}, type={round_type}")
-                        continue
-                    
-                    # 处理自由辩论特殊情况
-                    if round_type == '自由辩论':
-                        side_text = "双方"
-                    else:
-                        side_text = "正方" if side == 'affirmative' else "反方"
-                    
-                    item_text = f"{index+1}. [{side_text}] {speaker} - {round_type} ({time_seconds}秒)"
-                    self.rounds_list.addItem(item_text)
-                    logger.debug(f"添加回合: {item_text}")
-                    
-                except Exception as e:
-                    logger.error(f"处理回合 {index+1} 时出错: {e}")
-                    continue
-            
-            # 验证是否成功添加了回合
-            if self.rounds_list.count() == 0:
-                logger.error("没有成功添加任何回合到列表中")
-                QMessageBox.critical(self, "错误", "配置文件中的回合数据无法解析")
-                return False
-            
-            logger.info(f"成功添加 {self.rounds_list.count()} 个回合到列表")
-            
-            # 使用单次定时器确保UI完成清理
-            QTimer.singleShot(100, lambda: self.display_board.set_debate_config(config.to_dict()))
+            if is_bundle_path(file_path):
+                return self.load_bundle(file_path)
             
-            # 启用控制按钮
-            self.enable_controls()
-            self.status_value.setText("配置已加载")
-            logger.info(f"配置文件加载成功: {file_path}")
+            # 单场配置文件
+            self.bundle = None
+            self.match_combo.setVisible(False)
             
-            # 强制刷新界面并选择第一个环节
-            self.rounds_list.viewport().update()  # 强制刷新列表控件
-            self.rounds_list.setCurrentRow(0)
-            QApplication.processEvents()  # 处理界面事件队列
-            
-            return True
+            # 读取并验证配置文件（命中缓存时跳过解析和验证）
+            self._clear_round_display()
+            config = load_config(file_path)
+            return self._apply_loaded_config(config, file_path, os.path.basename(file_path))
 
         except ConfigValidationError as e:
             logger.error(f"配置文件验证失败: {e}")
@@ -382,17 +345,242 @@ class ControlPanel(QMainWindow):
             logger.error(f"加载配置文件失败: {e}", exc_info=True)
             QMessageBox.critical(self, "错误", f"无法加载配置文件:\n{e}")
             return False
+
+    def load_bundle(self, bundle_path):
+        """打开赛事包，只建立索引，然后加载第一场比赛"""
+        try:
+            bundle = open_bundle(bundle_path)
+        except Exception as e:
+            logger.error(f"打开赛事包失败: {e}", exc_info=True)
+            QMessageBox.critical(self, "错误", f"无法打开赛事包:\n{e}")
+            return False
+        if len(bundle) == 0:
+            QMessageBox.warning(self, "警告", "赛事包中没有比赛")
+            return False
+        
+        logger.info(f"已打开赛事包: {bundle_path}，共 {len(bundle)} 场比赛")
+        self.bundle = bundle
+        self.match_combo.blockSignals(True)
+        self.match_combo.clear()
+        self.match_combo.addItems([f"{i+1}. {title}" for i, title in enumerate(bundle.titles())])
+        self.match_combo.blockSignals(False)
+        self.match_combo.setVisible(True)
+        return self.load_match(0)
+
+    def load_match(self, index):
+        """加载赛事包中的第 index 场比赛"""
+        if self.bundle is None or not 0 <= index < len(self.bundle):
+            return False
+        if self.round_in_progress:
+            QMessageBox.warning(self, "警告", "当前环节进行中，不能切换比赛")
+            return False
+        try:
+            self._clear_round_display()
+            config = self.bundle.load_match(index)
+            self.match_combo.setCurrentIndex(index)
+            # 目录形式的赛事包每场比赛是独立文件，可以热重载
+            match_path = self.bundle.match_path(index) if hasattr(self.bundle, 'match_path') else None
+            label = f"{os.path.basename(self.bundle.path)} - 第 {index+1} 场"
+            return self._apply_loaded_config(config, match_path, label)
+        except ConfigValidationError as e:
+            logger.error(f"比赛配置验证失败: {e}")
+            QMessageBox.critical(self, "配置错误", f"比赛配置验证失败:\n{e}")
+            return False
+        except Exception as e:
+            logger.error(f"加载比赛失败: {e}", exc_info=True)
+            QMessageBox.critical(self, "错误", f"无法加载比赛:\n{e}")
+            return False
+
+    def _clear_round_display(self):
+        """清除所有相关区域内容"""
+        self.rounds_list.clear()
+        self.current_round_label.setText("未选择环节")
+        self.current_time_label.setText("时长: 0分钟")
+        self.status_value.setText("就绪")
+
+    def _apply_loaded_config(self, config, file_path, display_name):
+        """把已验证的配置应用到控制面板和展示窗口
+        
+        Args:
+            config: DebateConfig
+            file_path: 配置文件路径，用于热重载；None 表示不监视
+            display_name: 显示在界面上的配置名称
+        """
+        self.debate_config = config
+        self.current_config_file = file_path or ""
+        self.config_path_label.setText(display_name)
+
+        # 获取回合数据并验证
+        rounds_data = config.get_rounds()
+        logger.info(f"配置文件包含 {len(rounds_data)} 个回合")
+        
+        if not rounds_data:
+            logger.warning("配置文件中没有回合数据")
+            QMessageBox.warning(self, "警告", "配置文件中没有找到回合信息")
+            return False
+        
+        # 更新环节列表 - 模型直接引用回合数据，显示文字在绘制时才生成
+        self.rounds_list.model().set_config(config)
+        if self.rounds_list.count() < len(rounds_data):
+            skipped = [i + 1 for i, round_info in enumerate(rounds_data) if not is_listed_round(round_info)]
+            logger.error(f"以下回合缺少必要信息，未加入列表: {skipped}")
+        
+        # 验证是否成功添加了回合
+        if self.rounds_list.count() == 0:
+            logger.error("没有成功添加任何回合到列表中")
+            QMessageBox.critical(self, "错误", "配置文件中的回合数据无法解析")
+            return False
+        
+        logger.info(f"成功添加 {self.rounds_list.count()} 个回合到列表")
+        
+        self.configLoaded.emit(config.to_dict())
+        
+        # 使用单次定时器确保UI完成清理
+        QTimer.singleShot(100, lambda: self.display_board.set_debate_config(config.to_dict()))
+        
+        # 监视配置文件，修改后自动热重载
+        self._watch_config_file(file_path)
+        
+        # 启用控制按钮
+        self.enable_controls()
+        self.status_value.setText("配置已加载")
+        logger.info(f"配置文件加载成功: {display_name}")
+        
+        # 强制刷新界面并选择第一个环节
+        self.rounds_list.viewport().update()  # 强制刷新列表控件
+        self.rounds_list.setCurrentRow(0)
+        QApplication.processEvents()  # 处理界面事件队列
+        
+        return True
             
+    def _watch_config_file(self, file_path):
+        """只监视当前配置文件，file_path 为空时停止监视"""
+        watched = self.config_watcher.files()
+        if watched and watched != [file_path]:
+            self.config_watcher.removePaths(watched)
+        if file_path and file_path not in self.config_watcher.files():
+            self.config_watcher.addPath(file_path)
+
+    def _on_config_file_changed(self, file_path):
+        if file_path == self.current_config_file:
+            self._reload_timer.start()
+
+    def reload_config(self):
+        """热重载当前配置文件，只把变化的部分应用到界面，计时不受影响"""
+        file_path = self.current_config_file
+        if not file_path or not self.debate_config:
+            return False
+        if not os.path.exists(file_path):
+            # 部分编辑器先删除再写入，等下一次变化通知
+            logger.warning(f"配置文件暂时不存在: {file_path}")
+            return False
+        # 文件被替换后监视会失效，需要重新添加
+        self._watch_config_file(file_path)
+        
+        try:
+            # 文件监视已经报告变化，必须读取内容比较，不能只看修改时间和大小
+            new_config = load_config(file_path, verify=True)
+        except ConfigValidationError as e:
+            logger.warning(f"修改后的配置文件验证失败，保留当前配置: {e}")
+            self.status_value.setText("配置文件有误，未重载")
+            return False
+        except Exception as e:
+            logger.error(f"热重载配置文件失败: {e}", exc_info=True)
+            return False
+        
+        diff = diff_config(self.debate_config.data, new_config.data)
+        if diff.is_empty():
+            return True
+        
+        logger.info(f"配置文件已修改，热重载: {diff}")
+        self.debate_config = new_config
+        self._update_round_items(new_config)
+        self.display_board.apply_config_diff(new_config.to_dict(), diff)
+        
+        # 未开始的选中环节需要刷新时长等显示
+        index = self.rounds_list.model().round_index(self.rounds_list.currentRow())
+        if not self.round_in_progress and index >= 0 and diff.round_changed(index):
+            self.on_round_selected(index)
+        self.status_value.setText("配置已更新")
+        return True
+
+    def _update_round_items(self, config):
+        """只刷新变化的回合列表项，回合数量变化时保留选中行"""
+        row = self.rounds_list.currentRow()
+        self.rounds_list.blockSignals(True)
+        try:
+            self.rounds_list.model().update_config(config)
+            if row >= 0 and self.rounds_list.currentRow() != row:
+                self.rounds_list.setCurrentRow(min(row, self.rounds_list.count() - 1))
+        finally:
+            self.rounds_list.blockSignals(False)
+
     def load_config(self):
         """加载配置文件"""
         logger.info("加载配置文件")
         options = QFileDialog.Options()
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "选择配置文件", "", "JSON Files (*.json)", options=options)
+            self, "选择配置文件", "",
+            "配置文件 (*.json *.jsonl *.ndjson);;JSON Files (*.json);;赛事包 (*.jsonl *.ndjson)",
+            options=options)
         if file_path:
             # 使用统一的加载方法
             self.load_config_from_path(file_path)
 
+    def load_bundle_directory(self):
+        """打开目录形式的赛事包"""
+        dir_path = QFileDialog.getExistingDirectory(self, "选择赛事目录", "")
+        if dir_path:
+            self.load_bundle(dir_path)
+
+    def restore_from_journal(self, record, state):
+        """按计时日志恢复上次未正常结束的比赛
+
+        Args:
+            record: 计时日志的最后一条记录
+            state: 修正后的计时快照，见 timer_journal.recovered_state
+        """
+        config_path, match = record.get('config'), record.get('match')
+        if match is not None:
+            loaded = self.load_bundle(config_path) and (match == 0 or self.load_match(match))
+        else:
+            loaded = self.load_config_from_path(config_path)
+        if not loaded:
+            logger.error(f"无法恢复计时状态，配置加载失败: {config_path}")
+            return False
+
+        # 显示板在配置应用之后才有环节数据
+        def restore_round(_config):
+            self.display_board.configApplied.disconnect(restore_round)
+            self._restore_round(record.get('round', -1), state)
+        self.display_board.configApplied.connect(restore_round)
+        return True
+
+    def _restore_round(self, index, state):
+        try:
+            row = self.rounds_list.model().row_of(index)
+            if row < 0:
+                return
+            self.rounds_list.setCurrentRow(row)
+            self.round_in_progress = True
+            self.rounds_list.setEnabled(False)
+            self.display_board.start_round(index)
+
+            timer_manager = self.display_board.timer_manager
+            timer_manager.restore_state(state)
+            if self.is_free_debate:
+                self.update_lcd_display(timer_manager.affirmative_time, 'affirmative')
+                self.update_lcd_display(timer_manager.negative_time, 'negative')
+
+            self.timer_control_btn.setEnabled(True)
+            self.reset_timer_btn.setEnabled(True)
+            self.timer_control_btn.setText("继续计时")
+            self.timer_control_btn.setIcon(self.style().standardIcon(getattr(QStyle, "SP_MediaPlay")))
+            self.status_value.setText("已恢复，暂停中")
+            logger.info(f"已恢复环节 {index+1} 的计时状态")
+        except Exception as e:
+            logger.error(f"恢复计时状态时出错: {e}", exc_info=True)
+
     def start_current_round(self):
         """开始当前选中的环节"""
         try:
@@ -400,7 +588,8 @@ class ControlPanel(QMainWindow):
                 QMessageBox.warning(self, "警告", "请先选择要开始的环节")
                 return
 
-            current_index = self.rounds_list.currentRow()
+            # 列表不显示信息不全的回合，行号需换算为配置中的索引
+            current_index = self.rounds_list.model().round_index(self.rounds_list.currentRow())
             round_info = self.debate_config.get_rounds()[current_index]
             
             # 验证时间设置
@@ -674,9 +863,9 @@ class ControlPanel(QMainWindow):
 
             # 新增：支持 Markdown 富文本
             if hasattr(self, 'current_round_label') and self.current_round_label:
-                # 允许 speaker 字段为 Markdown
+                # 允许 speaker 字段为 Markdown，只含 **加粗** 时不导入 markdown
                 md_text = f"{side_text} {round_info['speaker']} - {round_info['type']}"
-                html = markdown.markdown(md_text)
+                html = render_markdown(md_text)
                 self.current_round_label.setTextFormat(Qt.RichText)
                 self.current_round_label.setText(html)
             
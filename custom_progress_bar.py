@@ -1,12 +1,23 @@
 from PyQt5.QtWidgets import QProgressBar, QWidget, QGraphicsOpacityEffect, QLabel
-from PyQt5.QtCore import Qt, QRectF, QPropertyAnimation, QEasingCurve, pyqtProperty, QPoint, QPointF
-from PyQt5.QtGui import QPainter, QColor, QFontMetrics, QPen, QBrush, QPainterPath, QConicalGradient
+from PyQt5.QtCore import Qt, QRectF, QPropertyAnimation, QEasingCurve, pyqtProperty, QPoint, QPointF, QEvent
+from PyQt5.QtGui import (QPainter, QColor, QFontMetrics, QPen, QBrush, QPainterPath, QConicalGradient,
+                         QPixmap, QFont, QStaticText, QTransform)
 import logging
 import math
+import time
+
+from perf_metrics import metrics
 
 logger = logging.getLogger('debate_app.custom_progress_bar')
 class CircularProgressBar(QProgressBar):
-    """空心环形进度条 - 完全透明背景，无阴影效果"""
+    """空心环形进度条 - 完全透明背景，无阴影效果
+
+    背景环按设备像素比缓存为 QPixmap，画笔、字体和数字排版（QStaticText）
+    也一并缓存，每帧只重绘进度弧。尺寸、DPI、颜色或线宽变化时缓存失效。
+    """
+    
+    # 文字排版缓存上限（mm:ss 文本最多几千种）
+    STATIC_TEXT_CACHE_LIMIT = 256
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -18,6 +29,17 @@ class CircularProgressBar(QProgressBar):
         self.radius = 50                  # 增加环形半径
         self._value = 0
         self._maximum = 100
+        # 平滑模式下返回精确剩余值（浮点秒）的回调
+        self._value_source = None
+        
+        # 绘制缓存
+        self._cache_key = None
+        self._background_pixmap = None
+        self._arc_rect = QRectF()
+        self._progress_pen = None
+        self._text_pen = None
+        self._text_font = None
+        self._static_texts = {}
         
         # 增加固定尺寸
         self.setFixedSize(150, 150)  # 从120x120增加到150x150
@@ -47,6 +69,7 @@ class CircularProgressBar(QProgressBar):
 
     def setLineWidth(self, width):
         self.line_width = width
+        self._invalidate_cache()
         self.update()
 
     def setRadius(self, radius):
@@ -60,6 +83,7 @@ class CircularProgressBar(QProgressBar):
 
     def setProgressColor(self, color):
         self.progress_color = QColor(color)
+        self._progress_pen = None
         self.update()
 
     def setBackgroundColor(self, color):
@@ -69,30 +93,80 @@ class CircularProgressBar(QProgressBar):
 
     def setTextColor(self, color):
         self.text_color = QColor(color)
+        self._text_pen = None
         self.update()
 
     def setMaximum(self, value):
         """设置最大值"""
-        self._maximum = max(1, value)  # 确保最大值至少为1
-        self.update()
+        value = max(1, value)  # 确保最大值至少为1
+        if value != self._maximum:
+            self._maximum = value
+            self.update()
         
     def maximum(self):
         """获取最大值"""
         return self._maximum
         
     def setValue(self, value):
-        """设置当前值"""
-        self._value = min(max(0, value), self._maximum)
+        """设置当前值，只在值变化时请求重绘"""
+        value = min(max(0, value), self._maximum)
+        if value != self._value:
+            self._value = value
+            self.update()
+
+    def setValueSource(self, source):
+        """设置精确值来源，用于绘制亚秒级平滑的进度弧
+
+        Args:
+            source: 返回浮点剩余值的回调，None 表示只使用 setValue 的整数值
+        """
+        self._value_source = source
         self.update()
-        # 新增：强制立即重绘，确保进度条及时上色
-        self.repaint()
-        
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHints(QPainter.Antialiasing)
-        
-        # 确保背景完全透明并清除背景
-        painter.fillRect(self.rect(), Qt.transparent)
+
+    def _progress_value(self):
+        """绘制进度弧使用的值，文字仍显示整数值"""
+        if self._value_source is not None:
+            try:
+                return self._value_source()
+            except Exception as e:
+                logger.error(f"读取精确进度值失败: {e}")
+                self._value_source = None
+        return self._value
+
+    def resizeEvent(self, event):
+        """尺寸变化时缓存失效"""
+        self._invalidate_cache()
+        super().resizeEvent(event)
+
+    def changeEvent(self, event):
+        """字体变化时缓存失效"""
+        if event.type() == QEvent.FontChange:
+            self._invalidate_cache()
+        super().changeEvent(event)
+
+    def _invalidate_cache(self):
+        """清除所有绘制缓存"""
+        self._cache_key = None
+        self._background_pixmap = None
+        self._progress_pen = None
+        self._text_pen = None
+        self._text_font = None
+        self._static_texts.clear()
+
+    def _device_pixel_ratio(self):
+        try:
+            return self.devicePixelRatioF()
+        except AttributeError:  # 低版本Qt可能没有这个方法
+            return 1.0
+
+    def _ensure_cache(self):
+        """按尺寸、设备像素比和线宽重建静态图层"""
+        dpr = self._device_pixel_ratio()
+        key = (self.width(), self.height(), dpr, self.line_width)
+        if key == self._cache_key:
+            return
+        self._invalidate_cache()
+        self._cache_key = key
         
         # 调整绘制区域 - 确保整个圆环都在可见区域内
         size = min(self.width(), self.height()) - self.line_width * 2
@@ -100,60 +174,83 @@ class CircularProgressBar(QProgressBar):
         # 定义弧的边界矩形，考虑线宽并居中
         x_offset = (self.width() - size) / 2
         y_offset = (self.height() - size) / 2
-        arc_rect = QRectF(x_offset, y_offset, size, size)
+        self._arc_rect = QRectF(x_offset, y_offset, size, size)
         
-        # 首先绘制完整的背景环
+        # 预渲染完整的背景环
+        pixmap = QPixmap(max(1, int(self.width() * dpr)), max(1, int(self.height() * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHints(QPainter.Antialiasing)
         bg_pen = QPen(QColor(230, 230, 230, 70), self.line_width, Qt.SolidLine, Qt.RoundCap)
         bg_pen.setCosmetic(True)
         painter.setPen(bg_pen)
-        painter.drawEllipse(arc_rect)
-        
-        # 绘制进度环
-        progress = max(0.0, min(1.0, self._value / self._maximum))
-        angle = 360 * progress
+        painter.drawEllipse(self._arc_rect)
+        painter.end()
+        self._background_pixmap = pixmap
         
-        # 设置进度环画笔
-        pen = QPen(self.progress_color, self.line_width, Qt.SolidLine, Qt.RoundCap)
-        pen.setCosmetic(True)
-        painter.setPen(pen)
+        font = QFont(self.font())
+        font.setBold(True)
+        font.setPointSize(14)  # 增加字体大小，从10到14
+        self._text_font = font
+
+    def _static_text(self, text):
+        """返回已排版的文字"""
+        static_text = self._static_texts.get(text)
+        if static_text is None:
+            if len(self._static_texts) >= self.STATIC_TEXT_CACHE_LIMIT:
+                self._static_texts.clear()
+            static_text = QStaticText(text)
+            static_text.setTextFormat(Qt.PlainText)
+            static_text.prepare(QTransform(), self._text_font)
+            self._static_texts[text] = static_text
+        return static_text
         
-        # 修复：处理特殊情况
-        if progress <= 0:
-            # 进度为0时不绘制
-            pass
-        elif progress >= 1.0:
-            # 进度为100%时绘制完整圆环
-            painter.drawEllipse(arc_rect)
+    def paintEvent(self, event):
+        if metrics.enabled:
+            started = time.perf_counter_ns()
+            self._paint()
+            name = f"paint.{self.objectName() or f'progress@{id(self):x}'}"
+            metrics.sample(name, time.perf_counter_ns() - started)
+            metrics.count(name)
         else:
-            # 正常情况绘制弧线
-            # 注意：drawArc需要整数角度，转换为整数
-            start_angle = int(90 * 16)  # QPainter使用16为单位的角度
-            span_angle = int(-angle * 16)  # 逆时针，所以是负数
-            
-            # 正确的drawArc调用
-            painter.drawArc(arc_rect, start_angle, span_angle)
+            self._paint()
 
-        # 绘制中间文字
-        painter.setPen(QPen(self.text_color, 1, Qt.SolidLine))
+    def _paint(self):
+        self._ensure_cache()
+        if self._progress_pen is None:
+            self._progress_pen = QPen(QColor(self.progress_color), self.line_width, Qt.SolidLine, Qt.RoundCap)
+            self._progress_pen.setCosmetic(True)
+        if self._text_pen is None:
+            self._text_pen = QPen(QColor(self.text_color), 1, Qt.SolidLine)
         
-        # 修改：显示实际分秒而不是百分比 
-        minutes = int(self._value) // 60
-        seconds = int(self._value) % 60
-        text = f"{minutes:02d}:{seconds:02d}"  # 显示为 mm:ss 格式
+        painter = QPainter(self)
         
-        font = painter.font()
-        font.setBold(True)
-        font.setPointSize(14)  # 增加字体大小，从10到14
-        painter.setFont(font)
-        fm = painter.fontMetrics()
-        text_rect = fm.boundingRect(text)
+        # 背景环直接使用缓存
+        painter.drawPixmap(0, 0, self._background_pixmap)
         
-        # 修复: 使用整数坐标而不是浮点数
-        center_x = int(self.width() / 2)
-        center_y = int(self.height() / 2)
-        painter.drawText(center_x - text_rect.width()//2,
-                        center_y + text_rect.height()//2 - fm.descent(),
-                        text)
+        # 绘制进度环
+        progress = max(0.0, min(1.0, self._progress_value() / self._maximum))
+        if progress > 0:
+            painter.setRenderHints(QPainter.Antialiasing)
+            painter.setPen(self._progress_pen)
+            if progress >= 1.0:
+                # 进度为100%时绘制完整圆环
+                painter.drawEllipse(self._arc_rect)
+            else:
+                # QPainter使用16为单位的角度，逆时针所以跨度为负数
+                painter.drawArc(self._arc_rect, 90 * 16, int(-360 * progress * 16))
+
+        # 绘制中间文字 - 显示实际分秒而不是百分比
+        minutes = int(self._value) // 60
+        seconds = int(self._value) % 60
+        static_text = self._static_text(f"{minutes:02d}:{seconds:02d}")
+        text_size = static_text.size()
+        painter.setPen(self._text_pen)
+        painter.setFont(self._text_font)
+        painter.drawStaticText(QPointF((self.width() - text_size.width()) / 2,
+                                       (self.height() - text_size.height()) / 2),
+                               static_text)
 
 class RoundedProgressBar(CircularProgressBar):
     """适配原有接口的环形进度条"""
@@ -168,17 +265,6 @@ class RoundedProgressBar(CircularProgressBar):
         # 重写文字显示逻辑
         pass  # 文字已经在paintEvent中直接绘制
 
-    def resizeEvent(self, event):
-        """当控件大小改变时确保重绘"""
-        super().resizeEvent(event)
-        self.update()
-
-    def showEvent(self, event):
-        """当控件显示时确保完全重绘"""
-        super().showEvent(event)
-        self.update()
-        self.repaint()
-
 class DynamicIslandManager:
     def __init__(self, parent=None):
         self.parent = parent
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+
+from PyQt5.QtCore import Qt, QObject, QTimer, QUrl
+from utils import logger
+from lazy_imports import lazy_import
+
+QtMultimedia = lazy_import('PyQt5.QtMultimedia')
+
+from timer_core import NS_PER_MS
+
+# 提示音文件
+CUE_FILES = {
+    'notify': 'noti.wav',
+    'timeover': 'timeover.wav',
+}
+# 每种提示音预加载的实例数，上一次还没播完时用下一个实例
+POOL_SIZE = 3
+# 提前量：从调用 play() 到声音真正输出的估计延迟
+DEFAULT_LEAD_MS = 30
+
+
+class AudioCuePlayer(QObject):
+    """预加载的提示音播放器
+
+    preload() 把每个 WAV 解码进若干 QSoundEffect 实例，之后播放不再读文件。
+    主程序在首帧绘制之后调用 preload()，QtMultimedia 不占用启动时间；
+    在此之前播放会先同步加载。
+    schedule() 可以把提示音安排在某个截止时刻之前 lead_ms 毫秒播放，抵消
+    音频输出延迟，使声音和观众看到的秒数变化同时出现。
+    """
+
+    def __init__(self, media_dir, parent=None, pool_size=POOL_SIZE, lead_ms=DEFAULT_LEAD_MS):
+        super().__init__(parent)
+        self.media_dir = media_dir
+        self.pool_size = pool_size
+        self.lead_ms = lead_ms
+        self._pools = None
+        self._next_index = {}
+
+        # 待播放的提示音，同一时刻最多只有一个
+        self._pending = None
+        self._pending_timer = QTimer(self)
+        self._pending_timer.setSingleShot(True)
+        self._pending_timer.setTimerType(Qt.PreciseTimer)
+        self._pending_timer.timeout.connect(self._play_pending)
+
+    def preload(self):
+        """加载并解码全部提示音，重复调用不做处理"""
+        if self._pools is not None:
+            return
+        self._pools = {}
+        try:
+            for name, filename in CUE_FILES.items():
+                path = os.path.join(self.media_dir, filename)
+                if not os.path.exists(path):
+                    logger.warning(f"提示音文件不存在: {path}")
+                    continue
+                pool = []
+                for _ in range(self.pool_size):
+                    effect = QtMultimedia.QSoundEffect(self)
+                    effect.setSource(QUrl.fromLocalFile(path))
+                    pool.append(effect)
+                self._pools[name] = pool
+                self._next_index[name] = 0
+        except Exception as e:
+            logger.error(f"加载提示音时出错: {e}", exc_info=True)
+
+    def play(self, name):
+        """立即播放提示音"""
+        self.preload()
+        pool = self._pools.get(name)
+        if not pool:
+            return False
+        try:
+            effect = self._acquire(name, pool)
+            effect.play()
+            return True
+        except Exception as e:
+            logger.error(f"播放提示音 {name} 时出错: {e}", exc_info=True)
+            return False
+
+    def schedule(self, name, deadline_ns):
+        """安排提示音在 deadline_ns 纳秒后对齐输出，取代尚未播放的提示音
+
+        提前量之内的截止时刻会立即播放。
+        """
+        self.cancel()
+        self.preload()
+        if name not in self._pools:
+            return False
+        delay_ms = deadline_ns // NS_PER_MS - self.lead_ms
+        if delay_ms <= 0:
+            return self.play(name)
+        self._pending = name
+        self._pending_timer.start(delay_ms)
+        return True
+
+    def cancel(self):
+        """取消尚未播放的提示音"""
+        self._pending_timer.stop()
+        self._pending = None
+
+    def flush(self):
+        """立即播放尚未到时的提示音，没有时不做处理"""
+        if self._pending is not None:
+            self._pending_timer.stop()
+            self._play_pending()
+
+    def _play_pending(self):
+        name, self._pending = self._pending, None
+        if name:
+            self.play(name)
+
+    def _acquire(self, name, pool):
+        """取一个空闲实例，全部在播放时按顺序复用"""
+        for effect in pool:
+            if not effect.isPlaying():
+                return effect
+        index = self._next_index[name]
+        self._next_index[name] = (index + 1) % len(pool)
+        effect = pool[index]
+        effect.stop()
+        return effect
@@ -1,29 +1,35 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from PyQt5.QtWidgets import QApplication, QWidget  # 添加 QWidget 导入
+import time
+
 from PyQt5.QtGui import QColor
-from PyQt5.QtCore import QTimer
+from timer_core.engine import AFFIRMATIVE_COLOR, NEGATIVE_COLOR
 from utils import logger
+from perf_metrics import metrics
+from .frame_scheduler import FrameScheduler
+from .flash_engine import FlashEngine
+from .style_states import StyleStateManager, DEBATER_STATES, COUNTDOWN_COLORS, countdown_state
+
+# 辩手角色键中的位置名，按序号排列
+DEBATER_POSITIONS = ['first', 'second', 'third', 'fourth']
 
 class ContentUpdater:
     """内容更新和渲染管理类"""
     
     def __init__(self, parent):
         self.parent = parent
-        # 添加闪烁控制
-        self.flash_timer = QTimer()
-        self.flash_timer.setInterval(300)  # 300毫秒闪烁间隔
-        self.flash_timer.timeout.connect(self._on_flash_timer)
-        self.flash_count = 0
-        self.flash_max = 0
-        self.flash_color = None
-        self.flash_original_style = None
-        self.flash_widget = None
-        self.flash_state = False  # False表示显示原色，True表示显示闪烁色
+        # 帧调度器 - 合并同一帧内的重绘请求，不再同步 repaint
+        self.frame_scheduler = FrameScheduler(parent)
+        # 辩手标签的样式通过命名状态切换，状态不变时不重新设置样式
+        self.debater_styles = StyleStateManager(DEBATER_STATES)
+        # 倒计时文字颜色和时间提醒闪烁，多个倒计时可以同时闪烁，低性能模式下不做渐变
+        self.flash_engine = FlashEngine(parent, smooth=not getattr(parent, 'low_performance_mode', False))
     
     def update_active_content(self, widget, round_info):
         """更新活动控件内容"""
+        # 切换环节时上一环节的闪烁不再有意义
+        self.flash_engine.stop_all()
         if not round_info:
             # 若无内容，清空显示
             self._force_clear_labels(widget, ['round_title', 'speaker_info'])
@@ -48,7 +54,6 @@ class ContentUpdater:
             
             # 清除现有内容
             self._force_clear_labels(widget, ['round_title', 'speaker_info'])
-            QApplication.processEvents()
             
             # 设置新内容
             self._set_active_content(widget, round_info, side, side_color, is_free_debate)
@@ -66,19 +71,21 @@ class ContentUpdater:
             
             # 重新显示
             widget.setVisible(True)
-            widget.update()
-            widget.repaint()
+            self.frame_scheduler.mark_dirty(widget)
             
         except Exception as e:
             logger.error(f"更新活动内容时出错: {e}", exc_info=True)
     
     def update_timer_display(self, widget, timer_state):
         """更新计时器显示"""
+        started = time.perf_counter_ns() if metrics.enabled else None
         try:
             if timer_state['is_free_debate']:
                 self._update_free_debate_timers(widget, timer_state)
             else:
                 self._update_standard_timer(widget, timer_state)
+            if started is not None:
+                metrics.sample('update_timer_display', time.perf_counter_ns() - started)
         except Exception as e:
             logger.error(f"更新计时器显示时出错: {e}", exc_info=True)
     
@@ -88,40 +95,42 @@ class ContentUpdater:
             if not debater_roles:
                 return
                 
-            prefix = side_type
-            positions = ['first', 'second', 'third', 'fourth']
-            
-            for i, pos in enumerate(positions, 1):
-                key = f"{prefix}_{pos}"
-                label_key = f"{side_type}_{i}"
-                
-                if hasattr(side_widget.debaters_frame, 'debater_labels'):
-                    labels = side_widget.debaters_frame.debater_labels
-                    if label_key in labels:
-                        name = debater_roles.get(key, '待定')
-                        
-                        # 检查是否包含富文本标记
-                        if '**' in name:
-                            from utils import highlight_markers
-                            from PyQt5.QtCore import Qt
-                            rich_name = highlight_markers(name, side=side_type)
-                            labels[label_key].setTextFormat(Qt.RichText)
-                            labels[label_key].setText(rich_name)
-                        else:
-                            labels[label_key].setText(name)
+            for i in range(1, len(DEBATER_POSITIONS) + 1):
+                self.update_debater(side_widget, debater_roles, side_type, i)
                         
         except Exception as e:
             logger.error(f"更新辩手信息时出错: {e}", exc_info=True)
     
+    def update_debater(self, side_widget, debater_roles, side_type, number):
+        """更新单个辩手标签
+        
+        Args:
+            number: 辩手序号，1-4
+        """
+        key = f"{side_type}_{DEBATER_POSITIONS[number - 1]}"
+        label_key = f"{side_type}_{number}"
+        
+        if hasattr(side_widget.debaters_frame, 'debater_labels'):
+            labels = side_widget.debaters_frame.debater_labels
+            if label_key in labels:
+                name = debater_roles.get(key, '待定')
+                
+                # 检查是否包含富文本标记
+                if '**' in name:
+                    from utils import highlight_markers
+                    from PyQt5.QtCore import Qt
+                    rich_name = highlight_markers(name, side=side_type)
+                    labels[label_key].setTextFormat(Qt.RichText)
+                    labels[label_key].setText(rich_name)
+                else:
+                    labels[label_key].setText(name)
+    
     def highlight_active_debater(self, side_widgets, current_round):
         """高亮当前发言的辩手"""
         try:
             if not current_round:
                 return
             
-            # 重置所有样式
-            self._reset_all_debater_styles(side_widgets)
-            
             side = current_round['side']
             speaker = current_round['speaker']
             
@@ -131,18 +140,12 @@ class ContentUpdater:
                           '三辩': f'{side}_3', '四辩': f'{side}_4'}
             
             target_key = speaker_map.get(speaker)
+            # 重置其他辩手的样式，已经是普通状态的标签不会重新设置
+            self._reset_all_debater_styles(side_widgets, keep=(side, target_key))
             if target_key and hasattr(side_widget.debaters_frame, 'debater_labels'):
                 labels = side_widget.debaters_frame.debater_labels
                 if target_key in labels:
-                    labels[target_key].setStyleSheet("""
-                        background-color: #FFD700; 
-                        color: #000000; 
-                        border: 2px solid #FFA500; 
-                        border-radius: 4px; 
-                        padding: 2px; 
-                        font-weight: bold;
-                        letter-spacing: 1px;
-                    """)
+                    self.debater_styles.set_state(labels[target_key], 'active-speaker')
                     logger.debug(f"高亮辩手: {side} {speaker}")
                     
         except Exception as e:
@@ -156,8 +159,7 @@ class ContentUpdater:
                     label = getattr(widget, label_name)
                     if label:
                         label.clear()
-                        label.update()
-                        label.repaint()
+                        self.frame_scheduler.mark_dirty(label)
         except Exception as e:
             logger.error(f"强制清除标签时出错: {e}", exc_info=True)
     
@@ -169,8 +171,7 @@ class ContentUpdater:
                 title_text = round_info.get('description', "当前环节")
                 widget.round_title.setText(title_text)
                 widget.round_title.setStyleSheet("color: #323130; background: transparent;")
-                widget.round_title.update()
-                widget.round_title.repaint()
+                self.frame_scheduler.mark_dirty(widget.round_title)
             
             # 设置发言者信息
             if hasattr(widget, 'speaker_info'):
@@ -192,8 +193,7 @@ class ContentUpdater:
                     
                 style = f"color: {side_color}; font-weight: bold; background: transparent;"
                 widget.speaker_info.setStyleSheet(style)
-                widget.speaker_info.update()
-                widget.speaker_info.repaint()
+                self.frame_scheduler.mark_dirty(widget.speaker_info)
             
             # 设置计时器显示模式
             if hasattr(widget, 'timer_stack'):
@@ -222,12 +222,7 @@ class ContentUpdater:
                 # 设置进度条最大值和当前值
                 container.progress_bar.setMaximum(total_time)
                 container.progress_bar.setValue(current_time)
-                # 强制刷新进度条
-                container.progress_bar.update()
-                container.progress_bar.repaint()
-                # 强制刷新容器
-                container.update()
-                container.repaint()
+                self.frame_scheduler.mark_dirty(container.progress_bar)
             
             if hasattr(container, 'countdown_label'):
                 current_time = timer_state['current_time']
@@ -235,32 +230,24 @@ class ContentUpdater:
                 seconds = current_time % 60
                 container.countdown_label.setText(f"{minutes:02d}:{seconds:02d}")
                 
-                # 获取当前环节的辩方颜色
+                # 当前环节的辩方决定最后10秒的颜色
                 side = self.parent.current_round.get('side') if self.parent.current_round else None
-                side_color = "#0078D4" if side == "affirmative" else "#D13438"
+                
+                # 默认颜色 - 根据时间变化，闪烁时在此颜色和提醒色之间变化
+                self.flash_engine.set_base_color(container.countdown_label,
+                                                 COUNTDOWN_COLORS[countdown_state(current_time, side)])
                 
                 # 检查是否需要闪烁
                 if hasattr(self.parent.timer_manager, 'flash_target') and self.parent.timer_manager.flash_target > 0:
                     # 启动闪烁效果
-                    self._start_flashing(
+                    self.flash_engine.flash(
                         container.countdown_label, 
                         self.parent.timer_manager.flash_target,
-                        self.parent.timer_manager.flash_color,
-                        "color: #323130; font-weight: bold; background: transparent;"
+                        self.parent.timer_manager.flash_color
                     )
                     # 重置计时器管理器中的闪烁目标
                     self.parent.timer_manager.flash_target = 0
                 
-                # 默认样式 - 根据时间变化颜色
-                elif not self.flash_timer.isActive() or self.flash_widget != container.countdown_label:
-                    if current_time <= 10:
-                        style = f"color: {side_color}; font-weight: bold; background: transparent;"
-                    elif current_time <= 30:
-                        style = "color: #D13438; font-weight: bold; background: transparent;"
-                    else:
-                        style = "color: #323130; font-weight: bold; background: transparent;"
-                    container.countdown_label.setStyleSheet(style)
-                
         except Exception as e:
             logger.error(f"更新标准计时器时出错: {e}", exc_info=True)
     
@@ -277,10 +264,6 @@ class ContentUpdater:
             if hasattr(widget, 'current_round') and widget.current_round:
                 total_time = widget.current_round.get('time', 100) // 2  # 自由辩论时间的一半
             
-            # 每次都强制重新布局以确保进度条正确显示
-            container.layout().update()
-            QApplication.processEvents()
-            
             # 更新正方计时器
             if hasattr(container, 'aff_group'):
                 aff_group = container.aff_group
@@ -290,36 +273,27 @@ class ContentUpdater:
                     # 设置进度条最大值和当前值
                     aff_group.progress_bar.setMaximum(total_time)
                     aff_group.progress_bar.setValue(aff_time)
-                    # 强制刷新进度条
-                    aff_group.progress_bar.update()
-                    aff_group.progress_bar.repaint()
+                    self.frame_scheduler.mark_dirty(aff_group.progress_bar)
                 
                 if hasattr(aff_group, 'countdown_label'):
                     minutes = aff_time // 60
                     seconds = aff_time % 60
                     aff_group.countdown_label.setText(f"{minutes:02d}:{seconds:02d}")
                     
+                    # 默认颜色 - 根据时间变化，闪烁时在此颜色和提醒色之间变化
+                    self.flash_engine.set_base_color(aff_group.countdown_label,
+                                                     COUNTDOWN_COLORS[countdown_state(aff_time, 'affirmative')])
+                    
                     # 检查是否需要闪烁（仅当正方计时器活动时）
                     if timer_state['affirmative_timer_active'] and hasattr(self.parent.timer_manager, 'flash_target') and self.parent.timer_manager.flash_target > 0:
                         # 启动闪烁效果
-                        self._start_flashing(
+                        self.flash_engine.flash(
                             aff_group.countdown_label, 
                             self.parent.timer_manager.flash_target,
-                            "#0078D4",  # 正方蓝色
-                            "color: #323130; font-weight: bold; background: transparent;"
+                            AFFIRMATIVE_COLOR
                         )
                         # 重置计时器管理器中的闪烁目标
                         self.parent.timer_manager.flash_target = 0
-                    
-                    # 默认样式 - 根据时间变化颜色
-                    elif not self.flash_timer.isActive() or self.flash_widget != aff_group.countdown_label:
-                        if aff_time <= 10:
-                            style = "color: #0078D4; font-weight: bold; background: transparent;"
-                        elif aff_time <= 30:
-                            style = "color: #D13438; font-weight: bold; background: transparent;"
-                        else:
-                            style = "color: #323130; font-weight: bold; background: transparent;"
-                        aff_group.countdown_label.setStyleSheet(style)
             
             # 更新反方计时器
             if hasattr(container, 'neg_group'):
@@ -330,112 +304,42 @@ class ContentUpdater:
                     # 设置进度条最大值和当前值
                     neg_group.progress_bar.setMaximum(total_time)
                     neg_group.progress_bar.setValue(neg_time)
-                    # 新增：强制刷新进度条
-                    neg_group.progress_bar.update()
-                    neg_group.progress_bar.repaint()
-                    # 新增：强制刷新容器
-                    neg_group.update()
-                    neg_group.repaint()
+                    self.frame_scheduler.mark_dirty(neg_group.progress_bar)
                     
                 if hasattr(neg_group, 'countdown_label'):
                     minutes = neg_time // 60
                     seconds = neg_time % 60
                     neg_group.countdown_label.setText(f"{minutes:02d}:{seconds:02d}")
                     
+                    # 默认颜色 - 根据时间变化，闪烁时在此颜色和提醒色之间变化
+                    self.flash_engine.set_base_color(neg_group.countdown_label,
+                                                     COUNTDOWN_COLORS[countdown_state(neg_time, 'negative')])
+                    
                     # 检查是否需要闪烁（仅当反方计时器活动时）
                     if timer_state['negative_timer_active'] and hasattr(self.parent.timer_manager, 'flash_target') and self.parent.timer_manager.flash_target > 0:
                         # 启动闪烁效果
-                        self._start_flashing(
+                        self.flash_engine.flash(
                             neg_group.countdown_label, 
                             self.parent.timer_manager.flash_target,
-                            "#D13438",  # 反方红色
-                            "color: #323130; font-weight: bold; background: transparent;"
+                            NEGATIVE_COLOR
                         )
                         # 重置计时器管理器中的闪烁目标
                         self.parent.timer_manager.flash_target = 0
-                    
-                    # 默认样式 - 根据时间变化颜色
-                    elif not self.flash_timer.isActive() or self.flash_widget != neg_group.countdown_label:
-                        if neg_time <= 10:
-                            style = "color: #D13438; font-weight: bold; background: transparent;"
-                        elif neg_time <= 30:
-                            style = "color: #D13438; font-weight: bold; background: transparent;"
-                        else:
-                            style = "color: #323130; font-weight: bold; background: transparent;"
-                        neg_group.countdown_label.setStyleSheet(style)
-                    
-            # 最后强制更新整个容器及其所有子控件
-            for child in container.findChildren(QWidget):  # 现在正确引用了QWidget
-                child.update()
-                child.repaint()
-            
-            container.update()
-            container.repaint()
-            
-            # 确保内容已渲染到屏幕
-            QApplication.processEvents()
                 
         except Exception as e:
             logger.error(f"更新自由辩论计时器时出错: {e}", exc_info=True)
     
-    def _start_flashing(self, widget, count, color, original_style):
-        """开始闪烁效果"""
-        try:
-            # 保存闪烁相关信息
-            self.flash_widget = widget
-            self.flash_max = count * 2  # 每次闪烁包括开和关两个状态
-            self.flash_count = 0
-            self.flash_color = color
-            self.flash_original_style = original_style
-            self.flash_state = True  # 从高亮状态开始
-            
-            # 应用第一个闪烁状态
-            widget.setStyleSheet(f"color: {color}; font-weight: bold; background: transparent;")
-            
-            # 启动闪烁计时器
-            self.flash_timer.start()
-            
-        except Exception as e:
-            logger.error(f"启动闪烁效果时出错: {e}", exc_info=True)
-    
-    def _on_flash_timer(self):
-        """闪烁计时器触发事件"""
+    def _reset_all_debater_styles(self, side_widgets, keep=(None, None)):
+        """重置所有辩手样式，keep 为 (辩方, 标签键) 时跳过该标签"""
         try:
-            if not self.flash_widget or self.flash_count >= self.flash_max:
-                # 闪烁结束，恢复原样式
-                if self.flash_widget:
-                    self.flash_widget.setStyleSheet(self.flash_original_style)
-                # 停止计时器
-                self.flash_timer.stop()
-                return
-            
-            # 切换闪烁状态
-            self.flash_state = not self.flash_state
-            
-            if self.flash_state:
-                # 高亮状态
-                self.flash_widget.setStyleSheet(f"color: {self.flash_color}; font-weight: bold; background: transparent;")
-            else:
-                # 正常状态
-                self.flash_widget.setStyleSheet(self.flash_original_style)
-            
-            # 增加计数
-            self.flash_count += 1
-            
-        except Exception as e:
-            logger.error(f"闪烁计时器事件处理时出错: {e}", exc_info=True)
-            self.flash_timer.stop()
-    
-    def _reset_all_debater_styles(self, side_widgets):
-        """重置所有辩手样式"""
-        try:
-            default_style = "letter-spacing: 1px;"
-            
-            for side_widget in side_widgets.values():
+            keep_side, keep_key = keep
+            for side, side_widget in side_widgets.items():
                 if hasattr(side_widget.debaters_frame, 'debater_labels'):
                     labels = side_widget.debaters_frame.debater_labels
-                    for label in labels.values():
-                        label.setStyleSheet(default_style)
+                    for key, label in labels.items():
+                        if side == keep_side and key == keep_key:
+                            continue
+                        self.debater_styles.set_state(label, 'normal')
                         
         except Exception as e:
             logger.error(f"重置辩手样式时出错: {e}", exc_info=True)
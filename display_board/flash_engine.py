@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import weakref
+
+from PyQt5 import sip
+from PyQt5.QtCore import QObject, QPropertyAnimation, QTimer, pyqtProperty
+from PyQt5.QtGui import QColor, QPalette
+from utils import logger
+
+from .style_states import set_text_color
+
+# 一次闪烁（亮、灭各一半）的时长
+FLASH_PERIOD_MS = 600
+
+
+class _TextColor(QObject):
+    """把标签的文字颜色包装为 pyqtProperty，供 QPropertyAnimation 驱动"""
+
+    def __init__(self, label):
+        super().__init__(label)
+        self.label = label
+
+    def _get_color(self):
+        return self.label.palette().color(QPalette.WindowText)
+
+    def _set_color(self, color):
+        set_text_color(self.label, color)
+
+    color = pyqtProperty(QColor, _get_color, _set_color)
+
+
+class _FlashTarget:
+    """一个正在闪烁的标签"""
+
+    def __init__(self, text_color, color):
+        self.text_color = text_color
+        self.color = color
+        self.animation = None  # 平滑模式
+        self.steps_left = 0  # 低性能模式：剩余的亮灭切换次数
+        self.lit = False
+
+
+class FlashEngine(QObject):
+    """时间提醒的闪烁效果
+
+    直接改变标签的文字颜色（调色板），在基础颜色和提醒色之间来回变化，
+    不使用图形效果，控件仍然直接绘制，不需要每帧离屏渲染。基础颜色由
+    set_base_color 设置（倒计时的颜色阶段），闪烁结束后恢复。
+
+    平滑模式下每个标签一个 QPropertyAnimation 渐变颜色，多个动画由 Qt
+    共用的动画定时器驱动；低性能模式下共用一个半周期的定时器，只在亮灭
+    切换时修改颜色，与原来的 300 毫秒开关效果相同。
+    """
+
+    def __init__(self, parent=None, smooth=True):
+        super().__init__(parent)
+        self.smooth = smooth
+        self._targets = {}  # 标签 -> _FlashTarget
+        self._base_colors = weakref.WeakKeyDictionary()  # 标签 -> 基础颜色
+        self._step_timer = QTimer(self)
+        self._step_timer.setInterval(FLASH_PERIOD_MS // 2)
+        self._step_timer.timeout.connect(self._on_step)
+
+    def set_base_color(self, widget, color):
+        """设置标签不闪烁时的文字颜色，闪烁中调用时从下一次变化起生效"""
+        color = QColor(color)
+        self._base_colors[widget] = color
+        target = self._targets.get(widget)
+        if target is None:
+            set_text_color(widget, color)
+        elif target.animation is not None:
+            target.animation.setKeyValueAt(0.5, color)
+
+    def flash(self, widget, count, color):
+        """让标签闪烁 count 次，同一标签再次调用时重新开始"""
+        try:
+            if widget is None or sip.isdeleted(widget):
+                logger.warning("闪烁目标控件不存在，跳过闪烁")
+                return False
+            self.stop(widget)
+            color = QColor(color)
+            base = self._base_color(widget)
+            target = self._targets[widget] = _FlashTarget(_TextColor(widget), color)
+
+            if self.smooth:
+                animation = QPropertyAnimation(target.text_color, b'color', self)
+                animation.setDuration(FLASH_PERIOD_MS)
+                animation.setStartValue(color)
+                animation.setKeyValueAt(0.5, base)
+                animation.setEndValue(color)
+                animation.setLoopCount(max(1, count))
+                animation.finished.connect(lambda: self.stop(widget))
+                target.animation = animation
+                animation.start()
+            else:
+                target.steps_left = max(1, count) * 2 - 1
+                target.lit = True
+                set_text_color(widget, color)
+                if not self._step_timer.isActive():
+                    self._step_timer.start()
+            return True
+        except Exception as e:
+            logger.error(f"启动闪烁效果时出错: {e}", exc_info=True)
+            return False
+
+    def is_flashing(self, widget):
+        return widget in self._targets
+
+    def stop(self, widget):
+        """停止标签的闪烁并恢复基础颜色"""
+        target = self._targets.pop(widget, None)
+        if target is not None:
+            if target.animation is not None:
+                target.animation.stop()
+                target.animation.deleteLater()
+            if not sip.isdeleted(widget):
+                target.text_color.deleteLater()
+                set_text_color(widget, self._base_color(widget))
+        if not any(t.animation is None for t in self._targets.values()):
+            self._step_timer.stop()
+
+    def stop_all(self):
+        """停止全部闪烁，切换环节时调用"""
+        for widget in list(self._targets):
+            self.stop(widget)
+        self._step_timer.stop()
+
+    def _base_color(self, widget):
+        color = self._base_colors.get(widget)
+        if color is None:
+            color = self._base_colors[widget] = widget.palette().color(QPalette.WindowText)
+        return color
+
+    def _on_step(self):
+        """低性能模式：所有闪烁的标签在同一时刻切换亮灭"""
+        try:
+            for widget, target in list(self._targets.items()):
+                if target.animation is not None:
+                    continue
+                if sip.isdeleted(widget) or target.steps_left <= 0:
+                    self.stop(widget)
+                    continue
+                target.lit = not target.lit
+                target.steps_left -= 1
+                set_text_color(widget, target.color if target.lit else self._base_color(widget))
+        except Exception as e:
+            logger.error(f"更新闪烁效果时出错: {e}", exc_info=True)
+            self.stop_all()
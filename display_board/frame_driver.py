@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+
+from PyQt5.QtCore import Qt, QObject, QTimer
+from PyQt5.QtGui import QGuiApplication
+from utils import logger
+
+# 可选帧率档位，从高到低
+FRAME_RATES = (60, 10, 1)
+# 低性能模式下的最高帧率
+LOW_PERFORMANCE_MAX_FPS = 10
+# 实际帧间隔超过预算的比例，超过即视为掉帧
+OVER_BUDGET_RATIO = 1.5
+# 连续稳定多少秒后尝试升档
+STABLE_SECONDS_BEFORE_UPGRADE = 10
+
+
+class AdaptiveFrameDriver(QObject):
+    """平滑进度模式的帧驱动器
+
+    按当前帧率档位周期性地把登记的控件交给帧调度器刷新。Qt5 控件没有垂直同步
+    回调，这里用与屏幕刷新率对齐的精确计时器代替。每秒统计一次实际帧间隔，
+    超出预算就降一档，连续稳定一段时间后再升回去。
+    """
+
+    def __init__(self, frame_scheduler, parent=None, low_performance_mode=False, is_active=None):
+        """
+        Args:
+            frame_scheduler: FrameScheduler，实际的重绘由它合并
+            low_performance_mode: 低性能模式下帧率上限为 LOW_PERFORMANCE_MAX_FPS
+            is_active: 返回是否还需要继续驱动的回调，返回 False 时自动停止
+        """
+        super().__init__(parent)
+        self.frame_scheduler = frame_scheduler
+        self.is_active = is_active
+        self.max_fps = LOW_PERFORMANCE_MAX_FPS if low_performance_mode else self._screen_refresh_rate()
+        # 最高档即为屏幕刷新率（或低性能上限），50Hz、59Hz 的屏幕不会被降到 10 fps
+        self.levels = [self.max_fps] + [fps for fps in FRAME_RATES[1:] if fps < self.max_fps]
+        self.level = 0
+        self.targets = []
+
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._on_frame)
+
+        # 帧间隔统计
+        self._last_frame_ns = None
+        self._window_start_ns = None
+        self._window_frames = 0
+        self._window_over_budget = 0
+        self._stable_since_ns = None
+
+    def _screen_refresh_rate(self):
+        """屏幕刷新率，取不到时按 60Hz 处理"""
+        try:
+            screen = QGuiApplication.primaryScreen()
+            if screen is not None and screen.refreshRate() > 0:
+                return min(FRAME_RATES[0], int(round(screen.refreshRate())))
+        except Exception as e:
+            logger.error(f"获取屏幕刷新率失败: {e}")
+        return FRAME_RATES[0]
+
+    @property
+    def fps(self):
+        return self.levels[self.level]
+
+    def add_target(self, widget):
+        """登记每帧需要刷新的控件"""
+        if widget not in self.targets:
+            self.targets.append(widget)
+
+    def is_running(self):
+        return self._timer.isActive()
+
+    def start(self):
+        """开始驱动，已在运行时不做处理"""
+        if self._timer.isActive() or not self.targets:
+            return
+        self._reset_stats()
+        self._timer.start(self._interval_ms())
+        logger.debug(f"平滑进度帧驱动启动: {self.fps} fps")
+
+    def stop(self):
+        """停止驱动，并刷新一次使进度停在准确位置"""
+        if not self._timer.isActive():
+            return
+        self._timer.stop()
+        self.frame_scheduler.mark_dirty(*self.targets)
+        logger.debug("平滑进度帧驱动停止")
+
+    def _interval_ms(self):
+        return max(1, round(1000 / self.fps))
+
+    def _reset_stats(self):
+        now = time.monotonic_ns()
+        self._last_frame_ns = None
+        self._window_start_ns = now
+        self._window_frames = 0
+        self._window_over_budget = 0
+        self._stable_since_ns = now
+
+    def _on_frame(self):
+        """每帧回调"""
+        if self.is_active is not None and not self.is_active():
+            self.stop()
+            return
+
+        self.frame_scheduler.mark_dirty(*self.targets)
+        self._measure(time.monotonic_ns())
+
+    def _measure(self, now):
+        """统计帧间隔，每秒评估一次是否需要调整档位"""
+        if self._last_frame_ns is not None:
+            budget_ns = self._interval_ms() * 1_000_000
+            if now - self._last_frame_ns > budget_ns * OVER_BUDGET_RATIO:
+                self._window_over_budget += 1
+            self._window_frames += 1
+        self._last_frame_ns = now
+
+        if now - self._window_start_ns < 1_000_000_000 or not self._window_frames:
+            return
+
+        over_budget = self._window_over_budget * 4 > self._window_frames
+        self._window_start_ns = now
+        self._window_frames = 0
+        self._window_over_budget = 0
+
+        if over_budget:
+            self._stable_since_ns = now
+            if self.level < len(self.levels) - 1:
+                self._set_level(self.level + 1, "帧时间超出预算")
+        elif self.level > 0 and now - self._stable_since_ns >= STABLE_SECONDS_BEFORE_UPGRADE * 1_000_000_000:
+            self._stable_since_ns = now
+            self._set_level(self.level - 1, "帧时间稳定")
+
+    def _set_level(self, level, reason):
+        self.level = level
+        self._last_frame_ns = None
+        self._timer.setInterval(self._interval_ms())
+        logger.info(f"平滑进度帧率调整为 {self.fps} fps（{reason}）")
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from PyQt5.QtCore import QObject, QTimer
+from utils import logger
+from perf_metrics import metrics
+
+
+class FrameScheduler(QObject):
+    """帧调度器，合并同一帧内的重绘请求
+
+    计时器每次触发时各处只登记需要刷新的控件，事件循环空闲时统一调用一次
+    update()，由 Qt 的后备存储合并成一次绘制。全程不调用 repaint() 或
+    processEvents()，避免同步重绘和事件重入。
+    """
+
+    def __init__(self, parent=None, frame_interval_ms=0):
+        super().__init__(parent)
+        self._dirty = {}
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(frame_interval_ms)
+        self._flush_timer.timeout.connect(self.flush)
+
+    def mark_dirty(self, *widgets):
+        """登记需要在下一帧刷新的控件"""
+        for widget in widgets:
+            if widget is not None:
+                self._dirty[widget] = None
+        if self._dirty and not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush(self):
+        """对本帧登记的控件统一调用一次 update()"""
+        dirty, self._dirty = self._dirty, {}
+        if metrics.enabled:
+            metrics.count('frame.flush')
+            metrics.count('frame.widgets', len(dirty))
+        try:
+            for widget in dirty:
+                # 祖先控件已登记时，其区域重绘会包含子控件
+                if not self._has_dirty_ancestor(widget, dirty):
+                    widget.update()
+        except Exception as e:
+            logger.error(f"刷新帧时出错: {e}", exc_info=True)
+
+    def _has_dirty_ancestor(self, widget, dirty):
+        parent = widget.parentWidget()
+        while parent is not None:
+            if parent in dirty:
+                return True
+            parent = parent.parentWidget()
+        return False
@@ -8,18 +8,22 @@ from PyQt5.QtCore import Qt, QTimer, QTime, pyqtSignal
 from PyQt5.QtGui import QFont
 
 from utils import enable_dwm_composition, logger
+from startup_profiler import profiler
 from .timer_manager import TimerManager
 from .ui_components import UIComponents
-from .content_updater import ContentUpdater
+from .content_updater import ContentUpdater, DEBATER_POSITIONS
 from .animation_manager import AnimationManager
+from .frame_driver import AdaptiveFrameDriver
 
 class DisplayBoard(QMainWindow):
     """前台展示窗口，用于显示给观众"""
     
     # 自定义信号
     roundChanged = pyqtSignal(int)
+    # 配置应用到界面之后发出，参数为配置字典
+    configApplied = pyqtSignal(object)
     
-    def __init__(self, low_performance_mode=False):
+    def __init__(self, low_performance_mode=False, smooth_progress=False, timer_manager=None):
         super().__init__()
         logger.info("DisplayBoard 初始化")
         
@@ -32,15 +36,18 @@ class DisplayBoard(QMainWindow):
         self.negative_viewpoint = ""
         self.debater_roles = {}
         self.low_performance_mode = low_performance_mode
+        self.smooth_progress = smooth_progress
         
         # 环节管理
         self.current_round = None
         self.rounds = []
         self.current_round_index = -1
         self.control_panel = None
+        self.metrics_hud = None  # 按 F12 时创建
         
         # 初始化管理器
-        self.timer_manager = TimerManager(self)
+        # 多赛场模式下由外部传入共用调度器的计时器
+        self.timer_manager = timer_manager or TimerManager(self)
         self.ui_components = UIComponents(self)
         self.content_updater = ContentUpdater(self)
         self.animation_manager = AnimationManager(self)
@@ -54,8 +61,14 @@ class DisplayBoard(QMainWindow):
         self.setAutoFillBackground(True)
         
         # 初始化UI
-        self.initUI()
+        with profiler.phase('DisplayBoard.initUI'):
+            self.initUI()
         logger.info("DisplayBoard UI 初始化完成")
+
+        # 平滑进度模式
+        self.frame_driver = None
+        if self.smooth_progress:
+            self._setup_smooth_progress()
         
         # 启用硬件加速
         if sys.platform == 'win32':
@@ -74,6 +87,24 @@ class DisplayBoard(QMainWindow):
         self.timer_manager.affirmativeTimerFinished.connect(self._on_affirmative_timer_finished)
         self.timer_manager.negativeTimerFinished.connect(self._on_negative_timer_finished)
 
+    def _setup_smooth_progress(self):
+        """让进度环按精确剩余时间绘制，并由自适应帧驱动器刷新"""
+        self.frame_driver = AdaptiveFrameDriver(self.content_updater.frame_scheduler, self,
+                                                low_performance_mode=self.low_performance_mode,
+                                                is_active=self.timer_manager.is_running)
+        containers = self.active_round_widget_top.timer_containers
+        free_debate = containers['free_debate']
+        bars = [
+            (containers['standard'].progress_bar, None),
+            (free_debate.aff_group.progress_bar, 'affirmative'),
+            (free_debate.neg_group.progress_bar, 'negative'),
+        ]
+        for bar, side in bars:
+            bar.setValueSource(lambda side=side: self.timer_manager.precise_time(side))
+            self.frame_driver.add_target(bar)
+        self.timer_manager.runningChanged.connect(self._on_timer_running_changed)
+        logger.info(f"平滑进度模式已启用，最高 {self.frame_driver.fps} fps")
+
     def initUI(self):
         """初始化用户界面"""
         logger.debug("DisplayBoard.initUI 开始")
@@ -168,19 +199,9 @@ class DisplayBoard(QMainWindow):
         """计时器更新事件"""
         try:
             timer_state = self.timer_manager.get_timer_state()
+            # 重绘由 content_updater 的帧调度器统一合并
             self.content_updater.update_timer_display(self.active_round_widget_top, timer_state)
             
-            # 新增：强制更新进度条所在的父容器
-            if hasattr(self.active_round_widget_top, 'timer_containers'):
-                if timer_state['is_free_debate']:
-                    container = self.active_round_widget_top.timer_containers['free_debate']
-                    container.update()
-                    container.repaint()
-                else:
-                    container = self.active_round_widget_top.timer_containers['standard']
-                    container.update()
-                    container.repaint()
-            
             # 更新控制面板显示
             if self.control_panel and hasattr(self.control_panel, 'update_lcd_display'):
                 if timer_state['is_free_debate']:
@@ -193,6 +214,13 @@ class DisplayBoard(QMainWindow):
         except Exception as e:
             logger.error(f"计时器更新事件处理时出错: {e}", exc_info=True)
 
+    def _on_timer_running_changed(self, running):
+        """计时器开始或停止时启停平滑进度帧驱动"""
+        if running:
+            self.frame_driver.start()
+        else:
+            self.frame_driver.stop()
+
     def _on_timer_finished(self):
         """计时器结束事件"""
         try:
@@ -255,8 +283,8 @@ class DisplayBoard(QMainWindow):
             self._apply_config_data(config)
             
             # 更新显示
-            self.update()
-            self.repaint()
+            self.content_updater.frame_scheduler.mark_dirty(self)
+            self.configApplied.emit(config)
             
             logger.info("辩论配置已成功应用")
             return True
@@ -305,8 +333,7 @@ class DisplayBoard(QMainWindow):
             if 'school' in data and data['school']:
                 setattr(self, f"{side}_school", str(data['school']))
                 widget.school_label.setText(str(data['school']))
-                widget.school_label.update()
-                widget.school_label.repaint()
+                self.content_updater.frame_scheduler.mark_dirty(widget.school_label)
             
             if 'viewpoint' in data and data['viewpoint']:
                 viewpoint_text = str(data['viewpoint'])
@@ -318,8 +345,7 @@ class DisplayBoard(QMainWindow):
                 # 设置富文本格式
                 widget.viewpoint_label.setTextFormat(Qt.RichText)
                 widget.viewpoint_label.setText(rich_text)
-                widget.viewpoint_label.update()
-                widget.viewpoint_label.repaint()
+                self.content_updater.frame_scheduler.mark_dirty(widget.viewpoint_label)
                 
         except Exception as e:
             logger.error(f"设置{side}信息时出错: {e}", exc_info=True)
@@ -385,15 +411,7 @@ class DisplayBoard(QMainWindow):
             self.active_round_widget_top.current_round = self.current_round
             
             # 检查是否为最后一个环节，如果是则隐藏下一环节信息
-            if hasattr(self.active_round_widget_top, 'next_round_frame'):
-                if index >= len(self.rounds) - 1:
-                    self.active_round_widget_top.next_round_frame.setVisible(False)
-                else:
-                    next_round = self.rounds[index + 1]
-                    next_round_info = next_round.get('description', "下一环节")
-                    if hasattr(self.active_round_widget_top.next_round_frame, 'next_round_info'):
-                        self.active_round_widget_top.next_round_frame.next_round_info.setText(next_round_info)
-                    self.active_round_widget_top.next_round_frame.setVisible(True)
+            self._update_next_round_info(index)
             
             # 高亮当前环节的活跃辩手
             side_widgets = {
@@ -407,6 +425,81 @@ class DisplayBoard(QMainWindow):
             return True
         return False
 
+    def _update_next_round_info(self, index):
+        """更新下一环节提示，最后一个环节时隐藏"""
+        if hasattr(self.active_round_widget_top, 'next_round_frame'):
+            if index >= len(self.rounds) - 1:
+                self.active_round_widget_top.next_round_frame.setVisible(False)
+            else:
+                next_round = self.rounds[index + 1]
+                next_round_info = next_round.get('description', "下一环节")
+                if hasattr(self.active_round_widget_top.next_round_frame, 'next_round_info'):
+                    self.active_round_widget_top.next_round_frame.next_round_info.setText(next_round_info)
+                self.active_round_widget_top.next_round_frame.setVisible(True)
+
+    def apply_config_diff(self, config, diff):
+        """热重载：只把变化的部分应用到界面，不重置计时器
+        
+        Args:
+            config: 新的配置字典
+            diff: config_diff.ConfigDiff
+        """
+        logger.info(f"应用配置变化: {diff}")
+        try:
+            if diff.topic and config.get('topic'):
+                self.topic = str(config['topic'])
+                self.setWindowTitle(f"辩论背景看板 - {self.topic}")
+            
+            for side in diff.sides:
+                if side in config:
+                    self._set_side_info(side, config[side])
+            
+            if diff.debater_roles:
+                self.debater_roles = config.get('debater_roles', {})
+                side_widgets = {
+                    'affirmative': self.affirmative_widget,
+                    'negative': self.negative_widget
+                }
+                for key in diff.debater_roles:
+                    side, _, position = key.partition('_')
+                    if side in side_widgets and position in DEBATER_POSITIONS:
+                        self.content_updater.update_debater(
+                            side_widgets[side], self.debater_roles, side,
+                            DEBATER_POSITIONS.index(position) + 1)
+            
+            if diff.rounds or diff.round_count_changed:
+                self._apply_rounds_diff(config.get('rounds', []), diff)
+            
+            self.configApplied.emit(config)
+                
+        except Exception as e:
+            logger.error(f"应用配置变化时出错: {e}", exc_info=True)
+
+    def _apply_rounds_diff(self, rounds, diff):
+        """更新变化的回合，正在进行的环节保留剩余时间"""
+        self.rounds = rounds
+        index = self.current_round_index
+        
+        if index < 0:
+            # 还没有开始任何环节，预览的是第一个环节
+            if diff.round_changed(0):
+                self.content_updater.update_active_content(
+                    self.active_round_widget_top, self.rounds[0] if self.rounds else None)
+            return
+        
+        if index >= len(self.rounds):
+            logger.warning("当前环节已从配置中删除，将在切换环节时生效")
+            return
+        
+        if diff.round_changed(index):
+            self.current_round = self.rounds[index]
+            self.active_round_widget_top.current_round = self.current_round
+            self.timer_manager.update_round_info(self.current_round)
+            self.content_updater.update_active_content(
+                self.active_round_widget_top, self.current_round)
+        if diff.round_changed(index + 1):
+            self._update_next_round_info(index)
+
     def update_debaters_info(self):
         """更新辩手信息显示"""
         logger.debug("更新辩手信息显示")
@@ -485,12 +578,27 @@ class DisplayBoard(QMainWindow):
             elif event.key() == Qt.Key_Escape and self.is_fullscreen:
                 self.exit_fullscreen()
             
+            # 处理F12键 - 切换性能叠加层
+            elif event.key() == Qt.Key_F12:
+                self.toggle_metrics_hud()
+            
             # 将未处理的事件传递给父类
             super().keyPressEvent(event)
             
         except Exception as e:
             logger.error(f"处理键盘事件时出错: {e}", exc_info=True)
 
+    def toggle_metrics_hud(self):
+        """显示或隐藏性能叠加层，第一次使用时才创建"""
+        try:
+            if self.metrics_hud is None:
+                from .metrics_hud import MetricsHud
+                self.metrics_hud = MetricsHud(self)
+                self.metrics_hud.move(10, 10)
+            self.metrics_hud.toggle()
+        except Exception as e:
+            logger.error(f"切换性能叠加层时出错: {e}", exc_info=True)
+
     def toggle_fullscreen(self):
         """切换全屏状态"""
         try:
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import QLabel
+from utils import logger
+
+from perf_metrics import metrics, current_rss_bytes
+
+# 叠加层刷新间隔
+REFRESH_INTERVAL_MS = 500
+# 事件循环延迟探测间隔
+PROBE_INTERVAL_MS = 50
+
+
+class MetricsHud(QLabel):
+    """显示板左上角的性能调试叠加层
+
+    显示时开启 perf_metrics 记录，隐藏时关闭，平时没有任何开销。内容包括
+    计时触发抖动、update_timer_display 耗时、各进度环的绘制耗时与每秒次数、
+    每秒刷新帧数、事件循环延迟和进程常驻内存。
+    """
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setTextFormat(Qt.PlainText)
+        self.setAlignment(Qt.AlignLeft | Qt.AlignTop)
+        font = QFont("Consolas", 10)
+        font.setStyleHint(QFont.Monospace)
+        self.setFont(font)
+        self.setStyleSheet("color: #E0F0E0; background-color: rgba(0, 0, 0, 170); padding: 6px;")
+        self.hide()
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(REFRESH_INTERVAL_MS)
+        self._refresh_timer.timeout.connect(self.refresh)
+
+        # 事件循环延迟：定时器实际触发时刻比预期晚了多少
+        self._probe_timer = QTimer(self)
+        self._probe_timer.setTimerType(Qt.PreciseTimer)
+        self._probe_timer.setInterval(PROBE_INTERVAL_MS)
+        self._probe_timer.timeout.connect(self._probe)
+        self._probe_due_ns = None
+
+    def toggle(self):
+        self.set_active(not self.isVisible())
+
+    def set_active(self, active):
+        metrics.enable(active)
+        if active:
+            self._probe_due_ns = time.monotonic_ns() + PROBE_INTERVAL_MS * 1_000_000
+            self._probe_timer.start()
+            self._refresh_timer.start()
+            self.refresh()
+            self.show()
+            self.raise_()
+            logger.info("性能叠加层已打开")
+        else:
+            self._probe_timer.stop()
+            self._refresh_timer.stop()
+            self.hide()
+            logger.info("性能叠加层已关闭")
+
+    def _probe(self):
+        now = time.monotonic_ns()
+        if self._probe_due_ns is not None:
+            metrics.sample('event_loop.latency', max(0, now - self._probe_due_ns))
+        self._probe_due_ns = now + PROBE_INTERVAL_MS * 1_000_000
+
+    def refresh(self):
+        try:
+            metrics.gauge('rss', current_rss_bytes())
+            metrics.roll_rates()
+            self.setText(self.format_snapshot(metrics.snapshot()))
+            self.adjustSize()
+        except Exception as e:
+            logger.error(f"刷新性能叠加层时出错: {e}", exc_info=True)
+
+    @staticmethod
+    def format_snapshot(snapshot):
+        samples = snapshot['samples']
+        rates = snapshot['rates']
+        lines = ["性能指标 (F12 关闭)        均值     P95     最大   次/秒"]
+
+        def sample_line(label, name, rate_name=None):
+            summary = samples.get(name)
+            rate = rates.get(rate_name or name)
+            rate_text = f"{rate:7.1f}" if rate is not None else "      -"
+            if not summary or summary['mean'] is None:
+                return f"{label:<20} {'-':>8} {'-':>7} {'-':>8} {rate_text}"
+            return (f"{label:<20} {summary['mean'] / 1e6:6.2f}ms {summary['p95'] / 1e6:5.2f}ms "
+                    f"{summary['max'] / 1e6:6.2f}ms {rate_text}")
+
+        lines.append(sample_line("计时触发抖动", 'tick.jitter'))
+        lines.append(sample_line("事件循环延迟", 'event_loop.latency'))
+        lines.append(sample_line("更新计时显示", 'update_timer_display'))
+        for name in sorted(n for n in samples if n.startswith('paint.')):
+            lines.append(sample_line(f"绘制 {name[len('paint.'):]}", name))
+
+        flushes = rates.get('frame.flush', 0.0)
+        widgets = rates.get('frame.widgets', 0.0)
+        lines.append(f"刷新帧 {flushes:.1f}/秒，刷新控件 {widgets:.1f}/秒")
+        rss = snapshot['gauges'].get('rss')
+        lines.append(f"常驻内存 {rss / (1024 * 1024):.1f} MB" if rss else "常驻内存 -")
+        return "\n".join(lines)
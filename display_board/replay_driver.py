@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+
+from PyQt5.QtCore import Qt, QObject, QTimer, pyqtSignal
+from utils import logger
+
+from match_recorder import MatchReplayer
+from timer_core import NS_PER_SECOND
+from .timer_manager import TimerManager
+
+# 重放时每帧推进一次
+FRAME_INTERVAL_MS = 16
+MAX_SPEED = 1000
+
+
+class ReplayDriver(QObject):
+    """在显示板上按倍速重放比赛录像
+
+    显示板使用重放引擎的 TimerManager，每帧按经过的真实时间乘以倍速推进
+    录像；切换环节通过 DisplayBoard.start_round 完成，其余控制操作直接
+    作用在引擎上，计时事件交给 TimerManager 转换为信号。
+    """
+
+    finished = pyqtSignal()
+
+    def __init__(self, recording, speed=1.0, parent=None):
+        super().__init__(parent)
+        self.speed = max(0.1, min(float(speed), MAX_SPEED))
+        self.display_board = None
+        # 倍速播放时不播放提示音
+        self.replayer = MatchReplayer(recording, apply_control=self._apply_control)
+        self.timer_manager = TimerManager(self, engine=self.replayer.engine, sound=self.speed == 1)
+        self.replayer.on_events = self.timer_manager._dispatch_events
+
+        self._last_frame = None
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.setInterval(FRAME_INTERVAL_MS)
+        self._timer.timeout.connect(self._on_frame)
+
+    def attach_board(self, display_board):
+        """显示板须使用 self.timer_manager 创建"""
+        self.display_board = display_board
+        display_board.set_debate_config(self.replayer.config)
+
+    def start(self, from_ns=0):
+        if from_ns:
+            self.seek(from_ns)
+        logger.info(f"开始重放录像，{self.speed:g} 倍速，时长 {self.replayer.duration_ns / NS_PER_SECOND:.0f} 秒")
+        self._last_frame = time.monotonic_ns()
+        self._timer.start()
+
+    def pause(self):
+        self._timer.stop()
+
+    def seek(self, time_ns):
+        """跳转到录像中的指定时刻"""
+        self.replayer.seek(time_ns)
+        self.timer_manager.refresh()
+
+    def _on_frame(self):
+        try:
+            now = time.monotonic_ns()
+            elapsed, self._last_frame = now - self._last_frame, now
+            self.replayer.advance_to(self.replayer.position_ns + int(elapsed * self.speed))
+            if self.replayer.finished():
+                self._timer.stop()
+                logger.info("录像重放结束")
+                self.finished.emit()
+        except Exception as e:
+            logger.error(f"重放录像时出错: {e}", exc_info=True)
+            self._timer.stop()
+
+    def _apply_control(self, action, args):
+        board = self.display_board
+        if action == 'config':
+            if board is not None:
+                board.set_debate_config(args[0])
+            return
+        if action == 'set_current_round' and board is not None:
+            round_data = args[0]
+            if round_data in board.rounds:
+                board.start_round(board.rounds.index(round_data))
+                return
+        getattr(self.replayer.engine, action)(*args)
+        self.timer_manager.refresh()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from PyQt5.QtCore import Qt, QObject, QTimer
+from utils import logger
+
+from timer_core import NS_PER_MS
+from .timer_manager import TICK_SLACK_MS
+
+
+class SharedTickScheduler(QObject):
+    """多个 TimerManager 共用的单个精确计时器
+
+    每次只安排最早到期的那个整秒边界，到期时驱动所有正在运行的计时器
+    （显示秒数没有变化的引擎 poll() 不产生事件，开销可以忽略），然后
+    重新安排。16 个赛场也只占用一个 QTimer。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.managers = []
+        self._dispatching = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._on_timeout)
+
+    def register(self, manager):
+        """登记计时器，由 TimerManager 在构造时调用"""
+        self.managers.append(manager)
+
+    def unregister(self, manager):
+        if manager in self.managers:
+            self.managers.remove(manager)
+        self.reschedule()
+
+    def reschedule(self):
+        """按所有计时器中最早的边界重新安排触发"""
+        if self._dispatching:
+            return
+        waits = [wait for wait in (m.engine.ns_until_next_tick() for m in self.managers)
+                 if wait is not None]
+        if not waits:
+            self._timer.stop()
+            return
+        self._timer.start(-(-min(waits) // NS_PER_MS) + TICK_SLACK_MS)
+
+    def _on_timeout(self):
+        """驱动所有正在运行的计时器"""
+        self._dispatching = True
+        try:
+            for manager in list(self.managers):
+                if manager.engine.is_running():
+                    manager._update_timer()
+        except Exception as e:
+            logger.error(f"共享计时器调度出错: {e}", exc_info=True)
+        finally:
+            self._dispatching = False
+            self.reschedule()
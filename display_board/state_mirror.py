@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from PyQt5.QtNetwork import QTcpServer, QTcpSocket, QHostAddress, QAbstractSocket
+from utils import logger
+
+from state_codec import (FIELDS, FrameError, StateEncoder, StateDecoder, capture_state,
+                         state_to_snapshot, config_version, encode_config)
+
+DEFAULT_PORT = 47800
+# 客户端积压未发送的字节数上限，超过说明客户端已经卡死，直接断开
+MAX_PENDING_BYTES = 256 * 1024
+# 镜像端断线后重连的间隔
+RECONNECT_INTERVAL_MS = 2000
+
+
+class StatePublisher(QObject):
+    """操作端：把显示板的计时状态广播给所有镜像显示板
+
+    每个连接各自维护一个 StateEncoder，连接时先发配置帧和关键帧，之后
+    只在状态变化时发送增量帧。
+    """
+
+    def __init__(self, display_board, port=DEFAULT_PORT, host='0.0.0.0', parent=None):
+        super().__init__(parent or display_board)
+        self.display_board = display_board
+        self.timer_manager = display_board.timer_manager
+        self.host = host
+        self.port = port
+        self.clients = {}  # QTcpSocket -> StateEncoder
+        self.config_version = 0
+        self._config_frame = None
+
+        self.server = QTcpServer(self)
+        self.server.newConnection.connect(self._on_new_connection)
+
+        self.timer_manager.stateChanged.connect(self.publish)
+        display_board.roundChanged.connect(lambda _: self.publish())
+        display_board.configApplied.connect(self.set_config)
+
+    def start(self):
+        """开始监听，失败返回False"""
+        if not self.server.listen(QHostAddress(self.host), self.port):
+            logger.error(f"状态广播无法监听 {self.host}:{self.port}: {self.server.errorString()}")
+            return False
+        logger.info(f"状态广播已启动: {self.host}:{self.port}")
+        return True
+
+    def stop(self):
+        self.server.close()
+        for socket in list(self.clients):
+            socket.abort()
+
+    def set_config(self, config_data):
+        """配置变化时向所有客户端发送配置帧"""
+        try:
+            self.config_version = config_version(config_data)
+            self._config_frame = encode_config(self.config_version, config_data)
+            for socket in list(self.clients):
+                self._send(socket, self._config_frame)
+            self.publish()
+        except Exception as e:
+            logger.error(f"广播配置时出错: {e}", exc_info=True)
+
+    def current_state(self):
+        return capture_state(self.timer_manager.engine, self.display_board.current_round_index,
+                             self.config_version)
+
+    def publish(self):
+        """向所有客户端发送与各自上一帧的差异"""
+        if not self.clients:
+            return
+        state = self.current_state()
+        for socket, encoder in list(self.clients.items()):
+            frame = encoder.encode(state)
+            if frame:
+                self._send(socket, frame)
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            socket.setSocketOption(QAbstractSocket.LowDelayOption, 1)
+            socket.disconnected.connect(lambda socket=socket: self._on_disconnected(socket))
+            encoder = StateEncoder()
+            self.clients[socket] = encoder
+            logger.info(f"镜像显示板已连接: {socket.peerAddress().toString()}，共 {len(self.clients)} 个")
+            if self._config_frame:
+                self._send(socket, self._config_frame)
+            self._send(socket, encoder.keyframe(self.current_state()))
+
+    def _on_disconnected(self, socket):
+        if self.clients.pop(socket, None) is not None:
+            logger.info(f"镜像显示板已断开，剩余 {len(self.clients)} 个")
+        socket.deleteLater()
+
+    def _send(self, socket, data):
+        if socket.bytesToWrite() > MAX_PENDING_BYTES:
+            logger.warning(f"镜像显示板 {socket.peerAddress().toString()} 长时间未接收数据，断开连接")
+            socket.abort()
+            return
+        socket.write(data)
+
+
+class StateMirrorClient(QObject):
+    """镜像端：接收操作端的状态并应用到本地显示板
+
+    本地计时引擎在两帧之间照常运行，收到的每一帧都会校正剩余时间，
+    所以镜像显示板与操作端的误差不超过一帧的网络延迟。
+    """
+
+    connectionChanged = pyqtSignal(bool)
+
+    def __init__(self, display_board, host, port=DEFAULT_PORT, parent=None):
+        super().__init__(parent or display_board)
+        self.display_board = display_board
+        self.host = host
+        self.port = port
+        self.decoder = StateDecoder()
+        self.config_version = None
+
+        self.socket = QTcpSocket(self)
+        self.socket.readyRead.connect(self._on_ready_read)
+        self.socket.connected.connect(self._on_connected)
+        self.socket.stateChanged.connect(self._on_socket_state_changed)
+
+        self._reconnect_timer = QTimer(self)
+        self._reconnect_timer.setSingleShot(True)
+        self._reconnect_timer.setInterval(RECONNECT_INTERVAL_MS)
+        self._reconnect_timer.timeout.connect(self.connect_to_server)
+
+    def start(self):
+        self.connect_to_server()
+
+    def connect_to_server(self):
+        logger.info(f"正在连接操作端 {self.host}:{self.port}")
+        # 每个连接都从关键帧重新开始
+        self.decoder = StateDecoder()
+        self.socket.connectToHost(self.host, self.port)
+
+    def _on_connected(self):
+        self.socket.setSocketOption(QAbstractSocket.LowDelayOption, 1)
+        logger.info("已连接到操作端")
+        self.connectionChanged.emit(True)
+
+    def _on_socket_state_changed(self, state):
+        if state == QAbstractSocket.UnconnectedState and not self._reconnect_timer.isActive():
+            logger.warning(f"与操作端的连接已断开，{RECONNECT_INTERVAL_MS}毫秒后重连")
+            self.connectionChanged.emit(False)
+            self._reconnect_timer.start()
+
+    def _on_ready_read(self):
+        try:
+            messages = self.decoder.feed(bytes(self.socket.readAll()))
+        except FrameError as e:
+            logger.error(f"状态数据流损坏，重新连接: {e}")
+            self.socket.abort()
+            return
+        try:
+            for message in messages:
+                if message[0] == 'config':
+                    self._apply_config(message[1], message[2])
+                else:
+                    self._apply_state(message[1])
+        except Exception as e:
+            logger.error(f"应用操作端状态时出错: {e}", exc_info=True)
+
+    def _apply_config(self, version, config_data):
+        if version == self.config_version:
+            return
+        logger.info("收到操作端配置")
+        self.config_version = version
+        self.display_board.set_debate_config(config_data)
+        self.display_board.update_debaters_info()
+
+    def _apply_state(self, state):
+        board = self.display_board
+        round_index = dict(zip(FIELDS, state))['round_index']
+        if round_index != board.current_round_index and 0 <= round_index < len(board.rounds):
+            board.start_round(round_index)
+        board.timer_manager.restore_state(state_to_snapshot(state, board.timer_manager.engine))
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import weakref
+
+from PyQt5.QtGui import QColor, QPalette
+from timer_core.engine import AFFIRMATIVE_COLOR, NEGATIVE_COLOR
+
+# 控件上记录当前视觉状态的动态属性
+STATE_PROPERTY = 'styleState'
+
+# 倒计时标签的文字颜色：正常、30秒内警告、10秒内按辩方着色
+# 通过调色板设置而不是样式表，闪烁时 FlashEngine 在此颜色和提醒色之间渐变
+COUNTDOWN_COLORS = {
+    'normal': "#323130",
+    'warning': "#D13438",
+    'critical-affirmative': AFFIRMATIVE_COLOR,
+    'critical-negative': NEGATIVE_COLOR,
+}
+
+# 辩手姓名标签：普通、正在发言
+DEBATER_STATES = {
+    'normal': "letter-spacing: 1px;",
+    'active-speaker': ("background-color: #FFD700; color: #000000; border: 2px solid #FFA500; "
+                       "border-radius: 4px; padding: 2px; font-weight: bold; letter-spacing: 1px;"),
+}
+
+
+class StyleStateManager:
+    """一组控件共用的命名视觉状态
+
+    所有状态编译进同一份样式表，每个控件只在第一次使用时设置一次；
+    之后切换状态只修改动态属性并重新 polish，Qt 不再解析样式表。
+    状态没有变化时直接返回，计时器每秒刷新时几乎没有开销。
+    """
+
+    def __init__(self, states, selector='QLabel'):
+        self.selector = selector
+        self._states = dict(states)
+        self._style_sheet = self._compile()
+        self._current = weakref.WeakKeyDictionary()  # 控件 -> 当前状态
+
+    def _compile(self):
+        return "\n".join(f'{self.selector}[{STATE_PROPERTY}="{name}"] {{ {style} }}'
+                         for name, style in self._states.items())
+
+    def set_state(self, widget, name):
+        """切换控件的视觉状态，返回是否发生了变化"""
+        if self._current.get(widget) == name:
+            return False
+        if name not in self._states:
+            raise KeyError(f"未定义的样式状态: {name}")
+        if widget not in self._current:
+            widget.setStyleSheet(self._style_sheet)
+        self._current[widget] = name
+        widget.setProperty(STATE_PROPERTY, name)
+        style = widget.style()
+        style.unpolish(widget)
+        style.polish(widget)
+        widget.update()
+        return True
+
+
+def set_text_color(widget, color):
+    """通过调色板设置文字颜色，颜色不变时不触发重绘
+
+    控件的样式表不能设置 color，否则会覆盖调色板。
+    """
+    color = QColor(color)
+    palette = widget.palette()
+    if palette.color(QPalette.WindowText) == color:
+        return False
+    palette.setColor(QPalette.WindowText, color)
+    widget.setPalette(palette)
+    return True
+
+
+def countdown_state(remaining, side):
+    """倒计时剩余秒数对应的状态：10秒内按辩方着色，30秒内警告色"""
+    if remaining <= 10:
+        return 'critical-affirmative' if side == 'affirmative' else 'critical-negative'
+    if remaining <= 30:
+        return 'warning'
+    return 'normal'
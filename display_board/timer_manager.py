@@ -1,388 +1,301 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from PyQt5.QtCore import QTimer, pyqtSignal, QObject
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QObject
 from utils import logger
+from perf_metrics import metrics
 import os
-from PyQt5.QtMultimedia import QSound
+import time
+
+from .audio_cues import AudioCuePlayer
+
+from timer_core import (TimerEngine, NS_PER_SECOND, NS_PER_MS, EVENT_TICK, EVENT_NOTIFY,
+                        EVENT_TIMEOVER, EVENT_SIDE_FINISHED, EVENT_ROUND_FINISHED)
+
+# 计时器在整秒边界之后稍作延迟再触发，避免因调度误差落在边界之前
+TICK_SLACK_MS = 2
+
 
 class TimerManager(QObject):
-    """计时器管理类，处理所有计时相关功能"""
-    
+    """计时器管理类，处理所有计时相关功能
+
+    计时逻辑由 timer_core.TimerEngine 完成，这里只负责用 QTimer 在合适的
+    时刻驱动引擎，并把引擎产生的事件转换为 Qt 信号和提示音。
+    """
+
     # 信号定义
     timeUpdated = pyqtSignal()
     timerFinished = pyqtSignal()
     affirmativeTimerFinished = pyqtSignal()
     negativeTimerFinished = pyqtSignal()
-    
-    def __init__(self, parent=None):
+    runningChanged = pyqtSignal(bool)
+    # 计时状态发生任何变化（控制操作、显示秒数变化、切换环节）时发出，供状态广播等订阅
+    stateChanged = pyqtSignal()
+
+    def __init__(self, parent=None, engine=None, scheduler=None, sound=True):
+        """
+        Args:
+            engine: 计时引擎，默认新建
+            scheduler: 共享的 SharedTickScheduler，多个计时器共用一个 QTimer；
+                       None 时使用自己的 QTimer
+            sound: 是否播放提示音，多赛场模式下只有接了屏幕的赛场发声
+        """
         super().__init__(parent)
         self.parent_window = parent
-        
-        # 计时器状态
-        self.current_time = 0
-        self.total_time = 0
-        self.affirmative_time = 0
-        self.negative_time = 0
-        self.timer_active = False
-        self.affirmative_timer_active = False
-        self.negative_timer_active = False
-        self.is_free_debate = False
-        self.current_round = None
-        
-        # 创建计时器
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self._update_timer)
-        
-        # 声音文件路径
+
+        # 计时引擎
+        self.engine = engine or TimerEngine()
+
+        # 创建计时器 - 单次触发，每次对准下一个整秒边界重新安排，只用于驱动重绘
+        self.scheduler = scheduler
+        self.timer = None
+        if scheduler is None:
+            self.timer = QTimer(self)
+            self.timer.setSingleShot(True)
+            self.timer.setTimerType(Qt.PreciseTimer)
+            self.timer.timeout.connect(self._update_timer)
+        else:
+            scheduler.register(self)
+        self._was_running = False
+        self._tick_due_ns = None
+
+        # 提示音 - 启动时预加载，按整秒边界提前安排播放
         self.media_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "media")
-        self.notification_sound = os.path.join(self.media_dir, "noti.wav")
-        self.timeover_sound = os.path.join(self.media_dir, "timeover.wav")
-        
-        # 倒计时提醒标记
-        self.notified_at_60s = False
-        self.notified_at_30s = False
-        self.notified_at_15s = False
-        self.last_10s_tick = 0
-        
+        self.audio = AudioCuePlayer(self.media_dir, self) if sound else None
+        self._scheduled_cue = None
+
         # 添加闪烁控制
         self.flash_count = 0
         self.flash_target = 0
         self.flash_color = None
         self.flash_widget = None
 
+    # 计时状态（委托给引擎）
+    @property
+    def current_time(self):
+        return self.engine.current_time
+
+    @property
+    def total_time(self):
+        return self.engine.total_time
+
+    @property
+    def affirmative_time(self):
+        return self.engine.affirmative_time
+
+    @property
+    def negative_time(self):
+        return self.engine.negative_time
+
+    @property
+    def timer_active(self):
+        return self.engine.timer_active
+
+    @property
+    def affirmative_timer_active(self):
+        return self.engine.affirmative_timer_active
+
+    @property
+    def negative_timer_active(self):
+        return self.engine.negative_timer_active
+
+    @property
+    def is_free_debate(self):
+        return self.engine.is_free_debate
+
+    @property
+    def current_round(self):
+        return self.engine.current_round
+
+    def precise_time(self, side=None):
+        """精确剩余秒数（浮点），用于平滑进度显示"""
+        return self.engine.remaining_ns(side) / NS_PER_SECOND
+
     def set_current_round(self, round_data):
         """设置当前环节"""
         try:
-            self.current_round = round_data
-            if round_data:
-                self.is_free_debate = round_data.get('type') == "自由辩论"
-                duration = round_data.get('time', 0)
-                
-                if self.is_free_debate:
-                    logger.info(f"设置自由辩论环节，每方时间: {duration//2}秒")
-                    self.affirmative_time = duration // 2
-                    self.negative_time = duration // 2
-                else:
-                    logger.info(f"设置标准环节，时间: {duration}秒")
-                    self.current_time = duration
-                    
-                self.total_time = duration
-                
-                # 重置提醒标记
-                self._reset_notification_flags()
-                
+            self.engine.set_current_round(round_data)
         except Exception as e:
             logger.error(f"设置当前环节时出错: {e}", exc_info=True)
+        self.stateChanged.emit()
+
+    def update_round_info(self, round_data):
+        """更新当前环节信息，不影响正在运行的计时"""
+        self.engine.update_round_info(round_data)
 
     def get_timer_state(self):
         """获取计时器状态"""
-        return {
-            'current_time': self.current_time,
-            'total_time': self.total_time,
-            'affirmative_time': self.affirmative_time,
-            'negative_time': self.negative_time,
-            'timer_active': self.timer_active,
-            'affirmative_timer_active': self.affirmative_timer_active,
-            'negative_timer_active': self.negative_timer_active,
-            'is_free_debate': self.is_free_debate
-        }
+        return self.engine.get_state()
+
+    def snapshot(self):
+        """导出精确的计时状态，见 TimerEngine.snapshot"""
+        return self.engine.snapshot()
+
+    def restore_state(self, snapshot):
+        """恢复计时状态并按新的运行状态重新安排触发"""
+        self.engine.restore(snapshot)
+        self.refresh()
+
+    def refresh(self):
+        """引擎状态被直接修改之后（如重放录像），重新安排触发并刷新显示"""
+        self._schedule_next_tick()
+        self.timeUpdated.emit()
 
     def toggle_timer(self):
         """开启或暂停标准计时器"""
-        if self.is_free_debate:
-            logger.info("自由辩论模式下，请使用正方/反方专用计时器控制")
-            return False
-        
-        if self.timer_active:
-            return self.pause()
-        else:
-            return self.start()
-    
+        return self._after_control(self.engine.toggle())
+
     def toggle_affirmative_timer(self):
         """开启或暂停正方计时器"""
         try:
-            if not self.is_free_debate:
-                logger.warning("非自由辩论模式不应调用正方计时器")
-                return False
-            
-            if self.affirmative_timer_active:
-                logger.info("正方计时器暂停")
-                self.timer.stop()
-                self.affirmative_timer_active = False
-                return True
-            else:
-                # 确保两个计时器不同时运行
-                if self.negative_timer_active:
-                    self.negative_timer_active = False
-                
-                logger.info("正方计时器启动")
-                if self.affirmative_time > 0:
-                    self.timer.start(1000)
-                    self.affirmative_timer_active = True
-                    return True
-                else:
-                    logger.warning("正方时间已用完")
-                    return False
+            return self._after_control(self.engine.toggle_side('affirmative'))
         except Exception as e:
             logger.error(f"切换正方计时器时出错: {e}", exc_info=True)
             return False
-    
+
     def toggle_negative_timer(self):
         """开启或暂停反方计时器"""
         try:
-            if not self.is_free_debate:
-                logger.warning("非自由辩论模式不应调用反方计时器")
-                return False
-            
-            if self.negative_timer_active:
-                logger.info("反方计时器暂停")
-                self.timer.stop()
-                self.negative_timer_active = False
-                return True
-            else:
-                # 确保两个计时器不同时运行
-                if self.affirmative_timer_active:
-                    self.affirmative_timer_active = False
-                
-                logger.info("反方计时器启动")
-                if self.negative_time > 0:
-                    self.timer.start(1000)
-                    self.negative_timer_active = True
-                    return True
-                else:
-                    logger.warning("反方时间已用完")
-                    return False
+            return self._after_control(self.engine.toggle_side('negative'))
         except Exception as e:
             logger.error(f"切换反方计时器时出错: {e}", exc_info=True)
             return False
 
     def start(self):
         """启动计时器"""
-        if self.is_free_debate:
-            logger.warning("自由辩论模式下请使用专用计时器控制")
-            return False
-        
-        if self.current_time > 0:
-            logger.info(f"启动标准计时器，剩余时间: {self.current_time}秒")
-            self.timer.start(1000)
-            self.timer_active = True
-            return True
-        else:
-            logger.warning("计时器时间为0，无法启动")
-            return False
-    
+        return self._after_control(self.engine.start())
+
     def pause(self):
         """暂停计时器"""
-        logger.info("暂停计时器")
-        self.timer.stop()
-        self.timer_active = False
-        return True
-    
+        return self._after_control(self.engine.pause())
+
     def stop(self):
         """停止计时器"""
         logger.info("停止计时器")
-        self.timer.stop()
-        self.timer_active = False
-        self.affirmative_timer_active = False
-        self.negative_timer_active = False
-        return True
+        return self._after_control(self.engine.stop())
 
     def reset_timer(self, duration=None):
         """重置计时器"""
-        logger.info("计时器重置")
-        self.timer.stop()
-        self.timer_active = False
-        self.affirmative_timer_active = False
-        self.negative_timer_active = False
-        
-        # 重置提醒标记
-        self._reset_notification_flags()
-        
-        if duration is not None:
-            self.total_time = duration
-            if self.is_free_debate:
-                half_time = duration // 2
-                self.affirmative_time = half_time
-                self.negative_time = half_time
-            else:
-                self.current_time = duration
-        else:
-            # 重置到环节开始时的时间
-            if self.current_round:
-                duration = self.current_round.get('time', 0)
-                self.total_time = duration
-                if self.is_free_debate:
-                    self.affirmative_time = duration // 2
-                    self.negative_time = duration // 2
-                else:
-                    self.current_time = duration
-        
+        self.engine.reset(duration)
+        self._schedule_next_tick()
         self.timeUpdated.emit()
         return True
-    
+
     def terminate_current_round(self):
         """强制终止当前回合"""
-        logger.info("终止当前回合")
         try:
-            self.timer.stop()
-            self.timer_active = False
-            self.affirmative_timer_active = False
-            self.negative_timer_active = False
-            return True
+            return self._after_control(self.engine.terminate())
         except Exception as e:
             logger.error(f"终止回合时出错: {e}", exc_info=True)
             return False
 
     def is_running(self):
         """检查计时器是否在运行"""
-        if self.is_free_debate:
-            return self.affirmative_timer_active or self.negative_timer_active
-        else:
-            return self.timer_active
-    
+        return self.engine.is_running()
+
     def isActive(self):
         """检查计时器是否激活（与is_running相同）"""
         return self.is_running()
-    
+
     @property
     def running(self):
         """计时器运行状态属性"""
         return self.is_running()
 
+    def _after_control(self, result):
+        """控制操作之后按新的运行状态重新安排触发"""
+        self._schedule_next_tick()
+        return result
+
+    def _schedule_next_tick(self):
+        """把下一次触发安排在显示秒数变化之后"""
+        wait_ns = self.engine.ns_until_next_tick()
+        running = wait_ns is not None
+        self._tick_due_ns = time.monotonic_ns() + wait_ns if running and metrics.enabled else None
+        if running != self._was_running:
+            self._was_running = running
+            self.runningChanged.emit(running)
+        self.stateChanged.emit()
+        if self.scheduler is not None:
+            self.scheduler.reschedule()
+        elif running:
+            self.timer.start(-(-wait_ns // NS_PER_MS) + TICK_SLACK_MS)
+        else:
+            self.timer.stop()
+
+        if running:
+            self._schedule_cue(wait_ns)
+        else:
+            self._cancel_cue()
+
+    def _schedule_cue(self, wait_ns):
+        """提前安排下一个整秒边界上的提示音"""
+        if self.audio is None:
+            return
+        cue = self.engine.upcoming_cue()
+        if cue is None:
+            self._cancel_cue()
+            return
+        # cue.remaining 是提示音对应的边界（届时显示的秒数）
+        key = (cue.kind, cue.side, cue.remaining)
+        if key == self._scheduled_cue:
+            return
+        if self.audio.schedule(cue.kind, wait_ns + TICK_SLACK_MS * NS_PER_MS):
+            self._scheduled_cue = key
+
+    def _cancel_cue(self):
+        """暂停或重置时取消尚未播放的提示音"""
+        if self.audio is not None:
+            self.audio.cancel()
+        self._scheduled_cue = None
+
     def _update_timer(self):
         """更新计时器"""
         try:
-            if self.is_free_debate:
-                # 自由辩论模式：更新活动中的一方计时器
-                if self.affirmative_timer_active and self.affirmative_time > 0:
-                    self.affirmative_time -= 1
-                    if self.affirmative_time == 0:
-                        self.timer.stop()
-                        self.affirmative_timer_active = False
-                        self._play_timeover()
-                        self.affirmativeTimerFinished.emit()
-                        return
-                
-                elif self.negative_timer_active and self.negative_time > 0:
-                    self.negative_time -= 1
-                    if self.negative_time == 0:
-                        self.timer.stop()
-                        self.negative_timer_active = False
-                        self._play_timeover()
-                        self.negativeTimerFinished.emit()
-                        return
-                
-                # 检查总体时间是否结束
-                if self.affirmative_time == 0 and self.negative_time == 0:
-                    logger.info("自由辩论环节结束")
-                    self.timer.stop()
-                    self._play_timeover()
-                    self.timerFinished.emit()
-                    return
-            else:
-                # 标准计时模式
-                if self.current_time > 0:
-                    self.current_time -= 1
-                    if self.current_time == 0:
-                        self.timer.stop()
-                        self.timer_active = False
-                        self._play_timeover()
-                        self.timerFinished.emit()
-                        return
-            
-            # 检查是否需要发出提醒
-            self._check_time_notifications()
-            
-            # 发送时间更新信号
-            self.timeUpdated.emit()
-            
+            if metrics.enabled and self._tick_due_ns is not None:
+                # 实际触发时刻与整秒边界之差，包含 TICK_SLACK_MS
+                metrics.sample('tick.jitter', time.monotonic_ns() - self._tick_due_ns)
+            self._dispatch_events(self.engine.poll())
         except Exception as e:
             logger.error(f"更新计时器时出错: {e}", exc_info=True)
-    
-    def _check_time_notifications(self):
-        """检查是否需要发出时间提醒"""
-        try:
-            if self.is_free_debate:
-                # 自由辩论模式
-                if self.affirmative_timer_active:
-                    current_time = self.affirmative_time
-                    color = "#0078D4"  # 正方蓝色
-                elif self.negative_timer_active:
-                    current_time = self.negative_time
-                    color = "#D13438"  # 反方红色
-                else:
-                    return
-            else:
-                # 标准模式
-                current_time = self.current_time
-                # 获取当前环节的辩方
-                side = self.current_round.get('side') if self.current_round else None
-                if side == "affirmative":
-                    color = "#0078D4"  # 正方蓝色
+        finally:
+            self._schedule_next_tick()
+
+    def _dispatch_events(self, events):
+        """把引擎事件转换为信号、提示音和闪烁"""
+        for event in events:
+            if event.kind == EVENT_NOTIFY:
+                self._play_cue(event)
+                self._trigger_flash(event.flash_count, event.color)
+            elif event.kind == EVENT_TICK:
+                self.timeUpdated.emit()
+            elif event.kind == EVENT_TIMEOVER:
+                self._play_cue(event)
+            elif event.kind == EVENT_SIDE_FINISHED:
+                if event.side == 'affirmative':
+                    self.affirmativeTimerFinished.emit()
                 else:
-                    color = "#D13438"  # 反方红色
-            
-            # 1分钟提醒
-            if current_time == 60 and not self.notified_at_60s:
-                self.notified_at_60s = True
-                self._play_notification()
-                self._trigger_flash(1, color)
-                logger.info("剩余时间1分钟提醒")
-            
-            # 30秒提醒
-            elif current_time == 30 and not self.notified_at_30s:
-                self.notified_at_30s = True
-                self._play_notification()
-                self._trigger_flash(2, color)
-                logger.info("剩余时间30秒提醒")
-            
-            # 15秒提醒
-            elif current_time == 15 and not self.notified_at_15s:
-                self.notified_at_15s = True
-                self._play_notification()
-                self._trigger_flash(3, color)
-                logger.info("剩余时间15秒提醒")
-            
-            # 最后10秒每秒提醒
-            elif 1 <= current_time <= 10:
-                # 确保只在整秒时提醒
-                if current_time != self.last_10s_tick:
-                    self.last_10s_tick = current_time
-                    self._play_notification()
-                    self._trigger_flash(1, color)
-                    logger.info(f"倒计时最后{current_time}秒")
-            
-        except Exception as e:
-            logger.error(f"检查时间提醒时出错: {e}", exc_info=True)
-    
-    def _reset_notification_flags(self):
-        """重置提醒标记"""
-        self.notified_at_60s = False
-        self.notified_at_30s = False
-        self.notified_at_15s = False
-        self.last_10s_tick = 0
-    
-    def _play_notification(self):
-        """播放通知声音"""
-        try:
-            if os.path.exists(self.notification_sound):
-                QSound.play(self.notification_sound)
-            else:
-                logger.warning(f"通知声音文件不存在: {self.notification_sound}")
-        except Exception as e:
-            logger.error(f"播放通知声音时出错: {e}", exc_info=True)
-    
-    def _play_timeover(self):
-        """播放时间结束声音"""
-        try:
-            if os.path.exists(self.timeover_sound):
-                QSound.play(self.timeover_sound)
-            else:
-                logger.warning(f"时间结束声音文件不存在: {self.timeover_sound}")
-        except Exception as e:
-            logger.error(f"播放时间结束声音时出错: {e}", exc_info=True)
-    
+                    self.negativeTimerFinished.emit()
+            elif event.kind == EVENT_ROUND_FINISHED:
+                self.timerFinished.emit()
+
+    def _play_cue(self, event):
+        """播放提示音，已经提前安排过的不再重复播放
+
+        提前安排的提示音以目标边界的显示秒数为键。卡顿超过一秒时 poll()
+        报告的秒数低于该边界，仍是同一次提醒：安排的提示音已经播放就不再
+        播放，还没到时就立即播放。
+        """
+        scheduled = self._scheduled_cue
+        if (scheduled is not None and scheduled[:2] == (event.kind, event.side)
+                and event.remaining <= scheduled[2]):
+            self._scheduled_cue = None
+            if self.audio is not None:
+                self.audio.flush()
+            return
+        if self.audio is not None:
+            self.audio.play(event.kind)
+
     def _trigger_flash(self, count, color):
         """触发闪烁效果"""
         self.flash_count = 0
@@ -395,36 +308,17 @@ class TimerManager(QObject):
     def update_time(self):
         """更新时间（兼容性方法）"""
         self._update_timer()
-    
+
     def set_duration(self, duration):
         """设置计时器持续时间"""
-        logger.info(f"设置计时器持续时间: {duration}秒")
-        self.total_time = duration
-        
-        if self.is_free_debate:
-            half_time = duration // 2
-            self.affirmative_time = half_time
-            self.negative_time = half_time
-        else:
-            self.current_time = duration
-        
-        # 重置提醒标记
-        self._reset_notification_flags()
-        
+        self.engine.set_duration(duration)
         self.timeUpdated.emit()
+        self.stateChanged.emit()
         return True
-    
+
     def resume(self):
         """恢复计时器"""
         if self.is_free_debate:
             logger.warning("自由辩论模式下请使用专用计时器控制")
             return False
-        
-        if self.current_time > 0:
-            logger.info(f"恢复标准计时器，剩余时间: {self.current_time}秒")
-            self.timer.start(1000)
-            self.timer_active = True
-            return True
-        else:
-            logger.warning("计时器时间为0，无法恢复")
-            return False
+        return self._after_control(self.engine.resume())
@@ -10,6 +10,7 @@ from PyQt5.QtWidgets import QGraphicsOpacityEffect
 
 from utils import GradientBorderFrame, logger
 from custom_progress_bar import RoundedProgressBar
+from .style_states import COUNTDOWN_COLORS, set_text_color
 
 class UIComponents:
     """UI组件创建和管理类"""
@@ -108,6 +109,7 @@ class UIComponents:
         # 创建更大的环形进度条
         size = 120  # 从80增加到120
         progress_bar = RoundedProgressBar()
+        progress_bar.setObjectName("progress_standard")
         progress_bar.setFixedSize(size, size)
         progress_bar.setLineWidth(8)  # 增加线宽
         progress_bar.setProgressColor(QColor("#0078D4"))
@@ -117,7 +119,8 @@ class UIComponents:
         countdown_label = QLabel()
         countdown_label.setFont(QFont("微软雅黑", 36, QFont.Bold))  # 从24增加到36
         countdown_label.setAlignment(Qt.AlignCenter)
-        countdown_label.setStyleSheet("color: #323130;")
+        # 文字颜色通过调色板设置，闪烁时由 FlashEngine 改变，不能写在样式表里
+        set_text_color(countdown_label, COUNTDOWN_COLORS['normal'])
         countdown_label.setMinimumWidth(120)  # 确保标签有足够宽度
         
         timer_layout.addWidget(progress_bar)
@@ -149,6 +152,9 @@ class UIComponents:
         # 正方计时器组 - 使用更大的进度条
         aff_group = self._create_timer_group("正方", "#0078D4", size+20)  # 增加进度条尺寸
         neg_group = self._create_timer_group("反方", "#C42B1C", size+20)  # 增加进度条尺寸
+        # 对象名用于性能叠加层区分各个进度环
+        aff_group.progress_bar.setObjectName("progress_affirmative")
+        neg_group.progress_bar.setObjectName("progress_negative")
         
         layout.addWidget(aff_group)
         layout.addWidget(neg_group)
@@ -190,7 +196,8 @@ class UIComponents:
         countdown_label = QLabel()
         countdown_label.setFont(QFont("微软雅黑", 20, QFont.Bold))
         countdown_label.setAlignment(Qt.AlignCenter)
-        countdown_label.setStyleSheet("color: #323130;")
+        # 文字颜色通过调色板设置，闪烁时由 FlashEngine 改变，不能写在样式表里
+        set_text_color(countdown_label, COUNTDOWN_COLORS['normal'])
         layout.addWidget(countdown_label)
         
         # 保存组件引用
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""延迟导入
+
+启动路径上用不到的重量级模块（markdown、QtMultimedia、psutil）通过
+lazy_import() 获取代理对象，第一次访问属性时才真正导入，导入耗时记入
+启动分析器。模块不存在时在第一次使用时抛出 ImportError。
+"""
+
+import importlib
+import logging
+import time
+
+from startup_profiler import profiler
+
+logger = logging.getLogger('debate_app.lazy_imports')
+
+_modules = {}
+
+
+class LazyModule:
+    """模块代理，第一次访问属性时导入目标模块"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            started = time.perf_counter()
+            self._module = importlib.import_module(self._name)
+            profiler.record(f"import {self._name}", started, time.perf_counter())
+            logger.debug(f"延迟导入 {self._name}: {(time.perf_counter() - started) * 1000:.1f} ms")
+        return self._module
+
+    def is_loaded(self):
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "已导入" if self._module is not None else "未导入"
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def lazy_import(name):
+    """返回模块的延迟代理，同名模块共用一个代理"""
+    module = _modules.get(name)
+    if module is None:
+        module = _modules[name] = LazyModule(name)
+    return module
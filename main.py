@@ -8,21 +8,47 @@
 
 import sys
 import os
+import time
 import argparse
 import logging
+
+# 最先导入启动分析器，以便记录其余模块的导入耗时
+from startup_profiler import profiler
+_imports_started = time.perf_counter()
+
 from PyQt5.QtWidgets import QApplication, QGraphicsOpacityEffect
-from PyQt5.QtCore import QTranslator, QLocale, QTimer
+from PyQt5.QtCore import QTranslator, QLocale
 
 # 导入程序模块
-from utils import is_low_performance, logger
+from utils import is_low_performance, logger, log_listener
 from display_board import DisplayBoard
 from control_panel import ControlPanel
+import timer_journal
+
+profiler.record('imports', _imports_started, time.perf_counter())
 
 def parse_args():
     """解析命令行参数"""
     parser = argparse.ArgumentParser(description="辩论计时系统")
     parser.add_argument('--config', '-c', help="配置文件路径", type=str)
+    parser.add_argument('--rooms', help="多赛场模式：赛场列表文件路径（JSON）", type=str)
+    parser.add_argument('--publish', help="向局域网内的镜像显示板广播状态，可指定端口", nargs='?',
+                        type=int, const=47800, metavar='PORT')
+    parser.add_argument('--publish-host', help="状态广播监听的地址", default='0.0.0.0')
+    parser.add_argument('--api', help="启用本地 HTTP/WebSocket 状态接口，可指定端口", nargs='?',
+                        type=int, const=8765, metavar='PORT')
+    parser.add_argument('--api-host', help="状态接口监听的地址，默认只允许本机访问", default='127.0.0.1')
+    parser.add_argument('--mirror', help="镜像模式：只显示看板，状态来自操作端 HOST[:PORT]", metavar='HOST[:PORT]')
+    parser.add_argument('--journal', help="计时日志文件路径，默认在程序目录的 journal 下")
+    parser.add_argument('--no-journal', help="不记录计时日志，也不恢复上次的比赛", action='store_true')
+    parser.add_argument('--no-record', help="不录制比赛", action='store_true')
+    parser.add_argument('--replay', help="在显示板上重放比赛录像（.dbr）", metavar='FILE')
+    parser.add_argument('--replay-speed', help="重放倍速，最高 1000", type=float, default=1.0)
+    parser.add_argument('--replay-from', help="从录像的该时刻（MM:SS）开始重放")
     parser.add_argument('--low-performance', '-l', help="低性能模式", action='store_true')
+    parser.add_argument('--smooth-progress', help="平滑进度环（亚秒级动画，帧率自适应）", action='store_true')
+    parser.add_argument('--profile-startup', help="输出启动各阶段耗时", action='store_true')
+    parser.add_argument('--startup-report', help="首帧后把启动耗时写入该 JSON 文件并退出（用于启动基准测试）")
     parser.add_argument('--debug', '-d', help="调试模式", action='store_true')
     parser.add_argument('--lang', help="界面语言，默认中文", default='zh_CN', choices=['zh_CN', 'en_US'])
     return parser.parse_args()
@@ -31,13 +57,14 @@ def setup_logging(debug_mode):
     """设置日志级别"""
     if debug_mode:
         logger.setLevel(logging.DEBUG)
-        for handler in logger.handlers:
+        # 实际写日志的处理器挂在后台队列监听器上
+        for handler in log_listener.handlers:
             if isinstance(handler, logging.StreamHandler):
                 handler.setLevel(logging.DEBUG)
         logger.debug("调试模式已开启")
     else:
         logger.setLevel(logging.INFO)
-        for handler in logger.handlers:
+        for handler in log_listener.handlers:
             if isinstance(handler, logging.StreamHandler):
                 handler.setLevel(logging.INFO)
 
@@ -52,12 +79,14 @@ def main():
     # 自动检测是否启用低性能模式
     low_performance_mode = args.low_performance
     if not low_performance_mode:
-        low_performance_mode = is_low_performance()
+        with profiler.phase('low performance check'):
+            low_performance_mode = is_low_performance()
         if low_performance_mode:
             logger.info("自动检测到低性能硬件，启用低性能模式")
     
     # 创建应用程序
-    app = QApplication(sys.argv)
+    with profiler.phase('QApplication'):
+        app = QApplication(sys.argv)
     
     # 设置应用程序基本信息
     app.setApplicationName("辩论赛计时系统")
@@ -74,29 +103,121 @@ def main():
         else:
             logger.error(f"无法加载语言文件: {args.lang}")
     
+    # 多赛场模式：一个中控台管理全部赛场，只为接了屏幕的赛场创建显示板
+    if args.rooms:
+        from multi_room import MultiRoomWindow, load_rooms_file
+        try:
+            room_entries = load_rooms_file(args.rooms)
+        except Exception as e:
+            logger.error(f"无法读取赛场列表 {args.rooms}: {e}", exc_info=True)
+            return 1
+        window = MultiRoomWindow(room_entries, low_performance_mode=low_performance_mode)
+        window.show()
+        return app.exec_()
+    
+    # 重放模式：显示板由录像驱动
+    if args.replay:
+        from match_recorder import read_recording, parse_time
+        from display_board.replay_driver import ReplayDriver
+        try:
+            recording = read_recording(args.replay)
+        except Exception as e:
+            logger.error(f"无法读取录像 {args.replay}: {e}", exc_info=True)
+            return 1
+        replay_driver = ReplayDriver(recording, args.replay_speed)
+        display_board = DisplayBoard(low_performance_mode=low_performance_mode,
+                                     smooth_progress=args.smooth_progress,
+                                     timer_manager=replay_driver.timer_manager)
+        replay_driver.attach_board(display_board)
+        display_board.show()
+        replay_driver.start(parse_time(args.replay_from) if args.replay_from else 0)
+        return app.exec_()
+    
+    # 镜像模式：没有控制面板，显示板跟随操作端
+    if args.mirror:
+        from display_board.state_mirror import StateMirrorClient, DEFAULT_PORT
+        host, _, port = args.mirror.partition(':')
+        display_board = DisplayBoard(low_performance_mode=low_performance_mode,
+                                     smooth_progress=args.smooth_progress)
+        mirror_client = StateMirrorClient(display_board, host, int(port) if port else DEFAULT_PORT)
+        mirror_client.start()
+        display_board.show()
+        return app.exec_()
+    
     # 创建窗口
-    display_board = DisplayBoard(low_performance_mode=low_performance_mode)
+    display_board = DisplayBoard(low_performance_mode=low_performance_mode,
+                                 smooth_progress=args.smooth_progress)
+    if args.publish:
+        from display_board.state_mirror import StatePublisher
+        state_publisher = StatePublisher(display_board, args.publish, args.publish_host)
+        state_publisher.start()
+    if args.api:
+        import state_api
+        api_server = state_api.StateApiServer(args.api_host, args.api)
+        if api_server.start():
+            state_api.attach(display_board, api_server)
+            app.aboutToQuit.connect(api_server.stop)
     control_panel = ControlPanel(display_board)
     
     # 设置控制面板引用
     display_board.set_control_panel(control_panel)
     
-    # 显示窗口
-    display_board.show()
-    control_panel.show()
+    # 比赛录像：每加载一场比赛开始一个新的录像文件
+    if not args.no_record and not args.startup_report:
+        from match_recorder import RecordingSession
+        recording_session = RecordingSession(display_board.timer_manager.engine)
+        control_panel.configLoaded.connect(recording_session.start_match)
+        display_board.configApplied.connect(recording_session.config_applied)
+        app.aboutToQuit.connect(recording_session.close)
+    
+    # 计时日志：上次没有正常结束时恢复比赛进度（基准测试时不启用）
+    journal_record = None
+    if not args.no_journal and not args.startup_report:
+        journal_path = args.journal or timer_journal.default_journal_path()
+        journal_record = timer_journal.read_last_record(journal_path)
+        try:
+            recorder = timer_journal.JournalRecorder(timer_journal.TimerJournal(journal_path),
+                                                     display_board, control_panel)
+            app.aboutToQuit.connect(recorder.close)
+        except OSError as e:
+            logger.error(f"无法打开计时日志 {journal_path}: {e}")
     
-    # 如果提供了配置文件，自动加载
-    if args.config and os.path.exists(args.config):
+    recover = timer_journal.needs_recovery(journal_record) and (
+        not args.config or os.path.abspath(args.config) == journal_record['config'])
+    if recover:
+        state, deducted = timer_journal.recovered_state(journal_record)
+        logger.warning(f"上次运行未正常结束，正在恢复比赛进度（扣除中断期间 {deducted / 1e9:.1f} 秒）")
+        control_panel.restore_from_journal(journal_record, state)
+    # 如果提供了配置文件，在显示窗口之前加载，首帧即为完整内容
+    elif args.config and os.path.exists(args.config):
         try:
             logger.info(f"正在加载配置文件: {args.config}")
-            # 使用控制面板的方法来加载配置并延迟执行
-            QTimer.singleShot(500, lambda: load_config_and_log(control_panel, args.config))
+            with profiler.phase('config load'):
+                load_config_and_log(control_panel, args.config)
         except Exception as e:
             logger.error(f"自动加载配置文件失败: {e}")
     
+    # 显示窗口
+    profiler.watch_first_paint(display_board,
+                               lambda p: on_first_frame(display_board, args.profile_startup,
+                                                        args.startup_report))
+    display_board.show()
+    control_panel.show()
+    
     # 运行应用
     return app.exec_()
 
+def on_first_frame(display_board, report_startup=False, report_path=None):
+    """首帧绘制之后再加载启动路径上用不到的资源"""
+    if report_path:
+        # 基准测试只关心首帧，写完报告直接退出
+        profiler.write_report(report_path)
+        QApplication.quit()
+        return
+    display_board.timer_manager.audio.preload()
+    if report_startup:
+        logger.info(profiler.report())
+
 def load_config_and_log(control_panel, config_path):
     """加载配置文件并记录辩手信息"""
     logger.info(f"开始加载配置文件: {config_path}")
@@ -110,8 +231,11 @@ def load_config_and_log(control_panel, config_path):
             rounds_data = control_panel.debate_config.get_rounds()
             
             logger.info(f"回合数据: {len(rounds_data)} 个回合")
-            for i, round_info in enumerate(rounds_data):
-                logger.debug(f"回合 {i+1}: {round_info}")
+            # 逐条输出只在调试模式下进行
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                for i, round_info in enumerate(rounds_data):
+                    logger.debug(f"回合 {i+1}: {round_info}")
             
             # 检查回合列表是否正确填充
             if hasattr(control_panel, 'rounds_list'):
@@ -120,7 +244,7 @@ def load_config_and_log(control_panel, config_path):
                 
                 if list_count == 0:
                     logger.error("回合列表为空，可能存在UI更新问题")
-                else:
+                elif debug:
                     # 输出列表中的项目
                     for i in range(list_count):
                         item = control_panel.rounds_list.item(i)
@@ -0,0 +1,392 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""比赛用时统计：从比赛录像汇总每个辩手位置和每类环节的用时
+
+每场录像用 MatchReplayer 重放一遍，按 set_current_round 切分为环节，
+每个环节得到一行：
+    used_s              实际用时（环节时长减去结束时的剩余时间，重置后重新计算）
+    overtime_s          时间到之后到操作员下一次操作之间的时间
+    pauses / paused_s   暂停次数与暂停总时长（从开始计时到环节结束）
+    affirmative_used_s  自由辩论中正方用时
+    negative_used_s     自由辩论中反方用时
+    switches            自由辩论中发言方交换次数
+只切换过去、没有开始计时的环节不计入。
+
+环节行按列存放，汇总时对辩手位置（debater_roles 的键，如
+affirmative_first）和环节类型分组求和。安装了 NumPy 时用 np.unique +
+np.bincount 一次完成整季数据的分组汇总，否则逐行累加，结果相同。
+
+用法:
+    python -m match_analytics recordings/ --out stats/
+    python -m match_analytics a.dbr b.dbr --out stats/ --jobs 4
+
+输出 segments.csv、by_role.csv、by_type.csv，以及同名的列式文件
+（有 NumPy 时为 .npz，否则为按列存放的 .columns.json）。
+
+本模块不依赖 Qt。
+"""
+
+import os
+import csv
+import sys
+import json
+import logging
+import argparse
+
+from timer_core import NS_PER_SECOND, EVENT_SIDE_FINISHED, EVENT_ROUND_FINISHED
+from timer_core.engine import FREE_DEBATE_TYPE
+from match_recorder import MatchReplayer, RecordingError, RECORDING_EXTENSION, read_recording
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger('debate_app.match_analytics')
+
+SPEAKER_POSITIONS = {'一辩': 'first', '二辩': 'second', '三辩': 'third', '四辩': 'fourth'}
+FREE_DEBATE_ROLE = 'free_debate'
+
+TEXT_COLUMNS = ('match', 'topic', 'type', 'side', 'speaker', 'role', 'debater')
+SEGMENT_COLUMNS = ('match', 'topic', 'round_index', 'type', 'side', 'speaker', 'role', 'debater',
+                   'allotted_s', 'used_s', 'overtime_s', 'pauses', 'paused_s',
+                   'affirmative_used_s', 'negative_used_s', 'switches')
+# 分组汇总时求和的列
+SUM_COLUMNS = ('allotted_s', 'used_s', 'overtime_s', 'pauses', 'paused_s',
+               'affirmative_used_s', 'negative_used_s', 'switches')
+GROUPINGS = ('role', 'type')
+
+# 由运行变为停止时计为一次暂停的操作
+_PAUSE_ACTIONS = ('pause', 'toggle', 'toggle_side')
+
+
+def speaker_role(round_data):
+    """环节对应的辩手位置，与 debater_roles 的键一致"""
+    if round_data.get('type') == FREE_DEBATE_TYPE:
+        return FREE_DEBATE_ROLE
+    speaker = round_data.get('speaker', '')
+    return f"{round_data.get('side', '')}_{SPEAKER_POSITIONS.get(speaker, speaker)}"
+
+
+def empty_columns():
+    return {name: [] for name in SEGMENT_COLUMNS}
+
+
+def extend_columns(columns, other):
+    for name in SEGMENT_COLUMNS:
+        columns[name].extend(other[name])
+    return columns
+
+
+class _Segment:
+    """一个环节的累计数据"""
+
+    def __init__(self, round_data, round_index):
+        self.round_data = round_data
+        self.round_index = round_index
+        self.started = False
+        self.ended = False
+        self.finished_at = None
+        self.overtime_ns = 0
+        self.pauses = 0
+        self.paused_ns = 0
+        self.switches = 0
+        self.last_side = None
+
+
+class MatchAnalyzer:
+    """重放一场录像，按环节统计用时"""
+
+    def __init__(self, recording):
+        self.recording = recording
+        self.replayer = MatchReplayer(recording, apply_control=self._apply_control,
+                                      on_events=self._on_events)
+        self.engine = self.replayer.engine
+        self.columns = empty_columns()
+        self._segment = None
+        self._running = False
+        self._last_ns = 0
+
+    def run(self):
+        """重放整场比赛，返回按列存放的环节数据"""
+        self.replayer.advance_to(self.replayer.duration_ns)
+        now = self.replayer.duration_ns
+        self._settle(now)
+        self._close_segment(now)
+        return self.columns
+
+    def _apply_control(self, action, args):
+        now = self.replayer.clock_position_ns()
+        self._settle(now)
+        segment = self._segment
+        if segment is not None and segment.finished_at is not None:
+            segment.overtime_ns += now - segment.finished_at
+            segment.finished_at = None
+
+        if action == 'set_current_round':
+            self._close_segment(now)
+        if action != 'config':
+            getattr(self.engine, action)(*args)
+        if action == 'set_current_round':
+            self._open_segment(args[0])
+            return
+        self._observe(action)
+
+    def _on_events(self, events):
+        now = self.replayer.clock_position_ns()
+        self._settle(now)
+        segment = self._segment
+        for event in events:
+            if segment is None:
+                break
+            if event.kind in (EVENT_SIDE_FINISHED, EVENT_ROUND_FINISHED):
+                segment.finished_at = now
+            if event.kind == EVENT_ROUND_FINISHED:
+                segment.ended = True
+        self._running = self.engine.is_running()
+
+    def _settle(self, now):
+        """累计上一次状态变化以来的暂停时间"""
+        segment = self._segment
+        if segment is not None and segment.started and not segment.ended and not self._running:
+            segment.paused_ns += now - self._last_ns
+        self._last_ns = now
+
+    def _observe(self, action):
+        """控制操作之后的状态变化"""
+        running = self.engine.is_running()
+        segment = self._segment
+        if segment is not None:
+            if action == 'reset':
+                segment.started = segment.ended = False
+                segment.finished_at = None
+                segment.last_side = None
+            elif action == 'terminate':
+                segment.ended = True
+            elif running:
+                segment.started = True
+                segment.ended = False
+                side = self._speaking_side()
+                if segment.last_side is not None and side != segment.last_side:
+                    segment.switches += 1
+                segment.last_side = side
+            if self._running and not running and action in _PAUSE_ACTIONS and not segment.ended:
+                segment.pauses += 1
+        self._running = running
+
+    def _speaking_side(self):
+        if self.engine.affirmative_timer_active:
+            return 'affirmative'
+        if self.engine.negative_timer_active:
+            return 'negative'
+        return None
+
+    def _open_segment(self, round_data):
+        rounds = self.replayer.config.get('rounds') or []
+        index = rounds.index(round_data) if round_data in rounds else -1
+        self._segment = _Segment(round_data, index) if round_data else None
+        self._running = self.engine.is_running()
+
+    def _close_segment(self, now):
+        segment, self._segment = self._segment, None
+        if segment is None or not segment.started:
+            return
+        if segment.finished_at is not None:
+            segment.overtime_ns += now - segment.finished_at
+
+        engine = self.engine
+        round_data = segment.round_data
+        role = speaker_role(round_data)
+        config = self.replayer.config
+        allotted_ns = engine.total_time * NS_PER_SECOND
+        if engine.is_free_debate:
+            half_ns = engine.total_time // 2 * NS_PER_SECOND
+            affirmative_ns = half_ns - engine.remaining_ns('affirmative')
+            negative_ns = half_ns - engine.remaining_ns('negative')
+            used_ns = affirmative_ns + negative_ns
+        else:
+            affirmative_ns = negative_ns = 0
+            used_ns = allotted_ns - engine.remaining_ns()
+
+        row = {
+            'match': os.path.basename(self.recording.path),
+            'topic': config.get('topic', ''),
+            'round_index': segment.round_index,
+            'type': round_data.get('type', ''),
+            'side': round_data.get('side', ''),
+            'speaker': round_data.get('speaker', ''),
+            'role': role,
+            'debater': (config.get('debater_roles') or {}).get(role, ''),
+            'allotted_s': allotted_ns / NS_PER_SECOND,
+            'used_s': used_ns / NS_PER_SECOND,
+            'overtime_s': segment.overtime_ns / NS_PER_SECOND,
+            'pauses': segment.pauses,
+            'paused_s': segment.paused_ns / NS_PER_SECOND,
+            'affirmative_used_s': affirmative_ns / NS_PER_SECOND,
+            'negative_used_s': negative_ns / NS_PER_SECOND,
+            'switches': segment.switches,
+        }
+        for name in SEGMENT_COLUMNS:
+            self.columns[name].append(row[name])
+
+
+def analyze_file(path):
+    """统计一个录像文件，返回 (路径, 按列存放的环节数据, 错误信息)"""
+    try:
+        return path, MatchAnalyzer(read_recording(path)).run(), None
+    except (OSError, RecordingError) as e:
+        return path, empty_columns(), str(e)
+    except Exception as e:
+        logger.error(f"统计录像 {path} 时出错: {e}", exc_info=True)
+        return path, empty_columns(), str(e)
+
+
+def aggregate(columns, key):
+    """按 key 列分组汇总
+
+    Returns:
+        Dict[str, list]: 按列存放的汇总结果，每组一行，按 key 排序；
+        包含环节数、超时环节数、各 SUM_COLUMNS 合计、平均用时和用时比例
+    """
+    if np is not None:
+        return _aggregate_numpy(columns, key)
+    return _aggregate_python(columns, key)
+
+
+def _aggregate_numpy(columns, key):
+    if not columns[key]:
+        return _summary([], [], [], {name: [] for name in SUM_COLUMNS})
+    keys, inverse = np.unique(np.asarray(columns[key], dtype=str), return_inverse=True)
+    size = len(keys)
+    counts = np.bincount(inverse, minlength=size)
+    overtime = np.asarray(columns['overtime_s'], dtype=np.float64)
+    overtime_counts = np.bincount(inverse, weights=overtime > 0, minlength=size)
+    sums = {name: np.bincount(inverse, weights=np.asarray(columns[name], dtype=np.float64), minlength=size)
+            for name in SUM_COLUMNS}
+    return _summary(keys.tolist(), counts.tolist(), overtime_counts.astype(np.int64).tolist(),
+                    {name: values.tolist() for name, values in sums.items()})
+
+
+def _aggregate_python(columns, key):
+    groups = {}
+    for i, value in enumerate(columns[key]):
+        group = groups.get(value)
+        if group is None:
+            group = groups[value] = {name: 0.0 for name in SUM_COLUMNS}
+            group['count'] = group['overtime_count'] = 0
+        group['count'] += 1
+        group['overtime_count'] += columns['overtime_s'][i] > 0
+        for name in SUM_COLUMNS:
+            group[name] += columns[name][i]
+    keys = sorted(groups)
+    return _summary(keys, [groups[k]['count'] for k in keys], [groups[k]['overtime_count'] for k in keys],
+                    {name: [groups[k][name] for k in keys] for name in SUM_COLUMNS})
+
+
+def _summary(keys, counts, overtime_counts, sums):
+    result = {'key': keys, 'segments': counts, 'overtime_segments': overtime_counts}
+    for name in SUM_COLUMNS:
+        result[name] = [round(value, 3) for value in sums[name]]
+    result['mean_used_s'] = [round(used / count, 3) for used, count in zip(sums['used_s'], counts)]
+    result['used_ratio'] = [round(used / allotted, 4) if allotted else 0.0
+                            for used, allotted in zip(sums['used_s'], sums['allotted_s'])]
+    return result
+
+
+# 导出
+def write_csv(path, columns):
+    """按列存放的数据写为 CSV，带 BOM 以便 Excel 正确识别中文"""
+    names = list(columns)
+    with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(names)
+        writer.writerows(zip(*(columns[name] for name in names)))
+    return path
+
+
+def write_columnar(path_stem, columns):
+    """写入列式文件：有 NumPy 时为 .npz，否则为按列存放的 JSON"""
+    if np is not None:
+        path = path_stem + '.npz'
+        arrays = {name: np.asarray(values, dtype=str if name in TEXT_COLUMNS or name == 'key' else np.float64)
+                  for name, values in columns.items()}
+        np.savez_compressed(path, **arrays)
+    else:
+        path = path_stem + '.columns.json'
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(columns, f, ensure_ascii=False)
+    return path
+
+
+def export(columns, out_dir):
+    """导出环节明细和各分组汇总，返回写入的文件列表"""
+    os.makedirs(out_dir, exist_ok=True)
+    tables = {'segments': columns}
+    for key in GROUPINGS:
+        tables[f'by_{key}'] = aggregate(columns, key)
+    written = []
+    for name, table in tables.items():
+        stem = os.path.join(out_dir, name)
+        written.append(write_csv(stem + '.csv', table))
+        written.append(write_columnar(stem, table))
+    return written
+
+
+def collect_paths(paths):
+    """展开目录中的录像文件"""
+    result = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                result.extend(os.path.join(root, name) for name in sorted(files)
+                              if name.endswith(RECORDING_EXTENSION))
+        else:
+            result.append(path)
+    return result
+
+
+def analyze_season(paths, jobs=None):
+    """统计多个录像文件，返回 (按列存放的全部环节, 失败的 [(路径, 错误)])"""
+    if jobs == 1 or len(paths) <= 1:
+        results = map(analyze_file, paths)
+        return _merge(results)
+    from concurrent.futures import ProcessPoolExecutor
+    chunksize = max(1, len(paths) // ((jobs or os.cpu_count() or 1) * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return _merge(executor.map(analyze_file, paths, chunksize=chunksize))
+
+
+def _merge(results):
+    columns = empty_columns()
+    failed = []
+    for path, match_columns, error in results:
+        if error:
+            failed.append((path, error))
+        else:
+            extend_columns(columns, match_columns)
+    return columns, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="统计比赛录像中各辩手位置和各类环节的用时")
+    parser.add_argument('paths', nargs='+', help="录像文件或目录")
+    parser.add_argument('--out', '-o', default='stats', help="输出目录，默认为 stats")
+    parser.add_argument('--jobs', '-j', type=int, default=None, help="并行进程数，默认为CPU核心数")
+    args = parser.parse_args(argv)
+
+    paths = collect_paths(args.paths)
+    if not paths:
+        print("没有找到录像文件")
+        return 1
+
+    columns, failed = analyze_season(paths, args.jobs)
+    for path, error in failed:
+        print(f"{path}: 无法统计 - {error}")
+    for path in export(columns, args.out):
+        print(f"已写入 {path}")
+    print(f"共 {len(paths)} 场比赛，{len(columns['match'])} 个环节，{len(failed)} 场失败")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,367 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""比赛录像：记录每一次计时控制操作和计时事件，事后可以重放
+
+TimerEngine 的每个控制操作（开始、暂停、自由辩论切换发言方、终止、
+重置、切换环节……）都会通知 control_listeners，录像只需记下操作名、
+参数和时间；重放时用 ManualClock 驱动一个新的引擎，在相同的时刻用
+相同的参数调用同名方法，即可重现任意时刻的完整计时状态。计时事件
+（提醒、时间到、一方用完、环节结束）也一并记录，用于核对重放结果。
+
+文件格式（每场比赛一个 .dbr 文件）:
+    MAGIC
+    varint 长度 + 元数据 JSON（开始时间、配置）
+    若干条记录: varint 距上一条的微秒数, 1 字节操作码, 内容
+        控制操作: varint 长度 + 参数 JSON（无参数时长度为 0）
+        计时事件: 1 字节辩方 + varint 届时剩余秒数
+
+用法:
+    python -m match_recorder recordings/xxx.dbr             列出全部记录
+    python -m match_recorder recordings/xxx.dbr --at 12:34  重建该时刻的计时状态
+    python -m match_recorder recordings/xxx.dbr --verify    重放并核对计时事件
+
+本模块不依赖 Qt。
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+from collections import namedtuple
+
+from timer_core import (TimerEngine, ManualClock, NS_PER_SECOND, EVENT_NOTIFY, EVENT_TIMEOVER,
+                        EVENT_SIDE_FINISHED, EVENT_ROUND_FINISHED)
+from state_codec import write_uvarint, read_uvarint
+
+logger = logging.getLogger('debate_app.match_recorder')
+
+MAGIC = b'DBREC\x01'
+RECORDING_EXTENSION = '.dbr'
+NS_PER_US = 1000
+
+# 操作码：控制操作从 1 开始，'config' 表示比赛中途应用了新的配置
+CONTROL_ACTIONS = ('set_current_round', 'update_round_info', 'set_duration', 'reset', 'start',
+                   'resume', 'pause', 'toggle', 'toggle_side', 'stop', 'terminate', 'restore',
+                   'config')
+CONTROL_OPCODES = {action: i + 1 for i, action in enumerate(CONTROL_ACTIONS)}
+# 计时事件的操作码从 0x40 开始
+EVENT_KINDS = (EVENT_NOTIFY, EVENT_TIMEOVER, EVENT_SIDE_FINISHED, EVENT_ROUND_FINISHED)
+EVENT_OPCODES = {kind: 0x40 + i for i, kind in enumerate(EVENT_KINDS)}
+SIDES = (None, 'affirmative', 'negative')
+
+ControlRecord = namedtuple('ControlRecord', ['time_ns', 'action', 'args'])
+EventRecord = namedtuple('EventRecord', ['time_ns', 'kind', 'side', 'remaining'])
+Recording = namedtuple('Recording', ['path', 'meta', 'records'])
+
+
+class RecordingError(ValueError):
+    """录像文件格式错误"""
+
+
+def default_recordings_dir():
+    recordings_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), 'recordings'))
+    try:
+        os.makedirs(recordings_dir, exist_ok=True)
+    except PermissionError:
+        recordings_dir = os.path.join(tempfile.gettempdir(), 'debate_recordings')
+        os.makedirs(recordings_dir, exist_ok=True)
+    return recordings_dir
+
+
+# 录制
+class MatchRecorder:
+    """把一个计时引擎的控制操作和计时事件写入录像文件"""
+
+    def __init__(self, path, config_data, engine):
+        self.path = path
+        self.engine = engine
+        self.config_data = config_data
+        self._file = open(path, 'wb')
+        self._start_ns = engine.clock.now_ns()
+        self._last_us = 0
+
+        meta = json.dumps({'started_at': time.time(), 'config': config_data},
+                          ensure_ascii=False).encode('utf-8')
+        header = bytearray(MAGIC)
+        write_uvarint(header, len(meta))
+        header += meta
+        self._file.write(header)
+        self._file.flush()
+
+        engine.control_listeners.append(self.on_control)
+        engine.event_listeners.append(self.on_events)
+        logger.info(f"开始录制比赛: {path}")
+
+    def on_control(self, action, args):
+        payload = json.dumps(args, ensure_ascii=False).encode('utf-8') if args else b''
+        body = bytearray()
+        write_uvarint(body, len(payload))
+        body += payload
+        self._write(CONTROL_OPCODES[action], body)
+
+    def on_events(self, events):
+        for event in events:
+            opcode = EVENT_OPCODES.get(event.kind)
+            if opcode is None:
+                continue  # 走秒事件可以由重放重新产生，不记录
+            body = bytearray((SIDES.index(event.side),))
+            write_uvarint(body, event.remaining)
+            self._write(opcode, body)
+
+    def record_config(self, config_data):
+        """比赛中途应用了新的配置（热重载）"""
+        if config_data != self.config_data:
+            self.config_data = config_data
+            self.on_control('config', (config_data,))
+
+    def close(self):
+        if self.engine is None:
+            return
+        self.engine.control_listeners.remove(self.on_control)
+        self.engine.event_listeners.remove(self.on_events)
+        self.engine = None
+        self._file.close()
+        logger.info(f"比赛录制结束: {self.path}")
+
+    def _write(self, opcode, body):
+        if self._file.closed:
+            return
+        now_us = (self.engine.clock.now_ns() - self._start_ns) // NS_PER_US
+        record = bytearray()
+        write_uvarint(record, now_us - self._last_us)
+        record.append(opcode)
+        record += body
+        self._last_us = now_us
+        self._file.write(record)
+        # 只交给操作系统，不 fsync；崩溃恢复由计时日志负责
+        self._file.flush()
+
+
+class RecordingSession:
+    """每加载一场比赛开始一个新的录像文件"""
+
+    def __init__(self, engine, directory=None):
+        self.engine = engine
+        self.directory = directory or default_recordings_dir()
+        self.recorder = None
+
+    def start_match(self, config_data):
+        self.close()
+        topic = re.sub(r'[\\/:*?"<>|\s]+', '_', str(config_data.get('topic') or 'match'))[:40]
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{topic}{RECORDING_EXTENSION}"
+        try:
+            self.recorder = MatchRecorder(os.path.join(self.directory, name), config_data, self.engine)
+        except OSError as e:
+            logger.error(f"无法创建录像文件: {e}")
+
+    def config_applied(self, config_data):
+        if self.recorder is not None:
+            self.recorder.record_config(config_data)
+
+    def close(self):
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
+
+# 读取
+def read_recording(path):
+    """读取录像文件，文件末尾不完整的记录（程序崩溃时）被忽略
+
+    Raises:
+        RecordingError: 不是录像文件
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise RecordingError(f"不是比赛录像文件: {path}")
+    try:
+        length, pos = read_uvarint(data, len(MAGIC))
+        meta = json.loads(data[pos:pos + length].decode('utf-8'))
+    except ValueError as e:
+        raise RecordingError(f"录像文件头损坏: {e}")
+    pos += length
+
+    records = []
+    time_us = 0
+    while pos < len(data):
+        try:
+            delta_us, pos = read_uvarint(data, pos)
+            opcode = data[pos]
+            pos += 1
+            time_us += delta_us
+            if opcode >= 0x40:
+                side = SIDES[data[pos]]
+                remaining, pos = read_uvarint(data, pos + 1)
+                records.append(EventRecord(time_us * NS_PER_US, EVENT_KINDS[opcode - 0x40], side, remaining))
+            else:
+                if not 1 <= opcode <= len(CONTROL_ACTIONS):
+                    raise ValueError(f"未知的操作码: {opcode}")
+                length, pos = read_uvarint(data, pos)
+                if pos + length > len(data):
+                    raise IndexError
+                args = tuple(json.loads(data[pos:pos + length].decode('utf-8'))) if length else ()
+                pos += length
+                records.append(ControlRecord(time_us * NS_PER_US, CONTROL_ACTIONS[opcode - 1], args))
+        except (IndexError, ValueError):
+            logger.warning(f"录像文件末尾不完整，已读取 {len(records)} 条记录")
+            break
+    return Recording(path, meta, records)
+
+
+# 重放
+class MatchReplayer:
+    """用 ManualClock 驱动一个新的计时引擎重现录像
+
+    advance_to() 按时间顺序执行控制操作，并在每个显示秒数变化的时刻
+    poll()，产生的事件交给 on_events；seek() 往回跳转时从头重放，
+    一场比赛只有几百条记录和几千个整秒，重建任意时刻都在毫秒级。
+    """
+
+    def __init__(self, recording, apply_control=None, on_events=None):
+        self.recording = recording
+        self.controls = [r for r in recording.records if isinstance(r, ControlRecord)]
+        self.duration_ns = recording.records[-1].time_ns if recording.records else 0
+        self.clock = ManualClock()
+        self.engine = TimerEngine(self.clock)
+        self.apply_control = apply_control or self._apply_to_engine
+        self.on_events = on_events
+        self._initial = self.engine.snapshot()
+        self._rewind()
+
+    @property
+    def config(self):
+        return self._config
+
+    def _rewind(self):
+        self.engine.restore(self._initial)
+        self.engine.current_round = None
+        self._config = self.recording.meta.get('config') or {}
+        self._base_ns = self.clock.now_ns()
+        self._next = 0
+        self.position_ns = 0
+
+    def _apply_to_engine(self, action, args):
+        if action == 'config':
+            return
+        getattr(self.engine, action)(*args)
+
+    def seek(self, time_ns):
+        """跳转到录像中的指定时刻"""
+        if time_ns < self.position_ns:
+            self._rewind()
+        self.advance_to(time_ns)
+
+    def advance_to(self, time_ns):
+        """向前推进到指定时刻"""
+        time_ns = max(time_ns, self.position_ns)
+        while self._next < len(self.controls) and self.controls[self._next].time_ns <= time_ns:
+            record = self.controls[self._next]
+            self._run_clock_until(record.time_ns)
+            self._next += 1
+            if record.action == 'config':
+                self._config = record.args[0]
+            self.apply_control(record.action, record.args)
+        self._run_clock_until(time_ns)
+        self.position_ns = time_ns
+
+    def finished(self):
+        return self.position_ns >= self.duration_ns
+
+    def clock_position_ns(self):
+        """重放时钟对应的录像时刻，在 apply_control / on_events 回调中即为当前记录的时刻"""
+        return self.clock.now_ns() - self._base_ns
+
+    def _run_clock_until(self, time_ns):
+        end_ns = self._base_ns + time_ns
+        while True:
+            wait_ns = self.engine.ns_until_next_tick()
+            if wait_ns is None or self.clock.now_ns() + wait_ns > end_ns:
+                break
+            self.clock.advance_ns(wait_ns)
+            events = self.engine.poll()
+            if events and self.on_events:
+                self.on_events(events)
+        if end_ns > self.clock.now_ns():
+            self.clock.advance_ns(end_ns - self.clock.now_ns())
+
+
+def verify(recording):
+    """重放整场比赛，返回录制的计时事件与重放产生的不一致之处"""
+    replayed = []
+    replayer = MatchReplayer(recording, on_events=lambda events: replayed.extend(
+        (e.kind, e.side, e.remaining) for e in events if e.kind in EVENT_OPCODES))
+    replayer.advance_to(replayer.duration_ns)
+    recorded = [(r.kind, r.side, r.remaining) for r in recording.records if isinstance(r, EventRecord)]
+    mismatches = []
+    for i in range(max(len(recorded), len(replayed))):
+        a = recorded[i] if i < len(recorded) else None
+        b = replayed[i] if i < len(replayed) else None
+        if a != b:
+            mismatches.append((i, a, b))
+    return mismatches
+
+
+def format_time_ns(time_ns):
+    total_ms = time_ns // 1_000_000
+    minutes, ms = divmod(total_ms, 60_000)
+    return f"{minutes:02d}:{ms // 1000:02d}.{ms % 1000:03d}"
+
+
+def parse_time(text):
+    """解析 'MM:SS' 或秒数"""
+    minutes, _, seconds = text.rpartition(':')
+    return int((int(minutes or 0) * 60 + float(seconds)) * NS_PER_SECOND)
+
+
+def _describe(record):
+    """控制操作参数的简短说明"""
+    if record.action in ('set_current_round', 'update_round_info'):
+        round_data = record.args[0] if record.args else None
+        return f"{round_data.get('type', '')} {round_data.get('time', '')}秒" if round_data else ''
+    if record.action in ('config', 'restore'):
+        return ''
+    return ' '.join(str(arg) for arg in record.args)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="查看、重建和核对比赛录像")
+    parser.add_argument('path', help="录像文件")
+    parser.add_argument('--at', help="重建该时刻（MM:SS 或秒数）的计时状态")
+    parser.add_argument('--verify', action='store_true', help="重放并核对录制的计时事件")
+    args = parser.parse_args(argv)
+
+    recording = read_recording(args.path)
+    meta = recording.meta
+    started = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(meta.get('started_at', 0)))
+    print(f"辩题: {meta.get('config', {}).get('topic', '')}  开始于 {started}  共 {len(recording.records)} 条记录")
+
+    if args.at:
+        replayer = MatchReplayer(recording)
+        replayer.seek(parse_time(args.at))
+        print(f"{format_time_ns(replayer.position_ns)} 时的计时状态:")
+        for key, value in replayer.engine.get_state().items():
+            print(f"    {key}: {value}")
+    elif args.verify:
+        started = time.perf_counter()
+        mismatches = verify(recording)
+        cost_ms = (time.perf_counter() - started) * 1000
+        for i, recorded, replayed in mismatches:
+            print(f"第 {i+1} 个事件不一致: 录制 {recorded}，重放 {replayed}")
+        print(f"重放耗时 {cost_ms:.1f} 毫秒，{'全部一致' if not mismatches else f'{len(mismatches)} 处不一致'}")
+        return 1 if mismatches else 0
+    else:
+        for record in recording.records:
+            if isinstance(record, ControlRecord):
+                print(f"{format_time_ns(record.time_ns)}  {record.action} {_describe(record)}")
+            else:
+                print(f"{format_time_ns(record.time_ns)}  [{record.kind}] {record.side or ''} {record.remaining}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
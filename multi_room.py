@@ -0,0 +1,279 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""多赛场模式：一个进程同时运行多场比赛
+
+中控台同时管理 8~16 个赛场时，不再为每个赛场启动一个完整的程序。
+每个赛场只有一份配置和一个 TimerManager，所有计时器共用一个
+SharedTickScheduler；只有接了屏幕的赛场才创建 DisplayBoard 并播放
+提示音，其余赛场只占用几 KB 的计时状态。
+
+赛场列表文件（JSON）:
+    [
+        {"name": "A101", "config": "configs/a101.json", "screen": 1},
+        {"name": "A102", "config": "configs/a102.json"}
+    ]
+
+启动:
+    python main.py --rooms rooms.json
+"""
+
+import os
+import json
+import logging
+
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+                             QTableWidget, QTableWidgetItem, QPushButton, QHeaderView,
+                             QAbstractItemView, QLabel)
+from PyQt5.QtGui import QFont
+
+from config_cache import load_config
+from display_board import DisplayBoard
+from display_board.timer_manager import TimerManager
+from display_board.shared_scheduler import SharedTickScheduler
+
+logger = logging.getLogger('debate_app.multi_room')
+
+COLUMNS = ("赛场", "环节", "剩余时间", "状态")
+
+
+def load_rooms_file(path):
+    """读取赛场列表文件
+
+    Returns:
+        List[dict]: 每项包含 name、config，以及可选的 screen
+
+    Raises:
+        ValueError: 文件格式错误
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+    if not isinstance(entries, list):
+        raise ValueError("赛场列表必须是数组")
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    rooms = []
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, dict) or 'config' not in entry:
+            raise ValueError(f"第 {i+1} 个赛场缺少 config 字段")
+        screen = entry.get('screen')
+        if screen is not None and not isinstance(screen, int):
+            raise ValueError(f"第 {i+1} 个赛场的 screen 必须是整数")
+        rooms.append({
+            'name': str(entry.get('name') or f"赛场 {i+1}"),
+            # 相对路径相对于赛场列表文件
+            'config': os.path.join(base_dir, entry['config']),
+            'screen': screen,
+        })
+    return rooms
+
+
+def _format_time(seconds):
+    minutes, secs = divmod(max(0, seconds), 60)
+    return f"{minutes:02d}:{secs:02d}"
+
+
+class Room:
+    """一个赛场：配置、计时器，以及可选的显示板"""
+
+    def __init__(self, name, config_path, scheduler, screen=None):
+        self.name = name
+        self.config_path = config_path
+        self.screen = screen
+        self.config = load_config(config_path)
+        self.rounds = self.config.get_rounds()
+        self.round_labels = dict(self.config.get_round_labels())
+        self.round_index = -1
+        # 没有屏幕的赛场不发声
+        self.timer_manager = TimerManager(scheduler=scheduler, sound=screen is not None)
+        self.board = None
+
+    def attach_board(self, board):
+        """接入显示板，之后切换环节由显示板同步界面"""
+        self.board = board
+        board.set_debate_config(self.config.data)
+        board.update_debaters_info()
+
+    def start_round(self, index):
+        """开始指定环节"""
+        if not 0 <= index < len(self.rounds):
+            return False
+        self.round_index = index
+        if self.board is not None:
+            return self.board.start_round(index)
+        self.timer_manager.set_current_round(self.rounds[index])
+        return True
+
+    def toggle(self):
+        """开始或暂停，自由辩论时暂停正在发言的一方或从正方开始"""
+        manager = self.timer_manager
+        if self.round_index < 0:
+            return self.start_round(0)
+        if not manager.is_free_debate:
+            return manager.toggle_timer()
+        if manager.negative_timer_active:
+            return manager.toggle_negative_timer()
+        return manager.toggle_affirmative_timer()
+
+    def switch_side(self):
+        """自由辩论中切换发言方"""
+        manager = self.timer_manager
+        if not manager.is_free_debate:
+            return False
+        if manager.affirmative_timer_active:
+            return manager.toggle_negative_timer()
+        return manager.toggle_affirmative_timer()
+
+    def reset(self):
+        """重置当前环节"""
+        if self.round_index < 0:
+            return False
+        return self.start_round(self.round_index)
+
+    def round_text(self):
+        if self.round_index < 0:
+            return "未开始"
+        label = self.round_labels.get(self.round_index, "")
+        return f"{self.round_index+1}/{len(self.rounds)} {label}".strip()
+
+    def time_text(self):
+        manager = self.timer_manager
+        if self.round_index < 0:
+            return "--:--"
+        if manager.is_free_debate:
+            return f"正 {_format_time(manager.affirmative_time)}  反 {_format_time(manager.negative_time)}"
+        return _format_time(manager.current_time)
+
+    def state_text(self):
+        manager = self.timer_manager
+        if self.round_index < 0:
+            return "等待"
+        if manager.affirmative_timer_active:
+            return "正方发言"
+        if manager.negative_timer_active:
+            return "反方发言"
+        if manager.timer_active:
+            return "计时中"
+        return "暂停"
+
+    def close(self):
+        scheduler = self.timer_manager.scheduler
+        self.timer_manager.stop()
+        if scheduler is not None:
+            scheduler.unregister(self.timer_manager)
+        if self.board is not None:
+            self.board.close()
+
+
+class MultiRoomWindow(QMainWindow):
+    """中控台：一张表显示全部赛场状态，对选中的赛场进行操作"""
+
+    def __init__(self, room_entries, low_performance_mode=False):
+        super().__init__()
+        logger.info(f"MultiRoomWindow 初始化，共 {len(room_entries)} 个赛场")
+        self.low_performance_mode = low_performance_mode
+        self.scheduler = SharedTickScheduler(self)
+        self.rooms = []
+        for entry in room_entries:
+            try:
+                self.rooms.append(Room(entry['name'], entry['config'], self.scheduler, entry.get('screen')))
+            except Exception as e:
+                logger.error(f"加载赛场 {entry['name']} 失败: {e}", exc_info=True)
+        self.initUI()
+        self._create_boards()
+
+        for row, room in enumerate(self.rooms):
+            room.timer_manager.timeUpdated.connect(lambda row=row: self._update_row(row))
+            room.timer_manager.runningChanged.connect(lambda _, row=row: self._update_row(row))
+            self._update_row(row)
+
+    def initUI(self):
+        self.setWindowTitle("多赛场控制台")
+        self.setGeometry(100, 100, 900, 600)
+
+        central_widget = QWidget(self)
+        self.setCentralWidget(central_widget)
+        layout = QVBoxLayout(central_widget)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(12)
+
+        title_label = QLabel("多赛场控制台")
+        title_label.setFont(QFont("微软雅黑", 16, QFont.Bold))
+        title_label.setStyleSheet("color: #0078D4;")
+        layout.addWidget(title_label)
+
+        self.table = QTableWidget(len(self.rooms), len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.setFont(QFont("微软雅黑", 11))
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        for row, room in enumerate(self.rooms):
+            for column in range(len(COLUMNS)):
+                self.table.setItem(row, column, QTableWidgetItem())
+            name = room.name if room.screen is None else f"{room.name}（屏幕 {room.screen}）"
+            self.table.item(row, 0).setText(name)
+        if self.rooms:
+            self.table.selectRow(0)
+        layout.addWidget(self.table, 1)
+
+        button_layout = QHBoxLayout()
+        for text, handler in (("开始/暂停", Room.toggle),
+                              ("切换发言方", Room.switch_side),
+                              ("上一环节", self._previous_round),
+                              ("下一环节", self._next_round),
+                              ("重置环节", Room.reset)):
+            button = QPushButton(text)
+            button.setFont(QFont("微软雅黑", 11))
+            button.clicked.connect(lambda _, handler=handler: self._apply_to_selected(handler))
+            button_layout.addWidget(button)
+        layout.addLayout(button_layout)
+
+    def _create_boards(self):
+        """只为接了屏幕的赛场创建显示板，全屏显示在对应屏幕上"""
+        screens = QApplication.screens()
+        for room in self.rooms:
+            if room.screen is None:
+                continue
+            if not 0 <= room.screen < len(screens):
+                logger.warning(f"赛场 {room.name} 的屏幕 {room.screen} 不存在，不创建显示板")
+                continue
+            board = DisplayBoard(low_performance_mode=self.low_performance_mode,
+                                 timer_manager=room.timer_manager)
+            room.attach_board(board)
+            board.setGeometry(screens[room.screen].geometry())
+            board.showFullScreen()
+            board.is_fullscreen = True
+            logger.info(f"赛场 {room.name} 的显示板已显示在屏幕 {room.screen}")
+
+    def selected_room(self):
+        row = self.table.currentRow()
+        return self.rooms[row] if 0 <= row < len(self.rooms) else None
+
+    def _apply_to_selected(self, handler):
+        room = self.selected_room()
+        if room is None:
+            return
+        try:
+            handler(room)
+        except Exception as e:
+            logger.error(f"操作赛场 {room.name} 时出错: {e}", exc_info=True)
+        self._update_row(self.rooms.index(room))
+
+    def _previous_round(self, room):
+        return room.start_round(room.round_index - 1)
+
+    def _next_round(self, room):
+        return room.start_round(room.round_index + 1)
+
+    def _update_row(self, row):
+        room = self.rooms[row]
+        self.table.item(row, 1).setText(room.round_text())
+        self.table.item(row, 2).setText(room.time_text())
+        self.table.item(row, 3).setText(room.state_text())
+
+    def closeEvent(self, event):
+        for room in self.rooms:
+            room.close()
+        super().closeEvent(event)
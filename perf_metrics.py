@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""运行时性能指标
+
+显示板的计时、刷新和绘制路径在关键位置记录耗时和次数，供调试叠加层
+（显示板上按 F12）显示。记录点统一写成
+
+    if metrics.enabled:
+        metrics.sample('name', duration_ns)
+
+关闭时只多一次属性读取，不调用计时函数也不分配对象；叠加层打开时才
+开启记录。
+
+指标分三类:
+    sample  耗时或间隔（纳秒），保留最近 SAMPLE_WINDOW 个值，汇总为均值、P95、最大值
+    count   次数，按两次读取之间的时间换算为每秒次数
+    gauge   当前值（如常驻内存）
+
+本模块不依赖 Qt。
+"""
+
+import os
+import sys
+import time
+from collections import deque
+
+# 每个耗时指标保留的最近样本数
+SAMPLE_WINDOW = 240
+
+
+class _Samples:
+    def __init__(self):
+        self.values = deque(maxlen=SAMPLE_WINDOW)
+        self.total = 0
+
+    def summary(self):
+        values = sorted(self.values)
+        if not values:
+            return {'count': self.total, 'last': None, 'mean': None, 'p95': None, 'max': None}
+        return {
+            'count': self.total,
+            'last': self.values[-1],
+            'mean': sum(values) / len(values),
+            'p95': values[min(len(values) - 1, int(len(values) * 0.95))],
+            'max': values[-1],
+        }
+
+
+class MetricsRegistry:
+    """进程内的指标登记处，默认关闭"""
+
+    def __init__(self):
+        self.enabled = False
+        self._samples = {}
+        self._counts = {}
+        self._gauges = {}
+        self._rates = {}
+        self._rate_started_ns = time.monotonic_ns()
+
+    def enable(self, enabled=True):
+        if enabled and not self.enabled:
+            self.reset()
+        self.enabled = enabled
+
+    def reset(self):
+        self._samples.clear()
+        self._counts.clear()
+        self._gauges.clear()
+        self._rates.clear()
+        self._rate_started_ns = time.monotonic_ns()
+
+    def sample(self, name, value_ns):
+        if not self.enabled:
+            return
+        samples = self._samples.get(name)
+        if samples is None:
+            samples = self._samples[name] = _Samples()
+        samples.values.append(value_ns)
+        samples.total += 1
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self._counts[name] = self._counts.get(name, 0) + n
+
+    def gauge(self, name, value):
+        if self.enabled:
+            self._gauges[name] = value
+
+    def roll_rates(self):
+        """把上次调用以来的次数换算为每秒次数，由叠加层定期调用"""
+        now = time.monotonic_ns()
+        elapsed = (now - self._rate_started_ns) / 1e9
+        if elapsed > 0:
+            self._rates = {name: n / elapsed for name, n in self._counts.items()}
+        self._counts = {}
+        self._rate_started_ns = now
+        return self._rates
+
+    def snapshot(self):
+        """当前全部指标: {'samples': {名称: 汇总}, 'rates': {名称: 每秒次数}, 'gauges': {名称: 值}}"""
+        return {
+            'samples': {name: samples.summary() for name, samples in self._samples.items()},
+            'rates': dict(self._rates),
+            'gauges': dict(self._gauges),
+        }
+
+
+def current_rss_bytes():
+    """当前进程的常驻内存，取不到时返回None"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    except Exception:
+        return None
+    try:
+        if sys.platform.startswith('linux'):
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+# 进程内唯一的指标登记处
+metrics = MetricsRegistry()
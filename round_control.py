@@ -6,6 +6,11 @@ from PyQt5.QtWidgets import (QWidget, QLabel, QVBoxLayout, QHBoxLayout,
 from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QObject
 from PyQt5.QtGui import QFont, QColor
 
+from timer_core import DeadlineCountdown, NS_PER_MS
+
+# 计时器在整秒边界之后稍作延迟再触发，避免因调度误差落在边界之前
+TICK_SLACK_MS = 2
+
 # 回合数据类 - 用于储存各回合信息
 class RoundData:
     def __init__(self, title, speaker, duration):
@@ -46,13 +51,27 @@ class RoundController(QWidget):
         self.current_round_index = 0
         self.rounds = STANDARD_DEBATE_ROUNDS
         self.timer_active = False
-        self.remaining_time = 0
+        self.countdown = DeadlineCountdown()
+        self._last_displayed_time = 0
         
+        # 剩余时间由截止时间推算，计时器只在显示秒数变化时触发重绘
         self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.PreciseTimer)
         self.timer.timeout.connect(self.update_time)
         
         self.init_ui()
     
+    @property
+    def remaining_time(self):
+        """剩余秒数"""
+        return self.countdown.remaining_seconds()
+    
+    @remaining_time.setter
+    def remaining_time(self, value):
+        self.countdown.set_remaining(value)
+        self._last_displayed_time = self.countdown.remaining_seconds()
+    
     def init_ui(self):
         # 主布局
         main_layout = QVBoxLayout(self)
@@ -162,34 +181,47 @@ class RoundController(QWidget):
         if self.timer_active:
             # 暂停计时
             self.timer.stop()
+            self.countdown.pause()
             self.timer_active = False
             self.toggle_button.setText("继续")
             self.signals.pause_timer_signal.emit()
         else:
             # 开始计时
-            self.timer.start(1000)
+            self.countdown.start()
             self.timer_active = True
+            self._schedule_next_tick()
             self.toggle_button.setText("暂停")
             self.signals.start_timer_signal.emit()
     
     def reset_timer(self):
         """重置计时器"""
         self.timer.stop()
+        self.countdown.pause()
         self.timer_active = False
         self.toggle_button.setText("开始")
         self.remaining_time = self.rounds[self.current_round_index].duration
         self.update_time_display()
         self.signals.reset_timer_signal.emit()
     
+    def _schedule_next_tick(self):
+        """把下一次触发安排在显示秒数变化之后"""
+        wait_ns = self.countdown.ns_until_next_second()
+        self.timer.start(-(-wait_ns // NS_PER_MS) + TICK_SLACK_MS)
+    
     def update_time(self):
         """更新计时器"""
-        if self.remaining_time > 0:
-            self.remaining_time -= 1
+        remaining = self.remaining_time
+        if remaining != self._last_displayed_time:
+            self._last_displayed_time = remaining
             self.update_time_display()
-            self.signals.time_update_signal.emit(self.remaining_time)
+            self.signals.time_update_signal.emit(remaining)
+        
+        if remaining > 0:
+            self._schedule_next_tick()
         else:
             # 回合结束
             self.timer.stop()
+            self.countdown.pause()
             self.timer_active = False
             self.toggle_button.setText("开始")
             self.signals.round_finished_signal.emit()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""控制面板的回合列表：QAbstractListModel + QListView
+
+模型直接引用 DebateConfig 的回合数据，显示文字在视图第一次请求某一行时
+才生成并缓存；热重载时逐行比较新旧回合，只让内容变化的行失效，连续的
+变化行合并为一次 dataChanged，回合数量变化时只在末尾插入或删除行。
+几百个环节的训练场次加载和热重载都不会逐行创建列表项。
+
+RoundsListView 保留了控制面板和 main.py 用到的 QListWidget 接口：
+count()、currentRow()、setCurrentRow()、currentRowChanged、item(i).text()、clear()。
+"""
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, pyqtSignal
+from PyQt5.QtWidgets import QListView
+
+from config_manager import is_listed_round, round_label
+
+
+class RoundsListModel(QAbstractListModel):
+    """回合列表模型，每行对应一个可显示的回合"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rounds = []  # 每行的 (回合索引, 回合数据)
+        self._labels = {}  # 已生成的显示文字
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rounds)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._rounds):
+            return None
+        if role == Qt.DisplayRole:
+            return self.label(index.row())
+        if role == Qt.ToolTipRole:
+            return self._rounds[index.row()][1].get('description') or None
+        return None
+
+    def label(self, row):
+        text = self._labels.get(row)
+        if text is None:
+            index, round_info = self._rounds[row]
+            text = self._labels[row] = round_label(index, round_info)
+        return text
+
+    def round_index(self, row):
+        """行对应的回合在配置中的索引，行号无效时返回 -1
+
+        信息不全的回合不显示，行号和配置中的索引可能不同。
+        """
+        return self._rounds[row][0] if 0 <= row < len(self._rounds) else -1
+
+    def row_of(self, round_index):
+        """配置中的回合索引对应的行，回合不在列表中时返回 -1"""
+        for row, (index, _round_info) in enumerate(self._rounds):
+            if index == round_index:
+                return row
+        return -1
+
+    def clear(self):
+        if self._rounds:
+            self.beginResetModel()
+            self._rounds = []
+            self._labels = {}
+            self.endResetModel()
+
+    def set_config(self, config):
+        """加载新的配置，重建整个列表"""
+        self.beginResetModel()
+        self._rounds = self._listed_rounds(config)
+        self._labels = {}
+        self.endResetModel()
+
+    def update_config(self, config):
+        """热重载：只让变化的行失效，回合数量变化时在末尾插入或删除行"""
+        new_rounds = self._listed_rounds(config)
+        old_count, new_count = len(self._rounds), len(new_rounds)
+
+        if new_count < old_count:
+            self.beginRemoveRows(QModelIndex(), new_count, old_count - 1)
+            del self._rounds[new_count:]
+            for row in range(new_count, old_count):
+                self._labels.pop(row, None)
+            self.endRemoveRows()
+
+        changed = [row for row in range(min(old_count, new_count)) if self._rounds[row] != new_rounds[row]]
+        self._rounds[:len(self._rounds)] = new_rounds[:len(self._rounds)]
+        for row in changed:
+            self._labels.pop(row, None)
+        for first, last in _contiguous_ranges(changed):
+            self.dataChanged.emit(self.index(first), self.index(last), [Qt.DisplayRole, Qt.ToolTipRole])
+
+        if new_count > old_count:
+            self.beginInsertRows(QModelIndex(), old_count, new_count - 1)
+            self._rounds.extend(new_rounds[old_count:])
+            self.endInsertRows()
+        return changed
+
+    @staticmethod
+    def _listed_rounds(config):
+        return [(index, round_info) for index, round_info in enumerate(config.get_rounds())
+                if is_listed_round(round_info)]
+
+
+def _contiguous_ranges(rows):
+    """把有序的行号合并为 (首行, 末行) 区间"""
+    ranges = []
+    for row in rows:
+        if ranges and ranges[-1][1] == row - 1:
+            ranges[-1][1] = row
+        else:
+            ranges.append([row, row])
+    return ranges
+
+
+class _RowItem:
+    """item(i) 返回的只读列表项，兼容 QListWidgetItem.text()"""
+
+    def __init__(self, model, row):
+        self._model = model
+        self._row = row
+
+    def text(self):
+        return self._model.label(self._row)
+
+
+class RoundsListView(QListView):
+    """显示 RoundsListModel 的列表，接口与控制面板原来使用的 QListWidget 一致"""
+
+    currentRowChanged = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # 每行高度相同，滚动和布局不需要测量每一行
+        self.setUniformItemSizes(True)
+        self.setModel(RoundsListModel(self))
+        self.selectionModel().currentRowChanged.connect(
+            lambda current, _previous: self.currentRowChanged.emit(current.row()))
+
+    def count(self):
+        return self.model().rowCount()
+
+    def currentRow(self):
+        return self.currentIndex().row()
+
+    def setCurrentRow(self, row):
+        if 0 <= row < self.count():
+            self.setCurrentIndex(self.model().index(row))
+        else:
+            self.selectionModel().clearCurrentIndex()
+
+    def item(self, row):
+        return _RowItem(self.model(), row) if 0 <= row < self.count() else None
+
+    def clear(self):
+        self.model().clear()
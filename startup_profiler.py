@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""启动耗时分析
+
+main.py 最先导入本模块，随后各启动阶段用 profiler.phase() 记录耗时。
+记录本身只有几次 perf_counter 调用，始终开启；只有 --profile-startup
+时才在首帧绘制之后输出报告。本模块不依赖 Qt，导入开销可以忽略。
+"""
+
+import sys
+import json
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """记录启动各阶段的耗时和里程碑"""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.phases = []  # (阶段名, 开始偏移秒, 耗时秒)
+        self.marks = {}  # 里程碑名 -> 偏移秒
+        self._first_paint_filter = None
+
+    def elapsed(self):
+        """距离启动的秒数"""
+        return time.perf_counter() - self.origin
+
+    @contextmanager
+    def phase(self, name):
+        """记录一个阶段的耗时"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started, time.perf_counter())
+
+    def record(self, name, started, finished):
+        self.phases.append((name, started - self.origin, finished - started))
+
+    def mark(self, name):
+        """记录里程碑（只记第一次）"""
+        self.marks.setdefault(name, self.elapsed())
+
+    def watch_first_paint(self, widget, callback=None):
+        """在控件第一次绘制完成时记录 'first_paint' 里程碑
+
+        Args:
+            widget: 要观察的窗口
+            callback: 首帧之后调用的函数，参数为本对象
+        """
+        from PyQt5.QtCore import QObject, QEvent, QTimer
+
+        profiler = self
+
+        class FirstPaintFilter(QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QEvent.Paint:
+                    obj.removeEventFilter(self)
+                    # 绘制事件处理完之后再记录
+                    QTimer.singleShot(0, self.finish)
+                return False
+
+            def finish(self):
+                profiler.mark('first_paint')
+                profiler._first_paint_filter = None
+                if callback is not None:
+                    callback(profiler)
+
+        self._first_paint_filter = FirstPaintFilter(widget)
+        widget.installEventFilter(self._first_paint_filter)
+
+    def report(self):
+        """生成文本报告"""
+        lines = ["启动耗时分析:"]
+        for name, offset, duration in self.phases:
+            lines.append(f"  {name:<28} {duration*1000:8.1f} ms  (开始于 {offset*1000:.1f} ms)")
+        for name, offset in sorted(self.marks.items(), key=lambda item: item[1]):
+            lines.append(f"  [{name}] {offset*1000:.1f} ms")
+        return "\n".join(lines)
+
+    def to_dict(self):
+        return {
+            'phases': [{'name': name, 'start_ms': offset * 1000, 'duration_ms': duration * 1000}
+                       for name, offset, duration in self.phases],
+            'marks': {name: offset * 1000 for name, offset in self.marks.items()},
+        }
+
+    def write_report(self, path):
+        """把报告写成 JSON，供 build.py 的启动基准测试读取
+
+        wall_time 为写入时的系统时间，基准测试用它和启动进程的时刻相减，
+        得到包含解释器启动在内的首帧时间。
+        """
+        data = self.to_dict()
+        data['wall_time'] = time.time()
+        data['peak_rss_bytes'] = peak_rss_bytes()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+
+def peak_rss_bytes():
+    """当前进程的峰值常驻内存，取不到时返回None"""
+    try:
+        if sys.platform == 'win32':
+            import psutil
+            return psutil.Process().memory_info().peak_wset
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux 以 KB 为单位，macOS 以字节为单位
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except Exception:
+        return None
+
+
+# 进程内唯一的分析器
+profiler = StartupProfiler()
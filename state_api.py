@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""本地 HTTP / WebSocket 状态接口，供直播叠加层和记分牌读取
+
+服务器在独立线程的 asyncio 事件循环中运行，GUI 线程只在状态变化时调用
+publish() 把一个字典交给事件循环，序列化和发送都不占用 GUI 线程。
+
+接口:
+    GET /state              当前状态（JSON）
+    GET /state?since=N      长轮询：版本号大于 N 时立即返回，否则最多等待 25 秒
+    GET /ws                 WebSocket，连接后先推送当前状态，之后每次变化推送一次
+
+每个 WebSocket 客户端有一个容量有限的队列，满了就丢弃最旧的状态，
+读取缓慢的客户端只会错过中间状态，不会拖慢其他客户端或计时器。
+
+本模块不依赖 Qt。
+"""
+
+import json
+import base64
+import asyncio
+import hashlib
+import logging
+import threading
+from urllib.parse import urlsplit, parse_qs
+
+logger = logging.getLogger('debate_app.state_api')
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+# 每个 WebSocket 客户端最多积压的状态数
+CLIENT_QUEUE_SIZE = 8
+# 长轮询最长等待时间
+LONG_POLL_SECONDS = 25
+# 读取请求头的超时时间与大小上限
+REQUEST_TIMEOUT_SECONDS = 10
+MAX_HEADER_BYTES = 8192
+
+_WEBSOCKET_GUID = b'258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+_OPCODE_TEXT = 0x1
+_OPCODE_CLOSE = 0x8
+_OPCODE_PING = 0x9
+_OPCODE_PONG = 0xA
+
+_STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed'}
+
+
+def board_state(display_board):
+    """从显示板采集对外公开的状态，在 GUI 线程中调用"""
+    index = display_board.current_round_index
+    rounds = display_board.rounds
+    return {
+        'timer': display_board.timer_manager.get_timer_state(),
+        'round_index': index,
+        'round_count': len(rounds),
+        'round': rounds[index] if 0 <= index < len(rounds) else None,
+        'topic': display_board.topic,
+        'debater_roles': display_board.debater_roles,
+    }
+
+
+def attach(display_board, server):
+    """显示板状态变化时自动发布到服务器"""
+    def publish(*_):
+        try:
+            server.publish(board_state(display_board))
+        except Exception as e:
+            logger.error(f"发布状态时出错: {e}", exc_info=True)
+
+    display_board.timer_manager.stateChanged.connect(publish)
+    display_board.roundChanged.connect(publish)
+    display_board.configApplied.connect(publish)
+    publish()
+
+
+class StateApiServer:
+    """在后台线程中运行的 HTTP / WebSocket 状态服务器"""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, queue_size=CLIENT_QUEUE_SIZE):
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self.version = 0
+        self._state = None
+        self._payload = b'{"version": 0}'
+        self._clients = set()  # 每个 WebSocket 客户端的队列
+        self._writers = set()  # 所有打开的连接
+        self._changed = None  # 长轮询等待的事件，每次发布后替换
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._error = None
+
+    # GUI 线程
+    def start(self):
+        """启动后台线程并等待监听成功，失败返回False"""
+        self._thread = threading.Thread(target=self._run, name='state-api', daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error:
+            logger.error(f"状态接口无法监听 {self.host}:{self.port}: {self._error}")
+            return False
+        logger.info(f"状态接口已启动: http://{self.host}:{self.port}/state")
+        return True
+
+    def stop(self):
+        if self._loop and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(2)
+
+    def publish(self, state):
+        """发布新状态，可以在任意线程调用；state 只能包含 JSON 基本类型"""
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(self._on_publish, state)
+
+    # 事件循环线程
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            self._changed = asyncio.Event()
+            self._server = loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port))
+        except Exception as e:
+            self._error = e
+            self._ready.set()
+            loop.close()
+            return
+        self._loop = loop
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            self._server.close()
+            # 关闭仍然打开的连接，让等待中的请求自行结束
+            for writer in list(self._writers):
+                writer.close()
+            self._changed.set()
+            pending = asyncio.all_tasks(loop)
+            if pending:
+                loop.run_until_complete(asyncio.wait(pending, timeout=1))
+            loop.close()
+
+    def _on_publish(self, state):
+        if state == self._state:
+            return
+        self._state = state
+        self.version += 1
+        self._payload = json.dumps(dict(state, version=self.version), ensure_ascii=False).encode('utf-8')
+
+        for queue in self._clients:
+            if queue.full():
+                queue.get_nowait()  # 丢弃最旧的状态
+            queue.put_nowait(self._payload)
+
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def _handle(self, reader, writer):
+        self._writers.add(writer)
+        try:
+            request = await asyncio.wait_for(self._read_request(reader), REQUEST_TIMEOUT_SECONDS)
+            if request is None:
+                return await self._respond(writer, 400, b'')
+            method, target, headers = request
+            url = urlsplit(target)
+
+            if method != 'GET':
+                await self._respond(writer, 405, b'')
+            elif url.path == '/ws' and headers.get('upgrade', '').lower() == 'websocket':
+                await self._websocket(reader, writer, headers)
+            elif url.path in ('/', '/state'):
+                await self._long_poll(writer, parse_qs(url.query))
+            else:
+                await self._respond(writer, 404, b'')
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        except Exception as e:
+            logger.error(f"处理状态接口请求时出错: {e}", exc_info=True)
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _read_request(self, reader):
+        """读取请求行和请求头，格式错误返回None"""
+        raw = await reader.readuntil(b'\r\n\r\n')
+        if len(raw) > MAX_HEADER_BYTES:
+            return None
+        lines = raw.decode('latin-1').split('\r\n')
+        parts = lines[0].split()
+        if len(parts) != 3:
+            return None
+        headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(':')
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+        return parts[0], parts[1], headers
+
+    async def _respond(self, writer, status, body, content_type='application/json; charset=utf-8'):
+        head = (f"HTTP/1.1 {status} {_STATUS_TEXT.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Access-Control-Allow-Origin: *\r\n"
+                "Cache-Control: no-store\r\n"
+                "Connection: close\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    async def _long_poll(self, writer, query):
+        try:
+            since = int(query['since'][0]) if 'since' in query else None
+        except ValueError:
+            return await self._respond(writer, 400, b'')
+        if since is not None and since >= self.version:
+            try:
+                await asyncio.wait_for(self._changed.wait(), LONG_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass  # 超时返回当前状态，客户端用同一个版本号再次请求
+        await self._respond(writer, 200, self._payload)
+
+    async def _websocket(self, reader, writer, headers):
+        key = headers.get('sec-websocket-key')
+        if not key:
+            return await self._respond(writer, 400, b'')
+        accept = base64.b64encode(hashlib.sha1(key.encode('latin-1') + _WEBSOCKET_GUID).digest())
+        writer.write(b"HTTP/1.1 101 Switching Protocols\r\n"
+                     b"Upgrade: websocket\r\n"
+                     b"Connection: Upgrade\r\n"
+                     b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n")
+
+        queue = asyncio.Queue(self.queue_size)
+        queue.put_nowait(self._payload)
+        self._clients.add(queue)
+        sender = asyncio.ensure_future(self._ws_sender(writer, queue))
+        try:
+            await self._ws_reader(reader, writer)
+        finally:
+            self._clients.discard(queue)
+            sender.cancel()
+
+    async def _ws_sender(self, writer, queue):
+        while True:
+            payload = await queue.get()
+            writer.write(_ws_frame(_OPCODE_TEXT, payload))
+            await writer.drain()
+
+    async def _ws_reader(self, reader, writer):
+        """处理客户端发来的控制帧，收到关闭帧或连接断开时返回"""
+        while True:
+            head = await reader.readexactly(2)
+            opcode = head[0] & 0x0F
+            length = head[1] & 0x7F
+            if length == 126:
+                length = int.from_bytes(await reader.readexactly(2), 'big')
+            elif length == 127:
+                length = int.from_bytes(await reader.readexactly(8), 'big')
+            if length > MAX_HEADER_BYTES:
+                return
+            mask = await reader.readexactly(4) if head[1] & 0x80 else None
+            payload = await reader.readexactly(length)
+            if mask:
+                payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+
+            if opcode == _OPCODE_CLOSE:
+                writer.write(_ws_frame(_OPCODE_CLOSE, payload[:2]))
+                return
+            if opcode == _OPCODE_PING:
+                writer.write(_ws_frame(_OPCODE_PONG, payload))
+
+
+def _ws_frame(opcode, payload):
+    """服务器发出的帧不加掩码"""
+    length = len(payload)
+    if length < 126:
+        head = bytes((0x80 | opcode, length))
+    elif length < 1 << 16:
+        head = bytes((0x80 | opcode, 126)) + length.to_bytes(2, 'big')
+    else:
+        head = bytes((0x80 | opcode, 127)) + length.to_bytes(8, 'big')
+    return head + payload
@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""显示板状态广播的帧格式
+
+操作端把计时状态、当前环节序号和配置版本编码成紧凑的二进制帧，通过
+TCP 发给任意数量的镜像显示板。每一帧前面是 varint 长度，帧内容：
+
+- 'K' 关键帧：序号 + 全部字段的绝对值，客户端连接时发送一次；
+- 'D' 增量帧：序号 + 变化字段的位掩码 + 各变化字段与上一帧的差值；
+- 'C' 配置帧：配置版本 + zlib 压缩的配置 JSON，只在配置变化时发送。
+
+整数一律用 zigzag varint 编码。计时运行时每秒通常只有剩余毫秒数一个
+字段变化（差值约为 -1000），一帧只有 6 个字节左右。TCP 保证按序送达，
+增量帧不会丢失，因此除了连接时之外不需要重发关键帧。
+
+本模块不依赖 Qt。
+"""
+
+import json
+import zlib
+import hashlib
+
+from timer_core import NS_PER_MS
+
+# 状态字段，顺序即增量帧位掩码的位序
+FIELDS = ('round_index', 'config_version', 'total_time',
+          'standard_ms', 'affirmative_ms', 'negative_ms', 'flags')
+
+# flags 字段的各位
+FLAG_TIMER_ACTIVE = 1
+FLAG_AFFIRMATIVE_ACTIVE = 2
+FLAG_NEGATIVE_ACTIVE = 4
+FLAG_FREE_DEBATE = 8
+ACTIVE_FLAGS = FLAG_TIMER_ACTIVE | FLAG_AFFIRMATIVE_ACTIVE | FLAG_NEGATIVE_ACTIVE
+
+FRAME_KEY = b'K'
+FRAME_DELTA = b'D'
+FRAME_CONFIG = b'C'
+
+# 单帧长度上限，超过即认为数据流已损坏
+MAX_FRAME_BYTES = 1 << 20
+
+
+class FrameError(ValueError):
+    """帧格式错误"""
+
+
+# varint，录像文件也使用同样的编码
+def write_uvarint(out, value):
+    """把无符号整数追加到 bytearray"""
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def write_varint(out, value):
+    """zigzag 编码的有符号整数"""
+    write_uvarint(out, value << 1 if value >= 0 else ((-value) << 1) - 1)
+
+
+def read_uvarint(data, pos):
+    """从 pos 处读取无符号整数，返回 (值, 新位置)"""
+    result = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise FrameError("varint 不完整")
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+        if shift > 70:
+            raise FrameError("varint 过长")
+
+
+def read_varint(data, pos):
+    value, pos = read_uvarint(data, pos)
+    return (value >> 1) ^ -(value & 1), pos
+
+
+def _frame(body):
+    out = bytearray()
+    write_uvarint(out, len(body))
+    out += body
+    return bytes(out)
+
+
+# 状态
+def config_version(config_data):
+    """配置内容的 32 位版本号"""
+    raw = json.dumps(config_data, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(raw, digest_size=4).digest(), 'big')
+
+
+def capture_state(engine, round_index, version):
+    """从计时引擎采集一帧状态
+
+    Returns:
+        tuple: 按 FIELDS 顺序排列的整数
+    """
+    flags = ((FLAG_TIMER_ACTIVE if engine.timer_active else 0)
+             | (FLAG_AFFIRMATIVE_ACTIVE if engine.affirmative_timer_active else 0)
+             | (FLAG_NEGATIVE_ACTIVE if engine.negative_timer_active else 0)
+             | (FLAG_FREE_DEBATE if engine.is_free_debate else 0))
+    return (round_index, version, engine.total_time,
+            engine.remaining_ns() // NS_PER_MS,
+            engine.remaining_ns('affirmative') // NS_PER_MS,
+            engine.remaining_ns('negative') // NS_PER_MS,
+            flags)
+
+
+def state_to_snapshot(state, engine=None):
+    """把一帧状态转换为 TimerEngine.restore 接受的字典
+
+    给出本地引擎时，本地仍在运行、对方已经在 0 秒停止的倒计时保持运行，
+    由本地下一次 poll() 产生时间到和环节结束事件，而不是被直接暂停。
+    """
+    values = dict(zip(FIELDS, state))
+    flags = values['flags']
+    snapshot = {
+        'total_time': values['total_time'],
+        'is_free_debate': bool(flags & FLAG_FREE_DEBATE),
+        'timer_active': bool(flags & FLAG_TIMER_ACTIVE),
+        'affirmative_timer_active': bool(flags & FLAG_AFFIRMATIVE_ACTIVE),
+        'negative_timer_active': bool(flags & FLAG_NEGATIVE_ACTIVE),
+        'standard_ns': values['standard_ms'] * NS_PER_MS,
+        'affirmative_ns': values['affirmative_ms'] * NS_PER_MS,
+        'negative_ns': values['negative_ms'] * NS_PER_MS,
+    }
+    if engine is not None and not (flags & ACTIVE_FLAGS):
+        for active_key, remaining_key in (('timer_active', 'standard_ns'),
+                                          ('affirmative_timer_active', 'affirmative_ns'),
+                                          ('negative_timer_active', 'negative_ns')):
+            if getattr(engine, active_key) and snapshot[remaining_key] == 0:
+                snapshot[active_key] = True
+    return snapshot
+
+
+# 编码
+class StateEncoder:
+    """按连接维护上一帧状态，生成关键帧和增量帧"""
+
+    def __init__(self):
+        self.sequence = 0
+        self.last_state = None
+
+    def keyframe(self, state):
+        body = bytearray(FRAME_KEY)
+        write_uvarint(body, self.sequence)
+        for value in state:
+            write_varint(body, value)
+        self.sequence += 1
+        self.last_state = tuple(state)
+        return _frame(body)
+
+    def encode(self, state):
+        """编码与上一帧的差异，没有变化时返回None，还没有发过关键帧时发关键帧"""
+        if self.last_state is None:
+            return self.keyframe(state)
+        state = tuple(state)
+        if state == self.last_state:
+            return None
+
+        mask = 0
+        deltas = bytearray()
+        for i, (old, new) in enumerate(zip(self.last_state, state)):
+            if old != new:
+                mask |= 1 << i
+                write_varint(deltas, new - old)
+
+        body = bytearray(FRAME_DELTA)
+        write_uvarint(body, self.sequence)
+        write_uvarint(body, mask)
+        body += deltas
+        self.sequence += 1
+        self.last_state = state
+        return _frame(body)
+
+
+def encode_config(version, config_data):
+    """编码配置帧"""
+    body = bytearray(FRAME_CONFIG)
+    write_uvarint(body, version)
+    body += zlib.compress(json.dumps(config_data, ensure_ascii=False).encode('utf-8'))
+    return _frame(body)
+
+
+# 解码
+class StateDecoder:
+    """把字节流还原为消息，可以分多次喂入任意长度的数据"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.state = None
+        self.sequence = None
+
+    def feed(self, data):
+        """喂入收到的字节
+
+        Returns:
+            List[tuple]: ('state', 状态元组) 或 ('config', 版本, 配置字典)
+
+        Raises:
+            FrameError: 数据流损坏，调用方应断开重连
+        """
+        self.buffer += data
+        messages = []
+        while self.buffer:
+            try:
+                length, pos = read_uvarint(self.buffer, 0)
+            except FrameError:
+                if len(self.buffer) > 10:
+                    raise
+                break  # 长度前缀还没收全
+            if length > MAX_FRAME_BYTES:
+                raise FrameError(f"帧长度异常: {length}")
+            if len(self.buffer) < pos + length:
+                break
+            body = bytes(self.buffer[pos:pos + length])
+            del self.buffer[:pos + length]
+            messages.append(self._decode(body))
+        return messages
+
+    def _decode(self, body):
+        kind = body[:1]
+        if kind == FRAME_CONFIG:
+            version, pos = read_uvarint(body, 1)
+            try:
+                config_data = json.loads(zlib.decompress(body[pos:]).decode('utf-8'))
+            except (zlib.error, ValueError) as e:
+                raise FrameError(f"配置帧无法解析: {e}")
+            return ('config', version, config_data)
+
+        if kind not in (FRAME_KEY, FRAME_DELTA):
+            raise FrameError(f"未知的帧类型: {kind!r}")
+
+        sequence, pos = read_uvarint(body, 1)
+        if kind == FRAME_KEY:
+            values = []
+            for _ in FIELDS:
+                value, pos = read_varint(body, pos)
+                values.append(value)
+        else:
+            if self.state is None:
+                raise FrameError("收到增量帧之前没有关键帧")
+            if sequence != self.sequence + 1:
+                raise FrameError(f"帧序号不连续: {self.sequence} -> {sequence}")
+            mask, pos = read_uvarint(body, pos)
+            values = list(self.state)
+            for i in range(len(FIELDS)):
+                if mask & (1 << i):
+                    delta, pos = read_varint(body, pos)
+                    values[i] += delta
+        self.sequence = sequence
+        self.state = tuple(values)
+        return ('state', self.state)
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""config_schema 验证器测试：收集全部问题及其 JSON 路径，并与原来的逐项验证保持一致"""
+
+import copy
+import random
+
+import pytest
+
+from config_schema import Issue, RECOMMENDED_ROLES, validate_config
+
+
+def _valid_config():
+    return {
+        'topic': '人工智能利大于弊',
+        'affirmative': {'school': '甲大学', 'viewpoint': '利大于弊'},
+        'negative': {'school': '乙大学', 'viewpoint': '弊大于利'},
+        'debater_roles': {role: role for role in RECOMMENDED_ROLES},
+        'rounds': [
+            {'side': 'affirmative', 'speaker': '正方一辩', 'type': '立论', 'time': 180},
+            {'side': 'negative', 'speaker': '反方一辩', 'type': '立论', 'time': 180},
+            {'side': 'both', 'speaker': '双方', 'type': '自由辩论', 'time': 240},
+        ],
+    }
+
+
+def _with(*changes):
+    """按 (路径, 值) 修改有效配置，值为 _DELETE 时删除该字段"""
+    config = _valid_config()
+    for path, value in changes:
+        target = config
+        for key in path[:-1]:
+            target = target[key]
+        if value is _DELETE:
+            del target[path[-1]]
+        else:
+            target[path[-1]] = value
+    return config
+
+
+_DELETE = object()
+
+ERROR_CASES = [
+    ('valid', _valid_config(), []),
+    ('not an object', [], [('$', "配置必须是对象")]),
+    ('missing top-level fields', _with((('topic',), _DELETE), (('rounds',), _DELETE)),
+     [('$.topic', "缺少必要字段"), ('$.rounds', "缺少必要字段")]),
+    ('bad sides', _with((('affirmative',), "甲大学"), (('negative', 'viewpoint'), _DELETE)),
+     [('$.affirmative', "必须是对象"), ('$.negative.viewpoint', "缺少必要字段")]),
+    ('rounds not an array', _with((('rounds',), {'side': 'affirmative'})),
+     [('$.rounds', "必须是数组")]),
+    ('several bad rounds', _with((('rounds', 0, 'time'), 0),
+                                 (('rounds', 1, 'side'), 'both'),
+                                 (('rounds', 1, 'speaker'), _DELETE),
+                                 (('rounds', 2), "自由辩论")),
+     [('$.rounds[0].time', "必须是正整数"),
+      ('$.rounds[1].speaker', "缺少必要字段"),
+      ('$.rounds[1].side', "必须是 'affirmative' 或 'negative'"),
+      ('$.rounds[2]', "回合配置必须是对象")]),
+    ('time types', _with((('rounds', 0, 'time'), "180"), (('rounds', 1, 'time'), 90.5),
+                         (('rounds', 2, 'time'), -240)),
+     [('$.rounds[0].time', "必须是正整数"), ('$.rounds[1].time', "必须是正整数"),
+      ('$.rounds[2].time', "必须是正整数")]),
+    ('debater_roles not an object', _with((('debater_roles',), ['affirmative_first'])),
+     [('$.debater_roles', "必须是对象")]),
+    ('errors everywhere', _with((('topic',), _DELETE), (('negative',), None), (('rounds', 2, 'type'), _DELETE)),
+     [('$.topic', "缺少必要字段"), ('$.negative', "必须是对象"), ('$.rounds[2].type', "缺少必要字段"),
+      ('$.rounds[2].side', "必须是 'affirmative' 或 'negative'")]),
+]
+
+
+@pytest.mark.parametrize('name, config, expected', ERROR_CASES, ids=[case[0] for case in ERROR_CASES])
+def test_collects_all_errors_with_paths(name, config, expected):
+    errors, _warnings = validate_config(config)
+    assert errors == [Issue(path, message) for path, message in expected]
+
+
+def test_warnings():
+    config = _with((('rounds', 2, 'time'), 241), (('debater_roles',), {'affirmative_first': '张三'}))
+    errors, warnings = validate_config(config)
+    assert errors == []
+    assert [w.path for w in warnings] == ['$.rounds[2].time', '$.debater_roles']
+    assert "每方 120 秒" in warnings[0].message
+    assert 'negative_fourth' in warnings[1].message
+    assert 'affirmative_first' not in warnings[1].message
+
+
+def _legacy_accepts(data):
+    """原 DebateConfig.validate 的判断，只保留是否通过"""
+    for field in ('topic', 'affirmative', 'negative', 'rounds'):
+        if field not in data:
+            return False
+    for side in ('affirmative', 'negative'):
+        if not isinstance(data[side], dict):
+            return False
+        for field in ('school', 'viewpoint'):
+            if field not in data[side]:
+                return False
+    if not isinstance(data['rounds'], list):
+        return False
+    for round_data in data['rounds']:
+        if not isinstance(round_data, dict):
+            return False
+        for field in ('side', 'speaker', 'type', 'time'):
+            if field not in round_data:
+                return False
+        if round_data['side'] not in ['affirmative', 'negative'] and round_data['type'] != '自由辩论':
+            return False
+        if not isinstance(round_data['time'], int) or round_data['time'] <= 0:
+            return False
+    if 'debater_roles' in data and not isinstance(data['debater_roles'], dict):
+        return False
+    return True
+
+
+_ODD_VALUES = (None, 0, -1, 3, True, 1.5, "", "affirmative", "自由辩论", [], {}, ["x"], {'school': 'x'})
+
+
+def _mutate(value, rng):
+    """随机删除字段、替换为其他类型的值或修改数组"""
+    if isinstance(value, dict) and value and rng.random() < 0.7:
+        key = rng.choice(sorted(value))
+        roll = rng.random()
+        if roll < 0.25:
+            del value[key]
+        elif roll < 0.5:
+            value[key] = copy.deepcopy(rng.choice(_ODD_VALUES))
+        else:
+            value[key] = _mutate(value[key], rng)
+        return value
+    if isinstance(value, list) and value and rng.random() < 0.7:
+        i = rng.randrange(len(value))
+        if rng.random() < 0.3:
+            value[i] = copy.deepcopy(rng.choice(_ODD_VALUES))
+        else:
+            value[i] = _mutate(value[i], rng)
+        return value
+    return copy.deepcopy(rng.choice(_ODD_VALUES))
+
+
+def test_accepts_same_configs_as_legacy_validate():
+    rng = random.Random(14)
+    accepted = rejected = 0
+    for _ in range(3000):
+        config = _valid_config()
+        for _ in range(rng.randint(1, 3)):
+            config = _mutate(config, rng)
+        if not isinstance(config, dict):
+            continue
+        errors, _warnings = validate_config(config)
+        assert (not errors) == _legacy_accepts(config), config
+        if errors:
+            rejected += 1
+        else:
+            accepted += 1
+    # 两种结果都要有足够的样本
+    assert accepted > 100 and rejected > 100
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""match_recorder 录像格式的录制、读取、重放和核对测试
+
+与 timer_core.simulation 一样用 ManualClock 驱动引擎，整场比赛在毫秒内录完。
+"""
+
+import pytest
+
+from match_recorder import (CONTROL_ACTIONS, CONTROL_OPCODES, EVENT_KINDS, EVENT_OPCODES, MAGIC,
+                            ControlRecord, EventRecord, MatchRecorder, MatchReplayer, RecordingError,
+                            read_recording, verify)
+from state_codec import read_uvarint
+from timer_core import (TimerEngine, ManualClock, NS_PER_SECOND, NS_PER_MS, EVENT_NOTIFY,
+                        EVENT_TIMEOVER, EVENT_SIDE_FINISHED, EVENT_ROUND_FINISHED)
+from timer_core.simulation import run_until_idle
+
+OPENING = {'side': 'affirmative', 'speaker': '正方一辩', 'type': '立论', 'time': 75}
+FREE_DEBATE = {'side': 'both', 'speaker': '双方', 'type': '自由辩论', 'time': 40}
+CONFIG = {'topic': '测试辩题', 'rounds': [OPENING, FREE_DEBATE]}
+
+
+def _advance(engine, clock, ns):
+    """推进时钟，途中在每个显示秒数变化的时刻 poll()"""
+    target_ns = clock.now_ns() + ns
+    while True:
+        wait_ns = engine.ns_until_next_tick()
+        if wait_ns is None or clock.now_ns() + wait_ns > target_ns:
+            break
+        clock.advance_ns(wait_ns)
+        engine.poll()
+    clock.advance_ns(target_ns - clock.now_ns())
+
+
+def _record_match(path):
+    """录一场用到全部控制操作的比赛，返回录制结束时的引擎状态"""
+    clock = ManualClock()
+    engine = TimerEngine(clock)
+    recorder = MatchRecorder(str(path), CONFIG, engine)
+
+    engine.set_current_round(OPENING)
+    engine.start()
+    _advance(engine, clock, 3 * NS_PER_SECOND + 250 * NS_PER_MS)
+    engine.pause()
+    _advance(engine, clock, 2 * NS_PER_SECOND)
+    engine.resume()
+    _advance(engine, clock, 1500 * NS_PER_MS)
+    engine.toggle()
+    engine.set_duration(60)
+    engine.update_round_info(dict(OPENING, speaker='正方二辩'))
+    engine.toggle()
+    _advance(engine, clock, 10 * NS_PER_SECOND + 7)  # 不足 1 微秒的部分在文件中被截去
+    saved = engine.snapshot()
+    engine.stop()
+    engine.reset()
+    engine.restore(saved)
+    engine.start()
+    run_until_idle(engine, clock)
+
+    recorder.record_config(dict(CONFIG, topic='新辩题'))
+    engine.set_current_round(FREE_DEBATE)
+    engine.toggle_side('affirmative')
+    _advance(engine, clock, 5 * NS_PER_SECOND)
+    engine.toggle_side('negative')
+    _advance(engine, clock, 12 * NS_PER_SECOND)
+    engine.toggle_side('affirmative')
+    run_until_idle(engine, clock)
+    engine.toggle_side('negative')
+    run_until_idle(engine, clock)
+    engine.terminate()
+
+    recorder.close()
+    return engine.get_state(), clock.now_ns()
+
+
+@pytest.fixture
+def recording_path(tmp_path):
+    return tmp_path / 'match.dbr'
+
+
+def test_records_every_opcode(recording_path):
+    _record_match(recording_path)
+    recording = read_recording(str(recording_path))
+
+    assert recording.meta['config'] == CONFIG
+    actions = {r.action for r in recording.records if isinstance(r, ControlRecord)}
+    assert actions == set(CONTROL_ACTIONS)
+    kinds = {r.kind for r in recording.records if isinstance(r, EventRecord)}
+    assert kinds == set(EVENT_KINDS)
+
+    config_records = [r for r in recording.records if isinstance(r, ControlRecord) and r.action == 'config']
+    assert config_records[0].args == (dict(CONFIG, topic='新辩题'),)
+
+
+def test_raw_layout(recording_path):
+    """逐条解析文件：varint 微秒间隔 + 操作码，控制操作码 1..13，事件操作码 0x40 起"""
+    _record_match(recording_path)
+    data = recording_path.read_bytes()
+    assert data.startswith(MAGIC)
+    length, pos = read_uvarint(data, len(MAGIC))
+    pos += length
+
+    control_opcodes = set(CONTROL_OPCODES.values())
+    event_opcodes = set(EVENT_OPCODES.values())
+    assert control_opcodes == set(range(1, 14))
+    assert min(event_opcodes) == 0x40
+
+    seen = set()
+    time_us = 0
+    while pos < len(data):
+        delta_us, pos = read_uvarint(data, pos)
+        time_us += delta_us
+        opcode = data[pos]
+        pos += 1
+        seen.add(opcode)
+        if opcode in event_opcodes:
+            _remaining, pos = read_uvarint(data, pos + 1)
+        else:
+            assert opcode in control_opcodes
+            length, pos = read_uvarint(data, pos)
+            pos += length
+    assert pos == len(data)
+    assert seen == control_opcodes | event_opcodes
+
+    recording = read_recording(str(recording_path))
+    assert recording.records[-1].time_ns == time_us * 1000
+
+
+def test_timestamps_are_microseconds(recording_path):
+    _record_match(recording_path)
+    records = read_recording(str(recording_path)).records
+    assert all(r.time_ns % 1000 == 0 for r in records)
+    assert [r.time_ns for r in records] == sorted(r.time_ns for r in records)
+
+    controls = [r for r in records if isinstance(r, ControlRecord)]
+    pause = next(r for r in controls if r.action == 'pause')
+    resume = next(r for r in controls if r.action == 'resume')
+    assert pause.time_ns == 3250 * 1_000_000
+    assert resume.time_ns - pause.time_ns == 2 * NS_PER_SECOND
+
+
+def test_replay_reproduces_final_state(recording_path):
+    final_state, _ = _record_match(recording_path)
+    recording = read_recording(str(recording_path))
+
+    replayer = MatchReplayer(recording)
+    replayer.advance_to(replayer.duration_ns)
+    assert replayer.finished()
+    assert replayer.engine.get_state() == final_state
+    assert replayer.config['topic'] == '新辩题'
+
+
+def test_seek_backwards_rebuilds_state(recording_path):
+    _record_match(recording_path)
+    recording = read_recording(str(recording_path))
+    replayer = MatchReplayer(recording)
+
+    # 暂停期间：开始 3.25 秒后暂停，剩余 72 秒
+    replayer.seek(4 * NS_PER_SECOND)
+    paused_state = replayer.engine.get_state()
+    assert paused_state['current_time'] == 72
+    assert not paused_state['timer_active']
+
+    replayer.seek(replayer.duration_ns)
+    replayer.seek(4 * NS_PER_SECOND)
+    assert replayer.engine.get_state() == paused_state
+    assert replayer.config == CONFIG
+
+
+def test_replay_callbacks_see_record_times(recording_path):
+    _record_match(recording_path)
+    recording = read_recording(str(recording_path))
+    applied = []
+    replayer = MatchReplayer(recording, apply_control=lambda action, args: applied.append(
+        (replayer.clock_position_ns(), action)))
+    replayer.advance_to(replayer.duration_ns)
+    assert applied == [(r.time_ns, r.action) for r in recording.records if isinstance(r, ControlRecord)]
+
+
+def test_verify_matches_recorded_events(recording_path):
+    _record_match(recording_path)
+    recording = read_recording(str(recording_path))
+    assert verify(recording) == []
+
+    events = [r for r in recording.records if isinstance(r, EventRecord)]
+    assert any(e.kind == EVENT_NOTIFY for e in events)
+    assert sum(1 for e in events if e.kind == EVENT_ROUND_FINISHED) == 2
+    assert sum(1 for e in events if e.kind == EVENT_TIMEOVER) == 3
+    assert {e.side for e in events if e.kind == EVENT_SIDE_FINISHED} == {'affirmative', 'negative'}
+
+
+def test_verify_reports_tampered_event(recording_path):
+    _record_match(recording_path)
+    recording = read_recording(str(recording_path))
+    records = list(recording.records)
+    i = next(i for i, r in enumerate(records) if isinstance(r, EventRecord))
+    records[i] = records[i]._replace(remaining=records[i].remaining + 1)
+    mismatches = verify(recording._replace(records=records))
+    assert [m[0] for m in mismatches] == [0]
+
+
+def test_truncated_file_keeps_complete_records(recording_path):
+    _record_match(recording_path)
+    full = read_recording(str(recording_path)).records
+    data = recording_path.read_bytes()
+    recording_path.write_bytes(data[:-1])
+    assert read_recording(str(recording_path)).records == full[:-1]
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'not_a_recording.dbr'
+    path.write_bytes(b'{"topic": "x"}')
+    with pytest.raises(RecordingError):
+        read_recording(str(path))
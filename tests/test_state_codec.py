@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""state_codec 帧格式的往返测试"""
+
+import random
+
+import pytest
+
+from state_codec import (FIELDS, FrameError, StateDecoder, StateEncoder, capture_state, encode_config,
+                         read_uvarint, read_varint, state_to_snapshot, write_uvarint, write_varint)
+from timer_core import (TimerEngine, ManualClock, EVENT_TICK, EVENT_NOTIFY, EVENT_TIMEOVER,
+                        EVENT_SIDE_FINISHED, EVENT_ROUND_FINISHED)
+
+CONFIG = {'topic': '测试辩题', 'rounds': [{'side': 'affirmative', 'speaker': '一辩', 'type': '立论', 'time': 180}]}
+
+
+def _random_state(rng):
+    return tuple(rng.randint(-(1 << 40), 1 << 40) for _ in FIELDS)
+
+
+def _feed_in_pieces(decoder, data, rng):
+    """把数据按随机长度切开逐段喂入"""
+    messages = []
+    pos = 0
+    while pos < len(data):
+        size = rng.randint(1, 7)
+        messages.extend(decoder.feed(data[pos:pos + size]))
+        pos += size
+    return messages
+
+
+def test_varint_round_trip():
+    for value in (0, 1, -1, 63, -64, 64, 1000, -1000, (1 << 63) - 1, -(1 << 63), 1 << 70):
+        out = bytearray()
+        write_varint(out, value)
+        assert read_varint(out, 0) == (value, len(out))
+    for value in (0, 127, 128, 300, 1 << 35):
+        out = bytearray()
+        write_uvarint(out, value)
+        assert read_uvarint(out, 0) == (value, len(out))
+
+
+def test_keyframe_and_deltas_round_trip():
+    rng = random.Random(16)
+    encoder = StateEncoder()
+    decoder = StateDecoder()
+    state = _random_state(rng)
+    assert decoder.feed(encoder.encode(state)) == [('state', state)]
+
+    for _ in range(500):
+        values = list(state)
+        for i in rng.sample(range(len(FIELDS)), rng.randint(1, len(FIELDS))):
+            values[i] += rng.randint(-5000, 5000) or 1
+        state = tuple(values)
+        frame = encoder.encode(state)
+        assert decoder.feed(frame) == [('state', state)]
+
+    # 没有变化时不产生帧
+    assert encoder.encode(state) is None
+
+
+def test_typical_tick_delta_is_small():
+    encoder = StateEncoder()
+    state = (3, 12345, 180, 90_000, 0, 0, 1)
+    encoder.encode(state)
+    frame = encoder.encode((3, 12345, 180, 89_000, 0, 0, 1))
+    assert len(frame) <= 8
+
+
+def test_config_frame_round_trip():
+    decoder = StateDecoder()
+    assert decoder.feed(encode_config(42, CONFIG)) == [('config', 42, CONFIG)]
+
+
+def test_partial_feeds():
+    rng = random.Random(7)
+    encoder = StateEncoder()
+    states = [_random_state(rng)]
+    stream = bytearray(encode_config(1, CONFIG))
+    stream += encoder.encode(states[0])
+    for _ in range(100):
+        states.append(tuple(v + rng.randint(-3, 3) for v in states[-1]))
+        frame = encoder.encode(states[-1])
+        if frame is None:
+            states.pop()
+        else:
+            stream += frame
+
+    messages = _feed_in_pieces(StateDecoder(), bytes(stream), rng)
+    assert messages[0] == ('config', 1, CONFIG)
+    assert [m[1] for m in messages[1:]] == states
+
+
+def test_sequence_gap_raises():
+    encoder = StateEncoder()
+    decoder = StateDecoder()
+    decoder.feed(encoder.encode((0, 0, 0, 1000, 0, 0, 0)))
+    encoder.encode((0, 0, 0, 900, 0, 0, 0))  # 丢失的一帧
+    with pytest.raises(FrameError):
+        decoder.feed(encoder.encode((0, 0, 0, 800, 0, 0, 0)))
+
+
+def test_delta_before_keyframe_raises():
+    encoder = StateEncoder()
+    encoder.encode((0, 0, 0, 1000, 0, 0, 0))
+    with pytest.raises(FrameError):
+        StateDecoder().feed(encoder.encode((0, 0, 0, 900, 0, 0, 0)))
+
+
+def test_unknown_frame_type_raises():
+    with pytest.raises(FrameError):
+        StateDecoder().feed(b'\x02X\x00')
+
+
+class _Mirror:
+    """镜像端：收到的每一帧都在本地 poll() 之前应用"""
+
+    def __init__(self, clock, round_info):
+        self.engine = TimerEngine(clock)
+        self.engine.set_current_round(round_info)
+        self.decoder = StateDecoder()
+        self.events = []
+
+    def receive(self, frame):
+        for message in self.decoder.feed(frame):
+            self.engine.restore(state_to_snapshot(message[1], self.engine))
+        if self.engine.ns_until_next_tick() == 0:
+            self.events.extend(self.engine.poll())
+
+
+def _alerts(events):
+    return [(e.kind, e.side, e.remaining) for e in events if e.kind != EVENT_TICK]
+
+
+def _publish_round(round_info, drive):
+    """操作端每次 poll() 之后立即发帧，镜像端总是在自己 poll() 之前收到"""
+    clock = ManualClock()
+    publisher = TimerEngine(clock)
+    publisher.set_current_round(round_info)
+    mirror = _Mirror(clock, round_info)
+    encoder = StateEncoder()
+    published = []
+
+    def send():
+        frame = encoder.encode(capture_state(publisher, 0, 1))
+        if frame:
+            mirror.receive(frame)
+
+    def run_until_idle():
+        while publisher.ns_until_next_tick() is not None:
+            clock.advance_ns(publisher.ns_until_next_tick())
+            published.extend(publisher.poll())
+            send()
+
+    drive(publisher, send, run_until_idle)
+    return _alerts(published), _alerts(mirror.events), mirror.engine
+
+
+def test_mirror_keeps_alerts_when_frame_arrives_first():
+    def drive(publisher, send, run_until_idle):
+        publisher.start()
+        send()
+        run_until_idle()
+
+    published, mirrored, mirror = _publish_round(
+        {'side': 'negative', 'speaker': '反方一辩', 'type': '立论', 'time': 65}, drive)
+    assert (EVENT_NOTIFY, None, 60) in published
+    assert mirrored == published
+    assert (EVENT_TIMEOVER, None, 0) in mirrored
+    assert mirrored[-1][0] == EVENT_ROUND_FINISHED
+    assert not mirror.is_running()
+
+
+def test_mirror_finishes_free_debate_sides():
+    def drive(publisher, send, run_until_idle):
+        for side in ('affirmative', 'negative'):
+            publisher.toggle_side(side)
+            send()
+            run_until_idle()
+
+    published, mirrored, _mirror = _publish_round(
+        {'side': 'both', 'speaker': '双方', 'type': '自由辩论', 'time': 40}, drive)
+    assert mirrored == published
+    assert [e for e in mirrored if e[0] == EVENT_SIDE_FINISHED] == [
+        (EVENT_SIDE_FINISHED, 'affirmative', 0), (EVENT_SIDE_FINISHED, 'negative', 0)]
+    assert mirrored[-1][0] == EVENT_ROUND_FINISHED
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""timer_core 计时内核测试：随机操作序列、暂停与卡顿下的精度、快照恢复"""
+
+import random
+
+import pytest
+
+from timer_core import (TimerEngine, ManualClock, NS_PER_SECOND, NS_PER_MS, EVENT_TICK, EVENT_NOTIFY,
+                        EVENT_TIMEOVER, EVENT_SIDE_FINISHED, EVENT_ROUND_FINISHED)
+from timer_core.simulation import fuzz, run_until_idle, simulate_schedule
+
+STANDARD = {'side': 'affirmative', 'speaker': '正方一辩', 'type': '立论', 'time': 180}
+FREE_DEBATE = {'side': 'both', 'speaker': '双方', 'type': '自由辩论', 'time': 240}
+
+
+def _engine(round_info):
+    clock = ManualClock()
+    engine = TimerEngine(clock)
+    engine.set_current_round(round_info)
+    return engine, clock
+
+
+def _notifications(events):
+    return [(e.remaining, e.flash_count) for e in events if e.kind == EVENT_NOTIFY]
+
+
+@pytest.mark.parametrize('free_debate', [False, True])
+def test_fuzz_fixed_seed(free_debate):
+    rng = random.Random(20240501)
+    for _ in range(200):
+        fuzz(200, seed=rng.random(), free_debate=free_debate)
+
+
+def test_full_round_alerts():
+    engine, clock = _engine(STANDARD)
+    engine.start()
+    events = run_until_idle(engine, clock)
+    assert clock.now_ns() == 180 * NS_PER_SECOND
+    assert _notifications(events) == [(60, 1), (30, 2), (15, 3)] + [(s, 1) for s in range(10, 0, -1)]
+    assert [e.kind for e in events[-3:]] == [EVENT_TICK, EVENT_TIMEOVER, EVENT_ROUND_FINISHED]
+    assert sum(1 for e in events if e.kind == EVENT_TICK) == 180
+
+
+def test_pause_keeps_sub_second_remainder():
+    engine, clock = _engine(STANDARD)
+    engine.start()
+    clock.advance_ns(10 * NS_PER_SECOND + 400 * NS_PER_MS)
+    engine.poll()
+    engine.pause()
+    clock.advance(30)
+    assert engine.poll() == []
+    assert engine.remaining_ns() == 169_600 * NS_PER_MS
+    engine.resume()
+    clock.advance_ns(600 * NS_PER_MS)
+    engine.poll()
+    assert engine.remaining_ns() == 169 * NS_PER_SECOND
+    assert engine.get_state()['current_time'] == 169
+
+
+def test_stall_does_not_drift():
+    """事件循环卡顿只推迟显示，剩余时间仍按时钟计算"""
+    engine, clock = _engine(STANDARD)
+    engine.start()
+    clock.advance_ns(7_300 * NS_PER_MS)
+    engine.poll()
+    assert engine.get_state()['current_time'] == 173
+    assert engine.ns_until_next_tick() == 700 * NS_PER_MS
+
+
+def test_stall_across_thresholds_marks_all():
+    engine, clock = _engine(dict(STANDARD, time=65))
+    engine.start()
+    clock.advance(3)
+    engine.poll()
+    clock.advance(50)
+    events = engine.poll()
+    assert _notifications(events) == [(12, 3)]
+    assert engine.notified_at_60s and engine.notified_at_30s and engine.notified_at_15s
+    events = run_until_idle(engine, clock)
+    assert _notifications(events) == [(s, 1) for s in range(10, 0, -1)]
+
+
+def test_free_debate_sides():
+    engine, clock = _engine(FREE_DEBATE)
+    engine.toggle_side('affirmative')
+    clock.advance(20)
+    engine.poll()
+    engine.toggle_side('negative')
+    assert not engine.affirmative_timer_active and engine.negative_timer_active
+    events = run_until_idle(engine, clock)
+    assert engine.get_state()['affirmative_time'] == 100
+    assert [e.side for e in events if e.kind == EVENT_SIDE_FINISHED] == ['negative']
+    assert not any(e.kind == EVENT_ROUND_FINISHED for e in events)
+
+    engine.toggle_side('affirmative')
+    events = run_until_idle(engine, clock)
+    assert [e.side for e in events if e.kind == EVENT_SIDE_FINISHED] == ['affirmative']
+    assert events[-1].kind == EVENT_ROUND_FINISHED
+
+
+def test_snapshot_restore_round_trip():
+    engine, clock = _engine(STANDARD)
+    engine.start()
+    clock.advance_ns(125 * NS_PER_SECOND + 250 * NS_PER_MS)
+    engine.poll()
+    snapshot = engine.snapshot()
+
+    restored_clock = ManualClock(clock.now_ns())
+    restored = TimerEngine(restored_clock)
+    restored.set_current_round(STANDARD)
+    restored.restore(snapshot)
+    assert restored.snapshot() == snapshot
+    assert restored.get_state() == engine.get_state()
+
+    # 恢复后两个引擎产生相同的事件
+    assert run_until_idle(restored, restored_clock) == run_until_idle(engine, clock)
+
+
+def test_restore_paused_snapshot():
+    engine, clock = _engine(FREE_DEBATE)
+    engine.toggle_side('negative')
+    clock.advance_ns(33_500 * NS_PER_MS)
+    engine.poll()
+    engine.toggle_side('negative')
+    snapshot = engine.snapshot()
+
+    restored = TimerEngine(ManualClock(10 * NS_PER_SECOND))
+    restored.set_current_round(FREE_DEBATE)
+    restored.restore(snapshot)
+    assert not restored.is_running()
+    assert restored.remaining_ns('negative') == 86_500 * NS_PER_MS
+    assert restored.remaining_ns('affirmative') == 120 * NS_PER_SECOND
+
+
+def test_simulate_schedule():
+    results = simulate_schedule([STANDARD, FREE_DEBATE])
+    assert [r['finished'] for r in results] == [True, True]
+    assert results[0]['elapsed'] == 180
+    assert results[1]['elapsed'] == 240
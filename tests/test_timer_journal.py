@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""timer_journal 崩溃恢复测试"""
+
+import json
+
+import pytest
+
+from timer_core import TimerEngine, ManualClock, NS_PER_SECOND
+from timer_journal import (COMPACT_BYTES, KIND_EXIT, KIND_PAUSE, KIND_ROUND, KIND_START, TimerJournal,
+                           needs_recovery, read_last_record, recovered_state)
+
+ROUND = {'side': 'affirmative', 'speaker': '正方一辩', 'type': '立论', 'time': 180}
+FREE_DEBATE = {'side': 'both', 'speaker': '双方', 'type': '自由辩论', 'time': 240}
+WALL_NS = 1_700_000_000 * NS_PER_SECOND
+
+
+def _snapshot(round_info, *controls, elapsed_s=0):
+    clock = ManualClock()
+    engine = TimerEngine(clock)
+    engine.set_current_round(round_info)
+    for control in controls:
+        control(engine)
+    clock.advance(elapsed_s)
+    engine.poll()
+    return engine.snapshot()
+
+
+def _record(kind, state, wall_ns=WALL_NS):
+    return {'kind': kind, 'wall_ns': wall_ns, 'mono_ns': 0, 'config': '/tmp/debate.json',
+            'match': None, 'round': 2, 'state': state}
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    return str(tmp_path / 'timer.journal')
+
+
+def _write_journal(path, records, **kwargs):
+    journal = TimerJournal(path, batch_seconds=0, **kwargs)
+    for kind, fields in records:
+        journal.append(kind, **fields)
+    journal.close()
+
+
+def test_recovered_state_deducts_wall_time():
+    state = _snapshot(ROUND, TimerEngine.start, elapsed_s=20)
+    record = _record(KIND_START, state)
+
+    recovered, deducted = recovered_state(record, now_wall_ns=WALL_NS + 30 * NS_PER_SECOND)
+    assert deducted == 30 * NS_PER_SECOND
+    assert recovered['standard_ns'] == 130 * NS_PER_SECOND
+    assert recovered['timer_active'] is False
+    assert record['state']['standard_ns'] == 160 * NS_PER_SECOND  # 原记录不变
+
+    engine = TimerEngine(ManualClock())
+    engine.set_current_round(ROUND)
+    engine.restore(recovered)
+    assert not engine.is_running()
+    assert engine.get_state()['current_time'] == 130
+
+
+def test_recovered_state_never_below_zero():
+    state = _snapshot(ROUND, TimerEngine.start, elapsed_s=170)
+    recovered, deducted = recovered_state(_record(KIND_START, state),
+                                          now_wall_ns=WALL_NS + 3600 * NS_PER_SECOND)
+    assert deducted == 10 * NS_PER_SECOND
+    assert recovered['standard_ns'] == 0
+
+
+def test_recovered_state_keeps_paused_countdowns():
+    state = _snapshot(FREE_DEBATE, lambda e: e.toggle_side('negative'), elapsed_s=45)
+    state = dict(state, negative_timer_active=False)  # 暂停后写入的记录
+    recovered, deducted = recovered_state(_record(KIND_PAUSE, state),
+                                          now_wall_ns=WALL_NS + 600 * NS_PER_SECOND)
+    assert deducted == 0
+    assert recovered == state
+
+    engine = TimerEngine(ManualClock())
+    engine.set_current_round(FREE_DEBATE)
+    engine.restore(recovered)
+    assert not engine.is_running()
+    assert engine.get_state()['negative_time'] == 75
+    assert engine.get_state()['affirmative_time'] == 120
+
+
+def test_free_debate_deducts_only_active_side():
+    state = _snapshot(FREE_DEBATE, lambda e: e.toggle_side('affirmative'), elapsed_s=10)
+    recovered, _ = recovered_state(_record(KIND_START, state), now_wall_ns=WALL_NS + 5 * NS_PER_SECOND)
+    assert recovered['affirmative_ns'] == 105 * NS_PER_SECOND
+    assert recovered['negative_ns'] == 120 * NS_PER_SECOND
+    assert not recovered['affirmative_timer_active']
+
+
+def test_round_trip_through_file(journal_path):
+    state = _snapshot(ROUND, TimerEngine.start, elapsed_s=5)
+    _write_journal(journal_path, [(KIND_ROUND, {'config': 'a.json', 'round': 0, 'state': state}),
+                                  (KIND_START, {'config': 'a.json', 'round': 1, 'state': state})])
+    record = read_last_record(journal_path)
+    assert record['kind'] == KIND_START
+    assert record['round'] == 1
+    assert record['state'] == state
+    assert needs_recovery(record)
+
+
+def test_recovery_after_crash(journal_path):
+    """日志记录时间与恢复时间都来自注入的墙上时钟"""
+    wall_clock = ManualClock(WALL_NS)
+    journal = TimerJournal(journal_path, batch_seconds=0, wall_clock=wall_clock)
+    journal.append(KIND_START, config='a.json', round=0, state=_snapshot(ROUND, TimerEngine.start))
+    wall_clock.advance(42)
+    journal.append(KIND_START, config='a.json', round=0,
+                   state=_snapshot(ROUND, TimerEngine.start, elapsed_s=42))
+    journal.close()  # 没有 exit 记录，相当于崩溃
+
+    wall_clock.advance(8)
+    record = read_last_record(journal_path)
+    assert needs_recovery(record)
+    recovered, deducted = recovered_state(record, now_wall_ns=wall_clock.now_ns())
+    assert deducted == 8 * NS_PER_SECOND
+    assert recovered['standard_ns'] == 130 * NS_PER_SECOND
+    assert not recovered['timer_active']
+
+
+def test_exit_record_suppresses_recovery(journal_path):
+    _write_journal(journal_path, [(KIND_START, {'config': 'a.json', 'round': 0, 'state': {}}),
+                                  (KIND_EXIT, {})])
+    assert read_last_record(journal_path)['kind'] == KIND_EXIT
+    assert not needs_recovery(read_last_record(journal_path))
+
+
+def test_needs_recovery_requires_config():
+    assert not needs_recovery(None)
+    assert not needs_recovery({'kind': KIND_START, 'config': ''})
+    assert needs_recovery({'kind': KIND_PAUSE, 'config': 'a.json'})
+
+
+def test_missing_journal(tmp_path):
+    assert read_last_record(str(tmp_path / 'missing.journal')) is None
+
+
+def test_torn_last_line_is_ignored(journal_path):
+    _write_journal(journal_path, [(KIND_START, {'config': 'a.json', 'round': 3, 'state': {}})])
+    with open(journal_path, 'ab') as f:
+        f.write(b'{"kind": "pause", "config": "a.js')  # 崩溃时写了一半
+    record = read_last_record(journal_path)
+    assert record['kind'] == KIND_START and record['round'] == 3
+
+    # 重新打开时另起一行，新记录不会与残行连在一起
+    _write_journal(journal_path, [(KIND_PAUSE, {'config': 'a.json', 'round': 4, 'state': {}})])
+    record = read_last_record(journal_path)
+    assert record['kind'] == KIND_PAUSE and record['round'] == 4
+
+
+def test_compaction_keeps_last_record(journal_path):
+    padding = 'x' * 4096
+    count = COMPACT_BYTES // len(padding) + 20
+    _write_journal(journal_path, [(KIND_START, {'config': 'a.json', 'round': i, 'padding': padding})
+                                  for i in range(count)])
+    with open(journal_path, 'rb') as f:
+        data = f.read()
+    assert len(data) <= COMPACT_BYTES
+    lines = data.splitlines()
+    # 压缩后只剩触发压缩的那条记录，之后的记录继续追加
+    assert 1 <= len(lines) < count
+    assert [json.loads(line)['round'] for line in lines] == list(range(count - len(lines), count))
+    assert read_last_record(journal_path)['round'] == count - 1
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""tournament_bundle 索引测试"""
+
+import json
+import os
+
+from tournament_bundle import open_bundle
+
+
+def _match(name, speaker):
+    return {
+        'match': name, 'topic': '测试辩题',
+        'affirmative': {'school': '甲', 'viewpoint': '正'},
+        'negative': {'school': '乙', 'viewpoint': '反'},
+        'rounds': [{'side': 'affirmative', 'speaker': speaker, 'type': '立论', 'time': 180}],
+    }
+
+
+def _write(path, matches):
+    with open(path, 'w', encoding='utf-8') as f:
+        for match in matches:
+            f.write(json.dumps(match, ensure_ascii=False) + '\n')
+
+
+def test_index_is_reused(tmp_path):
+    path = str(tmp_path / 'cup.jsonl')
+    _write(path, [_match('初赛A', '一辩'), _match('初赛B', '二辩')])
+    bundle = open_bundle(path)
+    assert bundle.titles() == ['初赛A', '初赛B']
+    assert os.path.exists(bundle.index_path)
+    assert open_bundle(path).entries == bundle.entries
+    assert bundle.load_match(1).get_rounds()[0]['speaker'] == '二辩'
+
+
+def test_same_size_rewrite_with_same_mtime_rebuilds_index(tmp_path):
+    """修改时间精度粗的文件系统上，同样大小的改写不能沿用旧索引"""
+    path = str(tmp_path / 'cup.jsonl')
+    _write(path, [_match('初赛A', '一辩'), _match('初赛B', '二辩')])
+    stat = os.stat(path)
+    assert open_bundle(path).titles() == ['初赛A', '初赛B']
+
+    _write(path, [_match('初赛B', '二辩'), _match('初赛A', '一辩')])
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert os.stat(path).st_size == stat.st_size
+
+    bundle = open_bundle(path)
+    assert bundle.titles() == ['初赛B', '初赛A']
+    assert bundle.load_match(0).get_rounds()[0]['speaker'] == '二辩'
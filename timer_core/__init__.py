@@ -0,0 +1,13 @@
+"""不依赖 Qt 的计时内核，可注入时钟以便快速模拟"""
+
+from .clock import MonotonicClock, ManualClock, NS_PER_SECOND, NS_PER_MS
+from .countdown import DeadlineCountdown
+from .engine import (TimerEngine, TimerEvent, EVENT_TICK, EVENT_NOTIFY,
+                     EVENT_TIMEOVER, EVENT_SIDE_FINISHED, EVENT_ROUND_FINISHED)
+
+__all__ = [
+    'MonotonicClock', 'ManualClock', 'NS_PER_SECOND', 'NS_PER_MS',
+    'DeadlineCountdown', 'TimerEngine', 'TimerEvent',
+    'EVENT_TICK', 'EVENT_NOTIFY', 'EVENT_TIMEOVER',
+    'EVENT_SIDE_FINISHED', 'EVENT_ROUND_FINISHED',
+]
@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""计时内核使用的时钟
+
+计时逻辑只通过 now_ns() 读取时间，实际运行时使用单调时钟，
+测试和模拟时注入可手动推进的时钟即可在毫秒内跑完整场比赛。
+"""
+
+import time
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_MS = 1_000_000
+
+
+class MonotonicClock:
+    """系统单调时钟"""
+
+    def now_ns(self):
+        return time.monotonic_ns()
+
+
+class ManualClock:
+    """手动推进的时钟，用于模拟和测试"""
+
+    def __init__(self, start_ns=0):
+        self._now_ns = start_ns
+
+    def now_ns(self):
+        return self._now_ns
+
+    def advance(self, seconds):
+        """向前推进指定秒数"""
+        self.advance_ns(int(seconds * NS_PER_SECOND))
+
+    def advance_ns(self, delta_ns):
+        """向前推进指定纳秒数"""
+        if delta_ns < 0:
+            raise ValueError("时钟不能倒退")
+        self._now_ns += delta_ns
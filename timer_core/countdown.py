@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from .clock import MonotonicClock, NS_PER_SECOND
+
+
+class DeadlineCountdown:
+    """基于单调时钟截止时间的倒计时
+
+    运行时只保存截止时间与累计暂停时长，剩余时间在每次查询时由二者推算。
+    计时器触发只决定何时重绘，不参与计时，因此事件循环卡顿不会累积成
+    时钟漂移，暂停也不会丢掉不足一秒的部分。
+    """
+
+    def __init__(self, duration=0, clock=None):
+        self.clock = clock or MonotonicClock()
+        self._deadline_ns = 0
+        self._paused_total_ns = 0
+        self._paused_at_ns = None
+        self.reset(duration)
+
+    def reset(self, duration):
+        """重置为指定秒数，并处于暂停状态"""
+        self.reset_ns(int(duration * NS_PER_SECOND))
+
+    def reset_ns(self, remaining_ns):
+        """重置为指定纳秒数，并处于暂停状态"""
+        now = self.clock.now_ns()
+        self._deadline_ns = now + remaining_ns
+        self._paused_total_ns = 0
+        self._paused_at_ns = now
+
+    def set_remaining(self, duration):
+        """设置剩余秒数，保持当前的运行/暂停状态"""
+        was_running = self.running
+        self.reset(duration)
+        if was_running:
+            self.start()
+
+    @property
+    def running(self):
+        return self._paused_at_ns is None
+
+    def start(self):
+        """开始或继续倒计时，把本次暂停时长计入累计暂停时长"""
+        if self._paused_at_ns is not None:
+            self._paused_total_ns += self.clock.now_ns() - self._paused_at_ns
+            self._paused_at_ns = None
+
+    def pause(self):
+        """暂停倒计时"""
+        if self._paused_at_ns is None:
+            self._paused_at_ns = self.clock.now_ns()
+
+    def end_ns(self):
+        """运行时预计归零的单调时钟时刻，暂停时返回None"""
+        if self._paused_at_ns is not None:
+            return None
+        return self._deadline_ns + self._paused_total_ns
+
+    def remaining_ns(self):
+        """剩余纳秒数"""
+        if self._paused_at_ns is not None:
+            now = self._paused_at_ns
+        else:
+            now = self.clock.now_ns()
+        return max(0, self._deadline_ns + self._paused_total_ns - now)
+
+    def remaining_seconds(self):
+        """剩余整秒数，向上取整，与观众看到的倒计时一致"""
+        return -(-self.remaining_ns() // NS_PER_SECOND)
+
+    def ns_until_next_second(self):
+        """距离显示秒数下一次变化的纳秒数"""
+        remaining = self.remaining_ns()
+        if remaining <= 0:
+            return 0
+        return remaining % NS_PER_SECOND or NS_PER_SECOND
@@ -0,0 +1,476 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import logging
+import functools
+from collections import namedtuple
+
+from .clock import MonotonicClock
+from .countdown import DeadlineCountdown
+
+logger = logging.getLogger('debate_app.timer_core')
+
+FREE_DEBATE_TYPE = "自由辩论"
+
+AFFIRMATIVE_COLOR = "#0078D4"  # 正方蓝色
+NEGATIVE_COLOR = "#D13438"  # 反方红色
+
+# 事件类型
+EVENT_TICK = 'tick'  # 显示秒数变化
+EVENT_NOTIFY = 'notify'  # 时间提醒（提示音 + 闪烁）
+EVENT_TIMEOVER = 'timeover'  # 时间结束提示音
+EVENT_SIDE_FINISHED = 'side_finished'  # 自由辩论一方时间用完
+EVENT_ROUND_FINISHED = 'round_finished'  # 环节结束
+
+TimerEvent = namedtuple('TimerEvent', ['kind', 'side', 'remaining', 'flash_count', 'color'])
+TimerEvent.__new__.__defaults__ = (None, 0, 0, None)
+
+
+def control(method):
+    """标记控制操作：最外层的控制调用结束后通知 control_listeners
+
+    监听者收到 (方法名, 参数元组)，用相同参数再调用一次同名方法即可重现
+    这次操作，录像与回放依赖这一点。嵌套调用（如 toggle 内部的 start）
+    不会重复通知。
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        self._control_depth += 1
+        try:
+            return method(self, *args)
+        finally:
+            self._control_depth -= 1
+            if not self._control_depth:
+                for listener in self.control_listeners:
+                    listener(name, args)
+    return wrapper
+
+
+class TimerEngine:
+    """辩论计时状态机，不依赖 Qt
+
+    所有时间都从注入的时钟读取。调用方在 ns_until_next_tick() 指示的时刻
+    调用 poll()，根据返回的事件列表更新界面、播放声音；在模拟中则直接
+    推进 ManualClock 后调用 poll()。
+    """
+
+    def __init__(self, clock=None):
+        self.clock = clock or MonotonicClock()
+
+        # 计时器状态 - 剩余时间由截止时间推算
+        self.standard = DeadlineCountdown(clock=self.clock)
+        self.affirmative = DeadlineCountdown(clock=self.clock)
+        self.negative = DeadlineCountdown(clock=self.clock)
+        self.total_time = 0
+        self.timer_active = False
+        self.affirmative_timer_active = False
+        self.negative_timer_active = False
+        self.is_free_debate = False
+        self.current_round = None
+
+        # 倒计时提醒标记
+        self.notified_at_60s = False
+        self.notified_at_30s = False
+        self.notified_at_15s = False
+        self.last_10s_tick = 0
+        self._last_displayed_time = None
+
+        # 监听者：control_listeners 收到控制操作，event_listeners 收到 poll() 产生的事件
+        self.control_listeners = []
+        self.event_listeners = []
+        self._control_depth = 0
+
+    # 剩余时间
+    @property
+    def current_time(self):
+        """标准环节剩余秒数"""
+        return self.standard.remaining_seconds()
+
+    @current_time.setter
+    def current_time(self, value):
+        self.standard.set_remaining(value)
+
+    @property
+    def affirmative_time(self):
+        """自由辩论正方剩余秒数"""
+        return self.affirmative.remaining_seconds()
+
+    @affirmative_time.setter
+    def affirmative_time(self, value):
+        self.affirmative.set_remaining(value)
+
+    @property
+    def negative_time(self):
+        """自由辩论反方剩余秒数"""
+        return self.negative.remaining_seconds()
+
+    @negative_time.setter
+    def negative_time(self, value):
+        self.negative.set_remaining(value)
+
+    # 环节设置
+    @control
+    def set_current_round(self, round_data):
+        """设置当前环节"""
+        self.current_round = round_data
+        if not round_data:
+            return
+        self.is_free_debate = round_data.get('type') == FREE_DEBATE_TYPE
+        duration = round_data.get('time', 0)
+
+        if self.is_free_debate:
+            logger.info(f"设置自由辩论环节，每方时间: {duration//2}秒")
+        else:
+            logger.info(f"设置标准环节，时间: {duration}秒")
+        self._apply_duration(duration)
+
+    @control
+    def update_round_info(self, round_data):
+        """替换当前环节的信息但保留剩余时间，之后重置时使用新的时长"""
+        if round_data and self.current_round:
+            if (round_data.get('type') == FREE_DEBATE_TYPE) != self.is_free_debate:
+                logger.warning("环节类型已变化，将在重新开始环节时生效")
+        self.current_round = round_data
+
+    @control
+    def set_duration(self, duration):
+        """设置计时器持续时间，不改变运行状态"""
+        logger.info(f"设置计时器持续时间: {duration}秒")
+        self._apply_duration(duration)
+
+    def _apply_duration(self, duration):
+        self.total_time = duration
+        if self.is_free_debate:
+            half_time = duration // 2
+            self.affirmative_time = half_time
+            self.negative_time = half_time
+        else:
+            self.current_time = duration
+        self._reset_notification_flags()
+
+    @control
+    def reset(self, duration=None):
+        """停止计时并重置到环节开始时的时间"""
+        logger.info("计时器重置")
+        self.stop()
+        self._reset_notification_flags()
+
+        if duration is None:
+            if not self.current_round:
+                return
+            duration = self.current_round.get('time', 0)
+        self._apply_duration(duration)
+
+    # 运行控制
+    @control
+    def start(self):
+        """启动标准计时器"""
+        if self.is_free_debate:
+            logger.warning("自由辩论模式下请使用专用计时器控制")
+            return False
+
+        if self.current_time > 0:
+            logger.info(f"启动标准计时器，剩余时间: {self.current_time}秒")
+            self.standard.start()
+            self.timer_active = True
+            self._mark_started()
+            return True
+        logger.warning("计时器时间为0，无法启动")
+        return False
+
+    @control
+    def resume(self):
+        """恢复标准计时器"""
+        return self.start()
+
+    @control
+    def pause(self):
+        """暂停标准计时器"""
+        logger.info("暂停计时器")
+        self.standard.pause()
+        self.timer_active = False
+        return True
+
+    @control
+    def toggle(self):
+        """开启或暂停标准计时器"""
+        if self.is_free_debate:
+            logger.info("自由辩论模式下，请使用正方/反方专用计时器控制")
+            return False
+        return self.pause() if self.timer_active else self.start()
+
+    @control
+    def toggle_side(self, side):
+        """开启或暂停自由辩论中一方的计时器，另一方会被暂停"""
+        side_name = "正方" if side == 'affirmative' else "反方"
+        if not self.is_free_debate:
+            logger.warning(f"非自由辩论模式不应调用{side_name}计时器")
+            return False
+
+        countdown, active_attr = self._side_countdown(side)
+        if getattr(self, active_attr):
+            logger.info(f"{side_name}计时器暂停")
+            countdown.pause()
+            setattr(self, active_attr, False)
+            return True
+
+        # 确保两个计时器不同时运行
+        other = 'negative' if side == 'affirmative' else 'affirmative'
+        other_countdown, other_attr = self._side_countdown(other)
+        if getattr(self, other_attr):
+            other_countdown.pause()
+            setattr(self, other_attr, False)
+
+        logger.info(f"{side_name}计时器启动")
+        if countdown.remaining_ns() > 0:
+            countdown.start()
+            setattr(self, active_attr, True)
+            self._mark_started()
+            return True
+        logger.warning(f"{side_name}时间已用完")
+        return False
+
+    @control
+    def stop(self):
+        """停止所有计时器"""
+        self.standard.pause()
+        self.affirmative.pause()
+        self.negative.pause()
+        self.timer_active = False
+        self.affirmative_timer_active = False
+        self.negative_timer_active = False
+        return True
+
+    @control
+    def terminate(self):
+        """强制终止当前回合"""
+        logger.info("终止当前回合")
+        return self.stop()
+
+    def is_running(self):
+        """检查计时器是否在运行"""
+        if self.is_free_debate:
+            return self.affirmative_timer_active or self.negative_timer_active
+        return self.timer_active
+
+    def active_countdown(self):
+        """返回正在运行的倒计时，没有则返回None"""
+        if self.is_free_debate:
+            if self.affirmative_timer_active:
+                return self.affirmative
+            if self.negative_timer_active:
+                return self.negative
+            return None
+        return self.standard if self.timer_active else None
+
+    def remaining_ns(self, side=None):
+        """精确剩余纳秒数，side 为 None 时返回标准环节"""
+        if side == 'affirmative':
+            return self.affirmative.remaining_ns()
+        if side == 'negative':
+            return self.negative.remaining_ns()
+        return self.standard.remaining_ns()
+
+    def ns_until_next_tick(self):
+        """距离下一次需要 poll() 的纳秒数，计时器未运行时返回None"""
+        countdown = self.active_countdown()
+        if countdown is None:
+            return None
+        if countdown.remaining_seconds() != self._last_displayed_time:
+            # 显示秒数已经变化但还没有 poll()（如 restore 校正了剩余时间）
+            return 0
+        return countdown.ns_until_next_second()
+
+    def upcoming_cue(self):
+        """预测下一次显示秒数变化时需要的提示音，不改变状态
+
+        Returns:
+            TimerEvent: kind 为 EVENT_NOTIFY 或 EVENT_TIMEOVER，remaining 为届时显示的秒数；
+            计时器未运行或不需要提示音时返回None
+        """
+        countdown = self.active_countdown()
+        if countdown is None:
+            return None
+        if countdown.remaining_seconds() != self._last_displayed_time:
+            return None  # 马上就会 poll()，提示音随 poll() 的事件直接播放
+        side = self._active_side()
+        next_time = countdown.remaining_seconds() - 1
+        if next_time <= 0:
+            return TimerEvent(EVENT_TIMEOVER, side, 0)
+
+        # 正常推进时每次只减少一秒，跨越阈值等价于恰好落在阈值上
+        notify = ((next_time == 60 and not self.notified_at_60s)
+                  or (next_time == 30 and not self.notified_at_30s)
+                  or (next_time == 15 and not self.notified_at_15s)
+                  or (1 <= next_time <= 10 and next_time != self.last_10s_tick))
+        return TimerEvent(EVENT_NOTIFY, side, next_time) if notify else None
+
+    def get_state(self):
+        """获取计时器状态"""
+        return {
+            'current_time': self.current_time,
+            'total_time': self.total_time,
+            'affirmative_time': self.affirmative_time,
+            'negative_time': self.negative_time,
+            'timer_active': self.timer_active,
+            'affirmative_timer_active': self.affirmative_timer_active,
+            'negative_timer_active': self.negative_timer_active,
+            'is_free_debate': self.is_free_debate
+        }
+
+    def snapshot(self):
+        """导出可以完整恢复计时状态的字典，只包含基本类型
+
+        剩余时间精确到纳秒，不包含 current_round，由调用方按环节序号另行恢复。
+        """
+        return {
+            'total_time': self.total_time,
+            'is_free_debate': self.is_free_debate,
+            'timer_active': self.timer_active,
+            'affirmative_timer_active': self.affirmative_timer_active,
+            'negative_timer_active': self.negative_timer_active,
+            'standard_ns': self.standard.remaining_ns(),
+            'affirmative_ns': self.affirmative.remaining_ns(),
+            'negative_ns': self.negative.remaining_ns(),
+            'notified': [self.notified_at_60s, self.notified_at_30s, self.notified_at_15s],
+            'last_10s_tick': self.last_10s_tick,
+        }
+
+    @control
+    def restore(self, snapshot):
+        """按 snapshot() 的结果恢复计时状态
+
+        缺少的字段保持不变，因此也可以只恢复剩余时间和运行状态。运行中的
+        倒计时没有变化时（如镜像显示板校正剩余时间）只重新对齐截止时间，
+        保留上次显示的秒数，下一次 poll() 仍然能发现跨越的提醒阈值。
+        """
+        running_before = self.active_countdown()
+        for name in ('total_time', 'is_free_debate', 'timer_active',
+                     'affirmative_timer_active', 'negative_timer_active', 'last_10s_tick'):
+            if name in snapshot:
+                setattr(self, name, snapshot[name])
+        if 'notified' in snapshot:
+            self.notified_at_60s, self.notified_at_30s, self.notified_at_15s = snapshot['notified']
+
+        for countdown, key, active in ((self.standard, 'standard_ns', self.timer_active),
+                                       (self.affirmative, 'affirmative_ns', self.affirmative_timer_active),
+                                       (self.negative, 'negative_ns', self.negative_timer_active)):
+            if key in snapshot:
+                countdown.reset_ns(snapshot[key])
+            if active:
+                countdown.start()
+            else:
+                countdown.pause()
+        if self.active_countdown() is not running_before:
+            self._mark_started()
+
+    # 计时推进
+    def poll(self):
+        """根据当前时钟推进状态，返回这段时间内产生的事件列表
+
+        剩余时间由截止时间推算，这里只在显示秒数变化时产生提醒和更新事件，
+        即使调用方错过了若干次触发，也不会影响计时精度。
+        """
+        countdown = self.active_countdown()
+        if countdown is None:
+            return []
+
+        remaining = countdown.remaining_seconds()
+        if remaining == self._last_displayed_time:
+            return []
+
+        if remaining <= 0:
+            return self._emit_events(self._finish(countdown))
+
+        events = self._check_time_notifications(remaining)
+        self._last_displayed_time = remaining
+        events.append(TimerEvent(EVENT_TICK, self._active_side(), remaining))
+        return self._emit_events(events)
+
+    def _emit_events(self, events):
+        for listener in self.event_listeners:
+            listener(events)
+        return events
+
+    def _finish(self, countdown):
+        """倒计时到零时的处理"""
+        countdown.pause()
+        self._last_displayed_time = 0
+        side = self._active_side()
+        events = [TimerEvent(EVENT_TICK, side, 0), TimerEvent(EVENT_TIMEOVER, side, 0)]
+
+        if side is None:
+            self.timer_active = False
+            events.append(TimerEvent(EVENT_ROUND_FINISHED))
+            return events
+
+        setattr(self, self._side_countdown(side)[1], False)
+        events.append(TimerEvent(EVENT_SIDE_FINISHED, side))
+
+        # 检查自由辩论总体时间是否结束
+        if self.affirmative.remaining_ns() == 0 and self.negative.remaining_ns() == 0:
+            logger.info("自由辩论环节结束")
+            events.append(TimerEvent(EVENT_ROUND_FINISHED))
+        return events
+
+    def _check_time_notifications(self, current_time):
+        """检查是否需要发出时间提醒"""
+        if self.is_free_debate:
+            color = AFFIRMATIVE_COLOR if self.affirmative_timer_active else NEGATIVE_COLOR
+        else:
+            side = self.current_round.get('side') if self.current_round else None
+            color = AFFIRMATIVE_COLOR if side == "affirmative" else NEGATIVE_COLOR
+
+        side = self._active_side()
+        flash_count = 0
+        # 按跨越阈值判断，卡顿跳过整秒时也不会漏掉提醒；一次跨越多个阈值时
+        # 全部标记为已提醒，只按最低的阈值提醒一次
+        for threshold, flag, count, message in ((60, 'notified_at_60s', 1, "剩余时间1分钟提醒"),
+                                                (30, 'notified_at_30s', 2, "剩余时间30秒提醒"),
+                                                (15, 'notified_at_15s', 3, "剩余时间15秒提醒")):
+            if self._crossed(threshold, current_time) and not getattr(self, flag):
+                setattr(self, flag, True)
+                flash_count = count
+                logger.info(message)
+        if 1 <= current_time <= 10 and current_time != self.last_10s_tick:
+            # 最后10秒每秒提醒
+            self.last_10s_tick = current_time
+            flash_count = flash_count or 1
+            logger.info(f"倒计时最后{current_time}秒")
+
+        if not flash_count:
+            return []
+        return [TimerEvent(EVENT_NOTIFY, side, current_time, flash_count, color)]
+
+    def _crossed(self, threshold, current_time):
+        """判断显示秒数是否从阈值之上降到了阈值或以下"""
+        previous = self._last_displayed_time
+        if previous is None:
+            return current_time == threshold
+        return current_time <= threshold < previous
+
+    def _reset_notification_flags(self):
+        """重置提醒标记"""
+        self.notified_at_60s = False
+        self.notified_at_30s = False
+        self.notified_at_15s = False
+        self.last_10s_tick = 0
+
+    def _mark_started(self):
+        """记录开始运行时的显示秒数"""
+        countdown = self.active_countdown()
+        self._last_displayed_time = countdown.remaining_seconds() if countdown else None
+
+    def _active_side(self):
+        if self.affirmative_timer_active:
+            return 'affirmative'
+        if self.negative_timer_active:
+            return 'negative'
+        return None
+
+    def _side_countdown(self, side):
+        if side == 'affirmative':
+            return self.affirmative, 'affirmative_timer_active'
+        return self.negative, 'negative_timer_active'
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""无界面比赛模拟
+
+用 ManualClock 驱动 TimerEngine，整场比赛的流程可以在毫秒内跑完，
+也可以批量执行随机的暂停/继续/重置操作序列来检查计时不变量。
+
+用法:
+    python -m timer_core.simulation debate_config.json
+    python -m timer_core.simulation --fuzz 1000 --seed 42
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from .clock import ManualClock, NS_PER_SECOND
+from .engine import TimerEngine, EVENT_TICK, EVENT_NOTIFY, EVENT_ROUND_FINISHED
+
+
+def run_until_idle(engine, clock, max_steps=1_000_000):
+    """推进时钟直到计时器停止，返回期间产生的全部事件"""
+    events = []
+    for _ in range(max_steps):
+        wait_ns = engine.ns_until_next_tick()
+        if wait_ns is None:
+            return events
+        clock.advance_ns(wait_ns)
+        events.extend(engine.poll())
+    raise RuntimeError("模拟步数超过上限，计时器可能未正确结束")
+
+
+def simulate_schedule(rounds, clock=None):
+    """模拟完整的比赛流程
+
+    标准环节从头计时到结束；自由辩论环节正反方交替发言，每次发言 15 秒，
+    直到双方时间都用完。
+
+    Args:
+        rounds: 回合配置列表（与 DebateConfig.get_rounds() 相同的结构）
+        clock: 可选的 ManualClock
+
+    Returns:
+        List[Dict]: 每个回合的模拟结果
+    """
+    clock = clock or ManualClock()
+    engine = TimerEngine(clock)
+    results = []
+
+    for index, round_info in enumerate(rounds):
+        engine.set_current_round(round_info)
+        started_ns = clock.now_ns()
+        events = []
+
+        if engine.is_free_debate:
+            side = 'affirmative'
+            while engine.affirmative.remaining_ns() or engine.negative.remaining_ns():
+                countdown = engine.affirmative if side == 'affirmative' else engine.negative
+                if countdown.remaining_ns():
+                    engine.toggle_side(side)
+                    turn_ns = min(15 * NS_PER_SECOND, countdown.remaining_ns())
+                    target_ns = clock.now_ns() + turn_ns
+                    while clock.now_ns() < target_ns and engine.is_running():
+                        clock.advance_ns(min(engine.ns_until_next_tick(), target_ns - clock.now_ns()))
+                        events.extend(engine.poll())
+                    if engine.is_running():
+                        engine.toggle_side(side)
+                side = 'negative' if side == 'affirmative' else 'affirmative'
+        else:
+            engine.start()
+            events.extend(run_until_idle(engine, clock))
+
+        results.append({
+            'index': index,
+            'type': round_info.get('type'),
+            'time': round_info.get('time'),
+            'elapsed': (clock.now_ns() - started_ns) / NS_PER_SECOND,
+            'ticks': sum(1 for e in events if e.kind == EVENT_TICK),
+            'notifications': sum(1 for e in events if e.kind == EVENT_NOTIFY),
+            'finished': any(e.kind == EVENT_ROUND_FINISHED for e in events),
+        })
+    return results
+
+
+def fuzz(steps, seed=None, duration=180, free_debate=False):
+    """随机执行开始/暂停/重置/推进时钟操作，检查计时不变量
+
+    Raises:
+        AssertionError: 不变量被破坏
+    """
+    rng = random.Random(seed)
+    clock = ManualClock()
+    engine = TimerEngine(clock)
+    round_info = {'side': 'affirmative', 'speaker': '一辩', 'time': duration,
+                  'type': "自由辩论" if free_debate else "立论"}
+    engine.set_current_round(round_info)
+    sides = ('affirmative', 'negative')
+
+    for _ in range(steps):
+        before = engine.get_state()
+        action = rng.random()
+        if action < 0.25:
+            if free_debate:
+                engine.toggle_side(rng.choice(sides))
+            else:
+                engine.toggle()
+        elif action < 0.3:
+            engine.reset()
+            state = engine.get_state()
+            if free_debate:
+                assert state['affirmative_time'] == state['negative_time'] == duration // 2
+            else:
+                assert state['current_time'] == duration
+            continue
+        else:
+            was_running = engine.is_running()
+            clock.advance_ns(rng.randrange(0, 3 * NS_PER_SECOND))
+            events = engine.poll()
+            if not was_running:
+                assert not events, "暂停状态下不应产生事件"
+
+        state = engine.get_state()
+        for key in ('current_time', 'affirmative_time', 'negative_time'):
+            assert 0 <= state[key] <= before[key], f"{key} 不应增加: {before[key]} -> {state[key]}"
+        assert not (state['affirmative_timer_active'] and state['negative_timer_active'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="无界面辩论计时模拟")
+    parser.add_argument('config', nargs='?', help="配置文件路径")
+    parser.add_argument('--fuzz', type=int, default=0, help="随机操作序列数量")
+    parser.add_argument('--steps', type=int, default=200, help="每个随机序列的操作步数")
+    parser.add_argument('--seed', type=int, default=None, help="随机种子")
+    args = parser.parse_args(argv)
+
+    if args.config:
+        from config_manager import DebateConfig
+        rounds = DebateConfig.from_file(args.config).get_rounds()
+        started = time.perf_counter()
+        results = simulate_schedule(rounds)
+        cost_ms = (time.perf_counter() - started) * 1000
+        for result in results:
+            print(f"回合 {result['index']+1}: {result['type']} {result['time']}秒 "
+                  f"模拟用时 {result['elapsed']:.3f}秒 提醒 {result['notifications']} 次")
+        print(f"共 {len(results)} 个回合，模拟耗时 {cost_ms:.1f} 毫秒")
+
+    if args.fuzz:
+        rng = random.Random(args.seed)
+        started = time.perf_counter()
+        for _ in range(args.fuzz):
+            fuzz(args.steps, seed=rng.random(), free_debate=rng.random() < 0.5)
+        elapsed = time.perf_counter() - started
+        print(f"完成 {args.fuzz} 个随机序列，耗时 {elapsed:.2f} 秒 ({args.fuzz/elapsed:.0f} 个/秒)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
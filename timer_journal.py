@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""计时状态日志：程序崩溃或意外退出后恢复比赛进度
+
+每次控制操作（开始、暂停、重置、切换环节）都追加一条记录，记录中
+包含完整的计时快照（TimerEngine.snapshot）、当前配置和环节序号，以及
+单调时钟和墙上时钟两个时间戳。写入在后台线程中进行，一批记录只
+fsync 一次；文件超过一定大小时压缩为只剩最后一条记录。
+
+程序正常退出时写入 'exit' 记录。下次启动时如果最后一条记录不是
+'exit'，说明上次没有正常结束，按最后一条记录恢复：正在运行的倒计时
+扣除崩溃期间经过的墙上时间后以暂停状态恢复，由操作员确认后继续。
+
+每条记录占一行 JSON，写了一半的最后一行在读取时被忽略。
+
+本模块不依赖 Qt。
+"""
+
+import os
+import json
+import time
+import queue
+import logging
+import tempfile
+import threading
+
+logger = logging.getLogger('debate_app.timer_journal')
+
+# 一批记录最多等待多久再写入并 fsync
+BATCH_SECONDS = 0.05
+# 文件超过这个大小时压缩
+COMPACT_BYTES = 256 * 1024
+
+KIND_ROUND = 'round'
+KIND_START = 'start'
+KIND_PAUSE = 'pause'
+KIND_RESET = 'reset'
+KIND_EXIT = 'exit'
+
+_COUNTDOWNS = (('standard_ns', 'timer_active'),
+               ('affirmative_ns', 'affirmative_timer_active'),
+               ('negative_ns', 'negative_timer_active'))
+_STOP = object()
+
+
+class WallClock:
+    """墙上时钟，接口与 timer_core 的时钟相同，测试时可以换成 ManualClock"""
+
+    def now_ns(self):
+        return time.time_ns()
+
+
+def default_journal_path():
+    journal_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), 'journal'))
+    try:
+        os.makedirs(journal_dir, exist_ok=True)
+    except PermissionError:
+        journal_dir = os.path.join(tempfile.gettempdir(), 'debate_journal')
+        os.makedirs(journal_dir, exist_ok=True)
+    return os.path.join(journal_dir, 'timer.journal')
+
+
+def read_last_record(path):
+    """读取最后一条完整的记录，文件不存在或为空时返回None"""
+    last = None
+    try:
+        with open(path, 'rb') as f:
+            for line in f:
+                try:
+                    last = json.loads(line)
+                except ValueError:
+                    continue  # 崩溃时写了一半的行
+    except FileNotFoundError:
+        return None
+    return last
+
+
+def needs_recovery(record):
+    """上次运行是否没有正常结束"""
+    return bool(record) and record.get('kind') != KIND_EXIT and bool(record.get('config'))
+
+
+def recovered_state(record, now_wall_ns=None):
+    """按崩溃期间经过的时间修正快照，全部倒计时处于暂停状态
+
+    Returns:
+        Tuple[dict, int]: (可交给 TimerEngine.restore 的快照, 扣除的纳秒数)
+    """
+    state = dict(record['state'])
+    now_wall_ns = time.time_ns() if now_wall_ns is None else now_wall_ns
+    elapsed = max(0, now_wall_ns - record['wall_ns'])
+    deducted = 0
+    for remaining_key, active_key in _COUNTDOWNS:
+        if state.get(active_key):
+            deducted = min(elapsed, state[remaining_key])
+            state[remaining_key] -= deducted
+            state[active_key] = False
+    return state, deducted
+
+
+class TimerJournal:
+    """追加写入的计时日志，写入与 fsync 在后台线程中批量进行"""
+
+    def __init__(self, path, compact_bytes=COMPACT_BYTES, batch_seconds=BATCH_SECONDS, wall_clock=None):
+        self.path = path
+        self.wall_clock = wall_clock or WallClock()
+        self.compact_bytes = compact_bytes
+        self.batch_seconds = batch_seconds
+        self._queue = queue.SimpleQueue()
+        self._file = open(path, 'ab')
+        self._size = self._file.tell()
+        if self._size and not self._ends_with_newline():
+            # 上次崩溃时留下了写了一半的行，另起一行，避免与新记录连在一起
+            self._file.write(b'\n')
+            self._size += 1
+        self._thread = threading.Thread(target=self._run, name='timer-journal', daemon=True)
+        self._thread.start()
+
+    def _ends_with_newline(self):
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    def append(self, kind, **fields):
+        """追加一条记录，立即返回"""
+        record = {'kind': kind, 'wall_ns': self.wall_clock.now_ns(), 'mono_ns': time.monotonic_ns()}
+        record.update(fields)
+        self._queue.put(record)
+
+    def close(self):
+        """写完剩余记录后关闭"""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.batch_seconds
+            # 合并同一批内到达的记录，只 fsync 一次
+            while batch[-1] is not _STOP:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            if batch[-1] is _STOP:
+                batch.pop()
+                stopping = True
+            if batch:
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    logger.error(f"写入计时日志失败: {e}", exc_info=True)
+        self._file.close()
+
+    def _write(self, records):
+        data = b''.join(json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n'
+                        for record in records)
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._size += len(data)
+        if self._size > self.compact_bytes:
+            self._compact(records[-1])
+
+    def _compact(self, last_record):
+        """只保留最后一条记录，先写临时文件再替换"""
+        data = json.dumps(last_record, ensure_ascii=False).encode('utf-8') + b'\n'
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self._file.close()
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, 'ab')
+        self._size = len(data)
+        logger.debug("计时日志已压缩")
+
+
+class JournalRecorder:
+    """把显示板和控制面板的计时控制操作写入日志
+
+    订阅 TimerManager.stateChanged，只有控制状态变化时才写入：运行中的
+    倒计时按预计归零时刻比较，正常走秒不产生记录。
+    """
+
+    def __init__(self, journal, display_board, control_panel):
+        self.journal = journal
+        self.display_board = display_board
+        self.control_panel = control_panel
+        self.timer_manager = display_board.timer_manager
+        self._last_key = None
+        self.timer_manager.stateChanged.connect(self.record)
+        display_board.roundChanged.connect(lambda _: self.record())
+
+    def source(self):
+        """当前配置来源：(配置或赛事包路径, 赛事包中的比赛序号)"""
+        panel = self.control_panel
+        if panel.bundle is not None:
+            return panel.bundle.path, panel.match_combo.currentIndex()
+        return os.path.abspath(panel.current_config_file) if panel.current_config_file else "", None
+
+    def record(self):
+        try:
+            config, match = self.source()
+            if not config:
+                return
+            key = self._control_key(config, match)
+            previous, self._last_key = self._last_key, key
+            if key == previous:
+                return
+            self.journal.append(self._kind(previous, key), config=config, match=match,
+                                round=self.display_board.current_round_index,
+                                state=self.timer_manager.snapshot())
+        except Exception as e:
+            logger.error(f"记录计时状态时出错: {e}", exc_info=True)
+
+    def close(self):
+        """正常退出，下次启动不再恢复"""
+        self.journal.append(KIND_EXIT)
+        self.journal.close()
+
+    def _control_key(self, config, match):
+        engine = self.timer_manager.engine
+        countdowns = tuple((c.running, c.end_ns() if c.running else c.remaining_ns())
+                           for c in (engine.standard, engine.affirmative, engine.negative))
+        return (config, match, self.display_board.current_round_index,
+                engine.is_free_debate, engine.total_time, countdowns)
+
+    @staticmethod
+    def _kind(previous, key):
+        if previous is None or previous[:3] != key[:3]:
+            return KIND_ROUND
+        was_running = any(running for running, _ in previous[5])
+        running = any(running for running, _ in key[5])
+        if running and not was_running:
+            return KIND_START
+        if was_running and not running:
+            return KIND_PAUSE
+        return KIND_START if running else KIND_RESET
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""赛事包：一个文件或目录中保存多场比赛的配置
+
+支持两种形式：
+
+- JSON Lines 文件（.jsonl / .ndjson）：每行一场比赛，内容与单场配置文件
+  相同，可额外提供 "match" 字段作为比赛名称；
+- 目录：目录下每个 .json 文件是一场比赛，按文件名排序。
+
+打开赛事包时只扫描一遍文件建立字节偏移索引，并把索引保存到旁边的
+.idx 文件中，文件未变化时下次直接读取索引。选中某场比赛时才读取并
+解析对应的那一行，内存占用与赛事包大小无关。
+"""
+
+import os
+import re
+import json
+import marshal
+import hashlib
+import logging
+
+from config_manager import DebateConfig, ConfigValidationError
+from config_cache import load_config
+
+logger = logging.getLogger('debate_app.tournament_bundle')
+
+BUNDLE_EXTENSIONS = ('.jsonl', '.ndjson')
+# 索引格式版本，结构变化时递增使旧索引失效
+INDEX_VERSION = 2
+# 计算内容摘要时每次读取的字节数
+DIGEST_CHUNK_BYTES = 1 << 20
+# 比赛名称只在每行开头这么多字节内查找，避免对长行做全量扫描
+TITLE_SCAN_BYTES = 4096
+_TITLE_PATTERN = re.compile(rb'"(match|topic)"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+
+def is_bundle_path(path):
+    """判断路径是否为赛事包"""
+    return os.path.isdir(path) or path.lower().endswith(BUNDLE_EXTENSIONS)
+
+
+def open_bundle(path):
+    """打开赛事包
+
+    Returns:
+        JsonLinesBundle 或 DirectoryBundle
+    """
+    if os.path.isdir(path):
+        return DirectoryBundle(path)
+    return JsonLinesBundle(path)
+
+
+def _extract_title(raw, default):
+    """从一场比赛的原始内容中提取名称，优先 match 字段，其次 topic"""
+    found = {}
+    for match in _TITLE_PATTERN.finditer(raw[:TITLE_SCAN_BYTES]):
+        found.setdefault(match.group(1), match.group(2))
+    token = found.get(b'match') or found.get(b'topic')
+    if token is None:
+        return default
+    try:
+        return json.loads(token.decode('utf-8'))
+    except (ValueError, UnicodeDecodeError):
+        return default
+
+
+class JsonLinesBundle:
+    """JSON Lines 格式的赛事包"""
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.index_path = self.path + '.idx'
+        self.entries = self._load_index()  # [(偏移, 长度, 名称)]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def titles(self):
+        """所有比赛的名称"""
+        return [title for _, _, title in self.entries]
+
+    def load_match(self, index):
+        """读取并验证第 index 场比赛
+
+        Raises:
+            IndexError: 序号超出范围
+            ConfigValidationError: 配置验证失败
+        """
+        offset, length, title = self.entries[index]
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            raw = f.read(length)
+        try:
+            return DebateConfig.from_bytes(raw)
+        except ConfigValidationError as e:
+            raise ConfigValidationError(f"第 {index+1} 场比赛（{title}）: {e}")
+
+    def _signature(self):
+        """文件大小、修改时间和内容摘要
+
+        FAT32 等文件系统的修改时间只精确到 2 秒，同样大小的改写可能不改变
+        修改时间，只比较大小和时间会沿用过期的偏移。计算摘要只是顺序读一遍
+        文件，比逐行解析建立索引快得多。
+        """
+        stat = os.stat(self.path)
+        digest = hashlib.blake2b(digest_size=16)
+        with open(self.path, 'rb') as f:
+            for chunk in iter(lambda: f.read(DIGEST_CHUNK_BYTES), b''):
+                digest.update(chunk)
+        return (stat.st_size, stat.st_mtime_ns, digest.hexdigest())
+
+    def _load_index(self):
+        signature = self._signature()
+        try:
+            with open(self.index_path, 'rb') as f:
+                version, cached_signature, entries = marshal.load(f)
+            if version == INDEX_VERSION and tuple(cached_signature) == signature:
+                return [tuple(entry) for entry in entries]
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"赛事包索引损坏，将重新建立: {e}")
+
+        entries = self._build_index()
+        try:
+            tmp_path = self.index_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                marshal.dump((INDEX_VERSION, signature, entries), f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            logger.warning(f"无法保存赛事包索引: {e}")
+        return entries
+
+    def _build_index(self):
+        """逐行扫描建立偏移索引，跳过空行"""
+        entries = []
+        offset = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                length = len(line)
+                content = line.strip()
+                if content:
+                    start = offset + line.index(content[:1])
+                    title = _extract_title(content, f"第 {len(entries)+1} 场")
+                    entries.append((start, len(content), title))
+                offset += length
+        logger.info(f"赛事包索引已建立: {self.path}，共 {len(entries)} 场比赛")
+        return entries
+
+
+class DirectoryBundle:
+    """目录形式的赛事包，每个 .json 文件是一场比赛"""
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.files = sorted(name for name in os.listdir(self.path)
+                            if name.lower().endswith('.json'))
+
+    def __len__(self):
+        return len(self.files)
+
+    def titles(self):
+        return [os.path.splitext(name)[0] for name in self.files]
+
+    def match_path(self, index):
+        return os.path.join(self.path, self.files[index])
+
+    def load_match(self, index):
+        """读取并验证第 index 场比赛"""
+        return load_config(self.match_path(index))
@@ -4,14 +4,23 @@
 import sys
 import os
 import re
+import atexit
+import threading
+import collections
 import logging
 import logging.handlers  # 添加这行以导入 handlers 子模块
 import tempfile
 import ctypes
+import functools
 from html import escape
 from PyQt5.QtWidgets import QFrame, QApplication
 from PyQt5.QtCore import Qt, QRectF
 from PyQt5.QtGui import QPainter, QColor, QPen, QLinearGradient, QBrush
+
+from lazy_imports import lazy_import
+
+# markdown 只在文本含有 **标记** 以外的语法时才用到
+markdown = lazy_import('markdown')
 #123123
 # 配置日志1
 log_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), 'logs'))
@@ -21,6 +30,46 @@ except PermissionError:
     log_dir = os.path.join(tempfile.gettempdir(), 'debate_logs')
     os.makedirs(log_dir, exist_ok=True)
 
+# 日志环形缓冲区容量（条）
+LOG_QUEUE_CAPACITY = 10000
+
+
+class LogRingBuffer:
+    """有界的日志队列，满了之后丢弃最旧的记录
+
+    put_nowait() 永远不阻塞调用线程；被丢弃的记录按级别计数，
+    后台写入线程退出时会汇总报告。
+    """
+
+    def __init__(self, capacity=LOG_QUEUE_CAPACITY):
+        self.capacity = capacity
+        self._records = collections.deque()
+        self._not_empty = threading.Condition(threading.Lock())
+        self.dropped = 0
+        self.dropped_by_level = collections.Counter()
+
+    def put_nowait(self, record):
+        with self._not_empty:
+            if len(self._records) >= self.capacity:
+                oldest = self._records.popleft()
+                self.dropped += 1
+                self.dropped_by_level[getattr(oldest, 'levelname', 'UNKNOWN')] += 1
+            self._records.append(record)
+            self._not_empty.notify()
+
+    def get(self, block=True, timeout=None):
+        with self._not_empty:
+            if block:
+                self._not_empty.wait_for(lambda: self._records, timeout)
+            if not self._records:
+                raise IndexError("日志队列为空")
+            return self._records.popleft()
+
+    def qsize(self):
+        with self._not_empty:
+            return len(self._records)
+
+
 logger = logging.getLogger('debate_app')
 logger.setLevel(logging.DEBUG)
 # 修复了格式化字符串，确保没有"levellevel"这样的错误
@@ -37,10 +86,50 @@ file_handler = logging.handlers.RotatingFileHandler(
 file_handler.setLevel(logging.DEBUG)
 file_handler.setFormatter(formatter)
 
+# 日志先进入内存队列，由后台线程写控制台和文件，磁盘卡顿不会阻塞界面线程
+log_queue = LogRingBuffer()
+queue_handler = logging.handlers.QueueHandler(log_queue)
+log_listener = logging.handlers.QueueListener(
+    log_queue, console_handler, file_handler, respect_handler_level=True)
+# 后台写入线程是否在运行
+_log_listener_started = False
+
+
+def stop_logging():
+    """停止后台写入线程，写完队列中剩余的日志"""
+    global _log_listener_started
+    if not _log_listener_started:
+        return
+    log_listener.stop()
+    _log_listener_started = False
+    if log_queue.dropped:
+        record = logger.makeRecord(
+            logger.name, logging.WARNING, __file__, 0,
+            f"日志队列溢出，共丢弃 {log_queue.dropped} 条日志: {dict(log_queue.dropped_by_level)}",
+            None, None)
+        for handler in log_listener.handlers:
+            handler.handle(record)
+
+
 # 确保日志处理器不重复添加
 if not logger.handlers:
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    logger.addHandler(queue_handler)
+    log_listener.start()
+    _log_listener_started = True
+    atexit.register(stop_logging)
+
+# 富文本渲染缓存容量：环节、辩手和发言者文本的种类有限，切换环节时反复渲染同样的文本
+RICH_TEXT_CACHE_SIZE = 512
+
+SIDE_HIGHLIGHT_COLORS = {'affirmative': "#177cb0", 'negative': "#ff3300"}  # 正方蓝色、反方红色
+DEFAULT_HIGHLIGHT_COLOR = "#000000"
+
+# 只匹配成对出现的 **标记**
+_MARKER_PATTERN = re.compile(r'\*\*([^*]+?)\*\*')
+# 去掉 **标记** 后仍含有这些内容时交给完整的 markdown 处理
+# 以 ---/=== 开头（分隔线、标题下划线）和以制表符缩进（代码块）的行也算
+_MARKDOWN_SYNTAX = re.compile(r'[\\`*_\[\]<>&#!\n]|^\s*(?:[-+]|\d+[.)])(?:\s|$)|^\s*[-=]{2,}|^\s{0,3}\t|^\s{4}')
+
 
 def highlight_markers(text, hl_color=None, side=None):
     """用指定颜色高亮文本中的 **标记内容**，并将整个文本加粗
@@ -50,33 +139,41 @@ def highlight_markers(text, hl_color=None, side=None):
         hl_color: 高亮颜色，如果提供则优先使用
         side: 辩论方，'affirmative'或'negative'
     """
+    # 如果没有提供颜色，则根据辩论方决定
+    if hl_color is None:
+        hl_color = SIDE_HIGHLIGHT_COLORS.get(side, DEFAULT_HIGHLIGHT_COLOR)
+    return _render_markers(text, hl_color)
+
+
+@functools.lru_cache(maxsize=RICH_TEXT_CACHE_SIZE)
+def _render_markers(text, hl_color):
+    """按 (文本, 颜色) 缓存 highlight_markers 的结果"""
     try:
-        # 如果没有提供颜色，则根据辩论方决定
-        if hl_color is None:
-            if side == 'affirmative':
-                hl_color = "#177cb0"  # 正方蓝色
-            elif side == 'negative':
-                hl_color = "#ff3300"  # 反方红色
-            else:
-                hl_color = "#000000"  # 默认黑色
-        
         # 先进行HTML转义，防止XSS攻击
-        text = escape(text)
-        
-        # 仅匹配成对出现的标记
-        def repl(m):
-            return f'<span style="color:{hl_color}; font-weight:bold;">{m.group(1)}</span>'
-        
-        # 修复正则表达式，确保只匹配完整的 **标记**
-        html = re.sub(r'\*\*([^*]+?)\*\*', repl, text)
+        html = _MARKER_PATTERN.sub(
+            f'<span style="color:{hl_color}; font-weight:bold;">\\1</span>', escape(text))
         
         # 将整个文本加粗（保留已经处理过的高亮部分）
-        html = f'<span style="font-weight:bold;">{html}</span>'
-        return html
+        return f'<span style="font-weight:bold;">{html}</span>'
     except Exception as e:
         logger.error(f"处理高亮标记时出错: {e}", exc_info=True)
         return escape(text)  # 出错时返回纯转义文本，确保安全
 
+
+@functools.lru_cache(maxsize=RICH_TEXT_CACHE_SIZE)
+def render_markdown(text):
+    """把一行 Markdown 转为 HTML，结果被缓存
+
+    只用到 **加粗** 的文本直接替换为 <strong>，输出与 markdown.markdown
+    相同，不需要导入 markdown 模块；含有其他语法时才交给 markdown 处理。
+    """
+    if not text.strip():
+        return ''
+    if not _MARKDOWN_SYNTAX.search(_MARKER_PATTERN.sub(r'\1', text)):
+        return '<p>' + _MARKER_PATTERN.sub(r'<strong>\1</strong>', text.strip()) + '</p>'
+    return markdown.markdown(text)
+
+
 class GradientBorderFrame(QFrame):
     """创建带有渐变色边框的框架"""
     def __init__(self, *args, start_color, end_color, **kwargs):
@@ -171,21 +268,26 @@ def enable_dwm_composition():
 
 # 添加低性能系统检测函数
 def is_low_performance():
-    """检测系统是否为低性能配置"""
-    try:
-        import platform
-        import psutil
-    except ImportError:
-        # 如果无法导入psutil，默认非低性能
-        return False
+    """检测系统是否为低性能配置
+
+    只有 Windows 7 或更早的系统才需要进一步检测硬件，其它系统不导入 psutil。
+    """
+    import platform
     try:
         # 检测Windows版本
-        is_win7_or_older = False
-        if platform.system() == 'Windows':
-            win_ver = platform.version()
-            # Windows 7或更早的版本
-            is_win7_or_older = int(win_ver.split('.')[0]) < 10
-        
+        if platform.system() != 'Windows':
+            return False
+        win_ver = platform.version()
+        # Windows 7或更早的版本
+        if int(win_ver.split('.')[0]) >= 10:
+            return False
+
+        try:
+            import psutil
+        except ImportError:
+            # 如果无法导入psutil，默认非低性能
+            return False
+
         # 检测CPU性能
         cpu_count = psutil.cpu_count(logical=False)
         if cpu_count is None:
@@ -195,8 +297,8 @@ def is_low_performance():
         mem = psutil.virtual_memory()
         low_memory = mem.total < 4 * 1024 * 1024 * 1024  # 小于4GB内存
         
-        # 如果是Windows 7或更早版本，并且CPU核心数少于4或内存小于4GB
-        return is_win7_or_older and (cpu_count < 4 or low_memory)
+        # Windows 7或更早版本，并且CPU核心数少于4或内存小于4GB
+        return cpu_count < 4 or low_memory
     except Exception as e:
         logger.error(f"性能检测失败: {e}")
         return False